@@ -63,12 +63,14 @@ def test_guest_mode_videos(d, screenshots_dir):
     2. Click Continue as Guest button
     3. Handle events popup if it appears
     4. Navigate to Videos section
-    5. Take screenshot of guest mode videos screen
+    5. Tap a video (measures playback when the video is not locked)
+    6. Take screenshot of guest mode videos screen
     """
     guest_mode = GuestModeAuth(d)
     scroll_videos = ScrollVideos(d)
     screenshots = ScreenshotsManagement(d)
     verify_locked_videos = VerifyGuestMode(d)
+    nav_guest_mode = NavGuestMode(d)
 
     guest_mode.enter_guest_mode_and_handle_popups()
 
@@ -76,6 +78,8 @@ def test_guest_mode_videos(d, screenshots_dir):
 
     verify_locked_videos.verify_guest_videos()
 
+    nav_guest_mode.click_guest_mode_locked_videos()
+
     screenshots.take_screenshot("15_3_2_guest_mode_videos_triggered_plans_popup")
 
 
@@ -0,0 +1,23 @@
+import pytest
+
+from utils_launch_benchmark import LaunchBenchmark
+
+
+@pytest.mark.opt_in("--launch-benchmark", reason="Run with --launch-benchmark N to benchmark the app start")
+def test_app_start_time(d, pytestconfig):
+    """
+    Benchmark the cold, warm and hot start time of the app.
+
+    Steps:
+    1. Start the app N times in each start mode (cold, warm, hot)
+    2. Measure am start TotalTime/WaitTime and the time until Get Started or Search is shown
+    3. Add min/median/p95 per start mode to the App Start sheet of the report
+    4. Verify no median start time regressed compared to the previous run on this device
+    """
+    repeat = pytestconfig.getoption("--launch-benchmark")
+    launch_benchmark = LaunchBenchmark(d)
+
+    results = launch_benchmark.run(repeat)
+    regressions = launch_benchmark.report(results)
+
+    assert not regressions, "App start time regressed:\n" + "\n".join(regressions)
@@ -0,0 +1,58 @@
+import pytest
+
+from config import MEMORY_TREND
+from test_reporter import get_active_reporter
+from utils_authentication import SignInPrepare
+from utils_memory import MemorySampler, analyze_trend
+from utils_ui_navigation import NavBottomNavBar, NavDayTripsTrails, NavViewMap
+
+
+@pytest.mark.opt_in("--soak-iterations", reason="Run with --soak-iterations N to run the memory soak test")
+def test_memory_soak(d, pytestconfig):
+    """
+    Repeat the main flows and check the app's memory for steady growth.
+
+    Steps:
+    1. Sign in with valid credentials and prepare
+    2. Repeat N times: open Events, Day Trips and View Map, returning Home after each
+    3. Sample the app's memory after every iteration
+    4. Add the samples and the trend to the Memory sheet of the report
+    5. Verify total PSS does not grow monotonically across the iterations
+    """
+    iterations = pytestconfig.getoption("--soak-iterations")
+
+    sign_in = SignInPrepare(d)
+    nav_bar = NavBottomNavBar(d)
+    nav_trips = NavDayTripsTrails(d)
+    nav_map = NavViewMap(d)
+    sampler = MemorySampler(d)
+
+    sign_in.sign_in_and_prepare()
+    sampler.sample("soak_start")
+
+    for iteration in range(1, iterations + 1):
+        nav_bar.click_events_button()
+        nav_bar.click_home_button()
+
+        nav_trips.click_day_trips_see_all()
+        d.press("back")
+        nav_bar.click_home_button()
+
+        nav_map.navigate_to_view_map()
+        d.press("back")
+        nav_bar.click_home_button()
+
+        sampler.sample(f"soak_iteration_{iteration}")
+
+    trend = analyze_trend(sampler.series.values['total_pss'], **MEMORY_TREND)
+    print(f"Memory trend over {iterations} iterations: {trend}")
+
+    reporter = get_active_reporter()
+    if reporter is not None:
+        for row in sampler.series.rows():
+            reporter.add_metric(MemorySampler.SHEET_NAME, {'test': 'memory_soak', **row})
+        reporter.add_metric("Memory Trend", {'iterations': iterations, **trend})
+
+    assert not trend['leak_suspected'], (
+        f"App memory grew by {trend['growth_kb']} KB over {iterations} iterations: {trend}"
+    )
@@ -0,0 +1,37 @@
+import pytest
+
+from config import LOCATOR_COST
+from utils_locator_cost import load_dumps, over_budget, rank_locators
+
+
+def test_locator_cost_budget():
+    """
+    Check the estimated cost of every locator in locators.py. No device is needed.
+
+    Steps:
+    1. Parse every locator and estimate the nodes visited on a reference hierarchy
+    2. Verify no locator outside LOCATOR_COST['known_costly'] exceeds LOCATOR_COST['max_cost']
+    """
+    failing = over_budget(rank_locators())
+
+    assert not failing, "Locators over the cost budget (see python analyze_locators.py):\n" + "\n".join(
+        f"{row['name']}: cost {row['cost']} {row['complexity']} {row['flags']}" for row in failing)
+
+
+def test_locator_time_budget():
+    """
+    Time every locator in locators.py against the recorded hierarchy dumps. No device is needed.
+
+    Steps:
+    1. Load the dumps in hierarchy_dumps/ (recorded with analyze_locators.py --record)
+    2. Evaluate every locator repeatedly on each dump
+    3. Verify no locator outside LOCATOR_COST['known_costly'] exceeds LOCATOR_COST['max_ms'] on any dump
+    """
+    dumps = load_dumps()
+    if not dumps:
+        pytest.skip(f"No hierarchy dumps in {LOCATOR_COST['dump_dir']}/, record them with analyze_locators.py --record")
+
+    failing = [row for row in over_budget(rank_locators(dumps)) if row['worst_ms'] > LOCATOR_COST['max_ms']]
+
+    assert not failing, "Locators over the time budget (see python analyze_locators.py):\n" + "\n".join(
+        f"{row['name']}: {row['worst_ms']} ms on {row['worst_dump']}" for row in failing)
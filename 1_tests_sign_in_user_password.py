@@ -1,5 +1,4 @@
 import pytest
-import os
 from config import TEST_USER
 from utils_authentication import SignInPrepare
 from utils_device_interaction import ForgotPassword, LaunchApp
@@ -24,10 +23,10 @@ def test_sign_in_with_valid_credentials(d, screenshots_dir):
     8. Verify user is logged in successfully
     """
     sign_in = SignInPrepare(d)
+    screenshots = ScreenshotsManagement(d)
     sign_in.sign_in_and_prepare()
 
-    screenshot_path = os.path.join(screenshots_dir, "1_1_1_successful_sign_in_user_password.png")
-    d.screenshot(screenshot_path)
+    screenshots.save_screenshot("1_1_1_successful_sign_in_user_password.png")
 
 
 @pytest.mark.smoke
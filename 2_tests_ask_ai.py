@@ -2,6 +2,7 @@ from unittest import result
 
 import pytest
 
+from config import ASK_AI_CORPUS
 from utils_authentication import SignInPrepare
 from utils_device_interaction import SearchAI
 from utils_screenshots import ScreenshotsManagement
@@ -122,3 +123,28 @@ def test_ai_search_videos(d, screenshots_dir):
     verify_videos.verify_videos_search_result()
 
     screenshots.take_screenshot("2_2_4_ai_search_videos")
+
+
+@pytest.mark.opt_in("--ask-ai-corpus", reason="Run with --ask-ai-corpus to benchmark Ask AI latency")
+def test_ai_search_latency_corpus(d):
+    """
+    Benchmark the Ask AI response latency over a corpus of prompts
+    Steps:
+    1. Handle notification permissions
+    2. Sign in with valid credentials
+    3. Handle events popup
+    4. Click Ask AI in bottom navigation
+    5. Submit every prompt of the corpus in the chat
+    6. Measure submit to first result and submit to stable results for each prompt
+    7. Report the latency distribution
+    """
+    sign_in = SignInPrepare(d)
+    search_ai = SearchAI(d)
+
+    sign_in.sign_in_and_prepare()
+
+    summary = search_ai.run_corpus(ASK_AI_CORPUS)
+
+    assert summary['submit_to_first_result']['count'] == len(ASK_AI_CORPUS), (
+        f"Ask AI did not answer every prompt within {SearchAI.RESPONSE_TIMEOUT} seconds: {summary}"
+    )
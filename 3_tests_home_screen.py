@@ -67,7 +67,7 @@ def test_home_screen_videos(d, screenshots_dir):
     2. Find and click Videos tile
     3. Verify videos section is displayed
     4. Check video thumbnails are visible
-    5. Attempt to play a video
+    5. Play a video and measure its playback start and stalls
     6. Verify video playback controls
     """
     sign_in = SignInPrepare(d)
@@ -83,6 +83,10 @@ def test_home_screen_videos(d, screenshots_dir):
 
     screenshots.take_screenshot("3_3_1_home_screen_videos_opened")
 
+    nav_videos.play_first_video()
+
+    screenshots.take_screenshot("3_3_2_home_screen_video_playing")
+
 
 @pytest.mark.smoke
 def test_home_screen_day_trips(d, screenshots_dir):
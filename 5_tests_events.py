@@ -1,7 +1,6 @@
 from time import sleep
 import pytest
 
-from conftest import screenshots_dir
 from utils_authentication import SignInPrepare
 from utils_device_interaction import SearchAI
 from utils_ui_navigation import NavEvents, NavEventsFilters
@@ -121,11 +121,11 @@ def test_auto_generated_day_trip_events(d, screenshots_dir):
 
     verify_custom_trips.verify_next_button()
 
-    nav_custom_trips.click_next()
+    crafting_started = nav_custom_trips.click_next()
 
     verify_custom_trips.verify_crafting_day_trip()
 
-    verify_custom_trips.wait_for_crafting_popup_to_disappear()
+    verify_custom_trips.wait_for_crafting_popup_to_disappear(started_at=crafting_started, category="events")
 
     verify_custom_trips.verify_location_details("Burlington")
 
@@ -244,11 +244,11 @@ def test_auto_generated_day_trip_food_and_drinks(d, screenshots_dir):
 
     verify_custom_trips.verify_next_button()
 
-    nav_custom_trips.click_next()
+    crafting_started = nav_custom_trips.click_next()
 
     verify_custom_trips.verify_crafting_day_trip()
 
-    verify_custom_trips.wait_for_crafting_popup_to_disappear()
+    verify_custom_trips.wait_for_crafting_popup_to_disappear(started_at=crafting_started, category="food_drinks")
 
     verify_custom_trips.verify_location_details("Burlington")
 
@@ -367,11 +367,11 @@ def test_auto_generated_day_trip_outdoors(d, screenshots_dir):
 
     verify_custom_trips.verify_next_button()
 
-    nav_custom_trips.click_next()
+    crafting_started = nav_custom_trips.click_next()
 
     verify_custom_trips.verify_crafting_day_trip()
 
-    verify_custom_trips.wait_for_crafting_popup_to_disappear()
+    verify_custom_trips.wait_for_crafting_popup_to_disappear(started_at=crafting_started, category="outdoors")
 
     verify_custom_trips.verify_location_details("Burlington")
 
@@ -490,11 +490,11 @@ def test_auto_generated_day_trip_points_of_interest(d, screenshots_dir):
 
     verify_custom_trips.verify_next_button()
 
-    nav_custom_trips.click_next()
+    crafting_started = nav_custom_trips.click_next()
 
     verify_custom_trips.verify_crafting_day_trip()
 
-    verify_custom_trips.wait_for_crafting_popup_to_disappear()
+    verify_custom_trips.wait_for_crafting_popup_to_disappear(started_at=crafting_started, category="points_of_interest")
 
     verify_custom_trips.verify_location_details("Burlington")
 
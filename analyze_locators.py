@@ -0,0 +1,58 @@
+"""
+Rank the XPath locators in locators.py by cost and suggest cheaper forms.
+
+Usage:
+    python analyze_locators.py [--top N] [--dumps DIR]
+    python analyze_locators.py --record <name> [--device <serial>]
+
+Without recorded hierarchy dumps the locators are ranked by their estimated cost;
+with dumps in hierarchy_dumps/ (recorded with --record on the screen in question)
+they are also timed and ranked by the median time on the slowest dump. Exits with
+status 1 when a locator that is not listed in LOCATOR_COST['known_costly'] is over budget.
+"""
+import argparse
+import sys
+
+from config import LOCATOR_COST
+from utils_locator_cost import load_dumps, over_budget, rank_locators, record_dump
+
+
+def main():
+    """Rank the locators and return the exit status: 1 if one is over budget."""
+    parser = argparse.ArgumentParser(description="Rank the XPath locators by cost")
+    parser.add_argument("--top", type=int, default=20, help="Number of locators to list (default: 20)")
+    parser.add_argument("--dumps", default=None, help="Directory of hierarchy dumps (default: hierarchy_dumps)")
+    parser.add_argument("--record", metavar="NAME", default=None, help="Record a dump of the current screen and exit")
+    parser.add_argument("--device", default=None, help="ADB serial of the device to record from")
+    args = parser.parse_args()
+
+    if args.record:
+        import uiautomator2 as u2
+
+        print(f"Saved dump {record_dump(u2.connect(args.device), args.record, args.dumps)}")
+        return 0
+
+    dumps = load_dumps(args.dumps)
+    print(f"Timing against {len(dumps)} dumps: {', '.join(dumps)}" if dumps else "No dumps recorded, ranking by estimated cost")
+    rows = rank_locators(dumps)
+
+    for rank, row in enumerate(rows[:args.top], start=1):
+        timing = f"{row['worst_ms']:.3f} ms on {row['worst_dump']}  " if dumps else ""
+        print(f"\n{rank}. {row['name']}  {row['complexity']}  cost {row['cost']}  {timing}{', '.join(row['flags'])}")
+        print(f"   {row['xpath']}")
+        for suggestion in row['suggestions']:
+            verified = {True: "same elements on all dumps", False: "NOT equivalent on the dumps",
+                        None: "unverified"}[suggestion['verified']]
+            print(f"   -> {suggestion['xpath']}")
+            print(f"      cost {suggestion['cost']}, {verified}: {suggestion['note']}")
+
+    failing = over_budget(rows)
+    if failing:
+        print(f"\nOver budget (cost {LOCATOR_COST['max_cost']}, {LOCATOR_COST['max_ms']} ms): "
+              + ", ".join(row['name'] for row in failing))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
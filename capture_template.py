@@ -0,0 +1,64 @@
+"""
+Capture an image template of an icon for ImageLocator (see utils_image_locator.py).
+
+Usage:
+    python capture_template.py <name> "<xpath of the icon>" [--device <serial>]
+
+The icon's bounds are cropped from a raw, lossless frame and saved as
+templates/<name>@<width>x<height>.png for the device's screen size, the same
+frames and size ImageMatcher matches against.
+"""
+import argparse
+import os
+
+import numpy as np
+
+from utils_device_profile import get_device_profile
+from utils_image_locator import TEMPLATE_DIR, template_path
+from utils_screencap import RawScreencap
+
+
+def capture_template(device, name, xpath):
+    """
+    Crop an element from a raw frame and save it as a template.
+
+    Args:
+        device: UIAutomator2 device instance
+        name: Template name, as used in the ImageLocator
+        xpath: XPath of the icon on the current screen
+
+    Returns:
+        str: Path of the saved template
+    """
+    from PIL import Image
+
+    element = device.xpath(xpath)
+    assert element.wait(timeout=5), f"Could not find {xpath} on screen"
+    left, top, right, bottom = element.get().bounds
+
+    width, height = get_device_profile(device).size
+    frame = RawScreencap(device).capture()
+    assert frame is not None, "Raw screen capture failed"
+    assert frame.shape[:2] == (height, width), (
+        f"Frame is {frame.shape[1]}x{frame.shape[0]}, the device profile {width}x{height}")
+
+    os.makedirs(TEMPLATE_DIR, exist_ok=True)
+    path = template_path(name, width, height)
+    Image.fromarray(np.ascontiguousarray(frame[top:bottom, left:right]), 'RGBA').convert('RGB').save(path)
+    return path
+
+
+def main():
+    import uiautomator2 as u2
+
+    parser = argparse.ArgumentParser(description="Capture an image template of an icon")
+    parser.add_argument("name", help="Template name, as used in the ImageLocator")
+    parser.add_argument("xpath", help="XPath of the icon on the current screen")
+    parser.add_argument("--device", default=None, help="ADB serial of the device (default: the only connected one)")
+    args = parser.parse_args()
+
+    print(f"Saved template {capture_template(u2.connect(args.device), args.name, args.xpath)}")
+
+
+if __name__ == "__main__":
+    main()
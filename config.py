@@ -7,3 +7,145 @@ TEST_USER = {
     'email': 'evtestmail@jxpomup.com',
     'password': 'evtest'
 }
+
+# Retention of screenshots and test reports, pruned in the background at the start of each run
+ARTIFACT_RETENTION = {
+    'max_age_days': 1,
+    'max_total_mb': 2048
+}
+
+# App start benchmark (14_tests_app_start.py, run with --launch-benchmark N)
+LAUNCH_BENCHMARK = {
+    'modes': ['cold', 'warm', 'hot'],
+    'regression_tolerance': 0.2,  # Fail when a median start time grows by more than 20%
+    'marker_timeout': 30
+}
+
+# Memory growth that flags a leak in the soak test (15_tests_memory_soak.py, run with --soak-iterations N)
+MEMORY_TREND = {
+    'min_growth_kb': 10240,  # Total PSS growth from the first to the last iteration
+    'monotonic_ratio': 0.8  # Share of iterations in which PSS must not decrease
+}
+
+# Prompts of the Ask AI latency benchmark (2_tests_ask_ai.py, run with --ask-ai-corpus)
+ASK_AI_CORPUS = [
+    "Burlington Events",
+    "Big Fatty BBQ",
+    "Day Trip in Vermont",
+    "Vermont Videos",
+    "Farmers markets this weekend",
+    "Best maple creemee near Stowe",
+    "Breweries in Burlington",
+    "Family friendly farms to visit"
+]
+
+# Drift alert for the Crafting Your Trip duration of auto-generated day trips
+DAY_TRIP_GENERATION = {
+    'drift_window': 5,  # Recent generations per category whose median is checked
+    'baseline_runs': 20,  # Earlier generations per category the median is compared with
+    'drift_tolerance': 0.25  # Alert when the median changes by more than 25%
+}
+
+# Screen transition SLOs in seconds from the tap (utils_transitions.py, enforced with --enforce-slos)
+# A stable SLO of None skips the stable wait, for destinations whose hierarchy never stops animating
+TRANSITION_SLOS = {
+    'default': {'visible': 3, 'stable': 5},
+    'home': {'visible': 3, 'stable': None},  # Video and events carousels
+    'home_see_all_events': {'visible': 5, 'stable': 8},
+    'event_details': {'visible': 4, 'stable': 6},
+    'business_details': {'visible': 4, 'stable': 6},
+    'view_map': {'visible': 4, 'stable': None},  # Map tiles; rendering is timed by MapRenderDetector
+    'day_trip_details': {'visible': 4, 'stable': 6},
+    'trail_details': {'visible': 4, 'stable': 6},
+}
+
+# Map render detection of the View Map screen (utils_frame_sampling.py)
+MAP_RENDER = {
+    'region': (0, 0.25, 1, 0.85),  # Map area below the filters and above the bottom bar, as screen fractions
+    'frame_step': 4,  # Keep every 4th pixel of the screenshot in both directions
+    'pixel_threshold': 8,  # Gray value change that counts a pixel as changed
+    'change_threshold_pct': 0.5,  # Share of changed pixels below which two frames count as equal
+    'settle_frames': 3,  # Consecutive equal frames after a change that mark the map as rendered
+    'min_wait_s': 1,  # Wait at least this long for the map to start redrawing before giving up on a change
+    'timeout': 10
+}
+
+# Video playback probe of the Food Vids player (utils_video_playback.py)
+VIDEO_PLAYBACK = {
+    'player_timeout': 5,  # Time for the player to show up after the tap
+    'first_frame_timeout': 10,  # Time for playback to start before the video counts as not played
+    'observe_s': 8,  # Time playback is watched for stalls after it started
+    'stall_min_s': 0.5,  # Equal frames for at least this long count as a stall
+    'frame_step': 4,
+    'pixel_threshold': 8,
+    'change_threshold_pct': 0.2
+}
+
+# Screen capture (utils_screencap.py): 'raw' pulls unencoded screencap pixels over ADB, 'uiautomator2'
+# uses device.screenshot(); raw capture falls back to uiautomator2 when it fails
+SCREEN_CAPTURE = {
+    'backend': 'raw',
+    'persist_format': 'png',  # Format of saved screenshots: 'png' or 'webp'
+    'png_compress_level': 1,  # Faster encoding, slightly larger files
+    'webp_quality': 80
+}
+
+# Visual baseline comparison of test screenshots (utils_visual_regression.py, run with --visual-regression)
+VISUAL_REGRESSION = {
+    'block_size': 16,  # Side of the square pixel blocks that are scored
+    'min_block_score': 0.85,  # SSIM-like score below which a block counts as changed
+    'max_changed_blocks_pct': 0.5,  # Share of changed blocks that fails a screenshot
+    'mask_top': 0.04,  # Status bar (clock, notifications) as a fraction of the screen height
+    'workers': 4,  # Comparison processes
+    'collect_timeout': 60
+}
+
+# Image template locators of icons without text (utils_image_locator.py, templates captured with capture_template.py)
+IMAGE_LOCATOR = {
+    'downsample': 2,  # Shrink factor of the screenshot region and the template before matching
+    'min_score': 0.8  # Normalized cross-correlation a match needs
+}
+
+# XPath locator cost analysis (utils_locator_cost.py, analyze_locators.py, 16_tests_locator_cost.py)
+LOCATOR_COST = {
+    'dump_dir': 'hierarchy_dumps',  # Recorded hierarchy dumps the locators are timed against
+    'repeats': 20,  # Evaluations per locator and dump; the median is reported
+    'reference_nodes': 400,  # Hierarchy size the static cost is estimated for
+    'reference_depth': 20,  # Hierarchy depth the static cost is estimated for
+    'fanout': 4,  # Assumed children per node
+    'typed_share': 0.25,  # Share of nodes a class name node test keeps
+    'match_share': 0.05,  # Share of candidates a contains() or other non-equality predicate keeps
+    'max_steps': 6,  # Location steps above which a path counts as absolute
+    'max_cost': 5000,  # Budget of estimated node visits per locator
+    'max_ms': 5,  # Budget of the median evaluation time on the slowest dump
+    'known_costly': (  # Locators over budget before the budget was introduced
+        'Videos.VIDEO_TILE',
+        'Businesses.BUSINESS_ABOUT_TAB_CONTENTS',
+        'Businesses.BUSINESS_MENU_TAB_CONTENTS',
+        'Businesses.BUSINESS_FYI_TAB_CONTENTS',
+    )
+}
+
+# Gesture sequences run as one device-side script (utils_gestures.py)
+GESTURE_BATCH = {
+    'timeout_margin_s': 10,  # Added to the summed gesture and wait time for the shell call timeout
+    'drag_steps': 4,  # Points between the start and the end of a drag
+    'drag_hold_s': 0.3  # Rest at the end of a drag before releasing, so the list does not fling
+}
+
+# Momentum-free drags that move content by an exact distance (GeneralScrolling.drag_text_to)
+PRECISE_SCROLL = {
+    'touch_slop_dp': 8,  # Finger travel the list swallows before it moves, until measured on the device
+    'start_y': 0.75,  # Start of an upward drag as a fraction of the screen height; downward drags mirror it
+    'max_span': 0.6,  # Longest single drag as a fraction of the screen height
+    'settle_s': 0.3,  # Pause after the drags before the position is read back
+    'tolerance_px': 40,  # Distance from the target that counts as positioned
+    'max_corrections': 1  # Extra drags if the measured movement missed the target
+}
+
+# Page-by-page enumeration of scrollable lists (utils_scrolling.ListHarvester)
+LIST_HARVEST = {
+    'page_share': 0.5,  # Share of the list height scrolled per page; items up to this tall are seen whole
+    'max_pages': 10,
+    'position_tolerance_px': 24  # Positions of an item this close on two pages count as the same place
+}
@@ -1,21 +1,37 @@
 import pytest
 import os
 import random
-import subprocess
 from time import sleep
 import uiautomator2 as u2
 from datetime import datetime
-from test_reporter import ExcelReporter
-from utils_cache_management import clear_python_cache, clear_screenshot_cache, clear_old_reports
+from test_reporter import ExcelReporter, set_active_reporter
+from utils_artifacts import set_active_store
+from utils_adb import run_adb_command
+from config import ARTIFACT_RETENTION
+from utils_cache_management import ArtifactJanitor
+from utils_device_prep import DevicePreparer
+from utils_device_profile import get_device_profile
+from utils_frame_metrics import FrameMetrics
+from utils_memory import MemorySampler, set_active_sampler
+from utils_logcat import LogcatCapture, LogcatStream
+from utils_app_watchdog import AppCrashWatchdog, set_active_watchdog
+from utils_transitions import TransitionTimer
+from utils_visual_regression import VisualRegression, set_active_visual
 
 # Initialize test items list
 pytest.test_items = []
 
 
-def pytest_collection_modifyitems(items):
+def pytest_collection_modifyitems(config, items):
     """Store test items for later use in reporting"""
     pytest.test_items = items
 
+    # Opt-in benchmarks are skipped before their fixtures, so they do not cost a device reset
+    for item in items:
+        marker = item.get_closest_marker("opt_in")
+        if marker is not None and not config.getoption(marker.args[0]):
+            item.add_marker(pytest.mark.skip(reason=marker.kwargs.get('reason', f"Run with {marker.args[0]}")))
+
     """Order test files numerically based on their filename prefix."""
 
     def get_test_order(item):
@@ -29,17 +45,36 @@ def pytest_collection_modifyitems(items):
     items.sort(key=get_test_order)
 
 
-# Create a single instance of the reporter
-reporter = ExcelReporter()
+# Single instance of the reporter, created in pytest_configure
+reporter = None
 
 
 def pytest_configure(config):
     """Configure pytest and register the Excel reporter."""
+    global reporter
+    # Create the reporter (and its run folder) only once pytest is configured
+    reporter = ExcelReporter()
+    set_active_reporter(reporter)
+    set_active_store(reporter.artifacts)
     # Register the reporter as a plugin
-    config.pluginmanager.register(reporter)
-    clear_python_cache()
-    clear_screenshot_cache(days_old=1)
-    clear_old_reports(days_old=1)
+    config.pluginmanager.register(reporter, 'excel_reporter')
+    # Opt-in performance measurements
+    FrameMetrics.enabled = config.getoption("--frame-metrics")
+    TransitionTimer.enforce = config.getoption("--enforce-slos")
+    # Prune old screenshots and reports without delaying the first test
+    config.artifact_janitor = ArtifactJanitor(
+        max_age_days=ARTIFACT_RETENTION['max_age_days'],
+        max_total_mb=ARTIFACT_RETENTION['max_total_mb'],
+        protected=[reporter.run_folder]
+    )
+    config.artifact_janitor.start()
+
+
+def pytest_unconfigure(config):
+    """Let the artifact janitor finish so its index is not left half-written."""
+    janitor = getattr(config, 'artifact_janitor', None)
+    if janitor is not None:
+        janitor.join(timeout=30)
 
 
 def pytest_addoption(parser):
@@ -48,11 +83,37 @@ def pytest_addoption(parser):
                      help="Android device ID to run tests on")
     parser.addoption("--app-package", action="store", default="com.eatvermont",
                      help="Application package name to test")
-
-
-@pytest.fixture
-def d(request):
-    """Initialize UI Automator 2 device connection and setup"""
+    parser.addoption("--no-crash-watchdog", action="store_true", default=False,
+                     help="Do not fail tests as soon as the app crashes")
+    parser.addoption("--logcat-capture", action="store", default="failed", choices=LogcatCapture.MODES,
+                     help="Write the app's logcat of failed tests, of every test, or of none")
+    parser.addoption("--logcat-buffer-lines", action="store", type=int, default=LogcatCapture.BUFFER_LINES,
+                     help="Maximum number of logcat lines kept per test")
+    parser.addoption("--logcat-tags", action="store", default="",
+                     help="Comma separated extra logcat tags to keep whatever their pid")
+    parser.addoption("--launch-benchmark", action="store", type=int, default=0,
+                     help="Number of cold, warm and hot app starts to benchmark (0 skips the benchmark)")
+    parser.addoption("--frame-metrics", action="store_true", default=False,
+                     help="Measure jank and frame times of the app around scrolls")
+    parser.addoption("--enforce-slos", action="store_true", default=False,
+                     help="Fail tests whose screen transitions exceed the SLOs in config.TRANSITION_SLOS")
+    parser.addoption("--memory-sampling", action="store", default="off", choices=("off",) + MemorySampler.POINTS,
+                     help="Sample the app's memory at test start and end ('test') or also after every "
+                          "navigation helper call ('nav')")
+    parser.addoption("--ask-ai-corpus", action="store_true", default=False,
+                     help="Run the Ask AI latency benchmark over the prompts in ASK_AI_CORPUS")
+    parser.addoption("--soak-iterations", action="store", type=int, default=0,
+                     help="Number of iterations of the memory soak test (0 skips the soak test)")
+    parser.addoption("--visual-regression", action="store", default="off", choices=VisualRegression.MODES,
+                     help="Compare screenshots with the baselines in visual_baselines/: 'report' adds the "
+                          "results to the report, 'fail' also fails tests whose screenshots changed")
+    parser.addoption("--update-baselines", action="store_true", default=False,
+                     help="Store this run's screenshots as visual baselines instead of comparing them")
+
+
+@pytest.fixture(scope="session")
+def device_preparer(request):
+    """Connect to the device once per session and provide the DevicePreparer for the app"""
     device_id = request.config.getoption("--device-id")
     app_package = request.config.getoption("--app-package")
 
@@ -95,94 +156,144 @@ def d(request):
 
     # Connect to the device using direct USB connection
     device = u2.connect_usb(device_id)
+    preparer = DevicePreparer(device, device_id, app_package)
 
-    # Restart UI Automator service
-    print("\nRestarting UI Automator service...")
-    run_adb_command(f"-s {device_id} shell am force-stop com.github.uiautomator")
-    run_adb_command(f"-s {device_id} shell am force-stop com.github.uiautomator.test")
-    sleep(2)
-    device.stop_uiautomator()
-    sleep(2)
-    device.start_uiautomator()
-    sleep(3)  # Wait for service to fully start
-
-    # Clean up the app state before starting
-    print("\nCleaning up app state...")
-    force_stop_output = run_adb_command(f"-s {device_id} shell am force-stop {app_package}")
-    clear_output = run_adb_command(f"-s {device_id} shell pm clear {app_package}")
-    print(f"Force stop output: {force_stop_output}")
-    print(f"Clear output: {clear_output}")
-    sleep(1)  # Wait for cleanup
-
-    # Grant necessary permissions before starting
-    permissions = [
-        'android.permission.ACCESS_FINE_LOCATION',
-        'android.permission.ACCESS_COARSE_LOCATION',
-        'android.permission.CAMERA',
-        'android.permission.READ_EXTERNAL_STORAGE',
-        'android.permission.POST_NOTIFICATIONS',
-        'android.permission.RECORD_AUDIO',
-        'android.permission.READ_CALENDAR',
-        'android.permission.WRITE_CALENDAR'
-    ]
-
-    print("\nGranting app permissions...")
-    for permission in permissions:
-        run_adb_command(f"-s {device_id} shell pm grant {app_package} {permission}")
-
-    # Set FastInputIME as default
-    print("\nSetting FastInputIME as default...")
-    run_adb_command(f"-s {device_id} shell ime set com.github.uiautomator/.FastInputIME")
-    sleep(2)
+    yield preparer
+
+    # Cleanup after the last test
+    print("\nCleaning up after tests...")
+    preparer.shutdown()
+
+
+@pytest.fixture(scope="session")
+def logcat_stream(device_preparer):
+    """Stream the device's logcat once per session for every log consumer"""
+    stream = LogcatStream(device_preparer.device_id)
+    stream.start()
+
+    yield stream
+
+    stream.stop()
+
+
+@pytest.fixture(scope="session")
+def app_watchdog(request, device_preparer, logcat_stream):
+    """Watch the app for crashes, ANRs and process death during tests"""
+    if request.config.getoption("--no-crash-watchdog"):
+        yield None
+        return
+
+    watchdog = AppCrashWatchdog(device_preparer.device, device_preparer.device_id,
+                                device_preparer.app_package, logcat_stream)
+    watchdog.install()
+    set_active_watchdog(watchdog)
+
+    yield watchdog
+
+    set_active_watchdog(None)
+    watchdog.uninstall()
+
+
+@pytest.fixture(scope="session")
+def logcat_capture(request, device_preparer, logcat_stream):
+    """Keep the app's logcat of the running test in a bounded buffer"""
+    mode = request.config.getoption("--logcat-capture")
+    if mode == "off":
+        yield None
+        return
+
+    tags = [tag.strip() for tag in request.config.getoption("--logcat-tags").split(",") if tag.strip()]
+    capture = LogcatCapture(logcat_stream, device_preparer.app_package, mode=mode,
+                            buffer_lines=request.config.getoption("--logcat-buffer-lines"), tags=tags)
+
+    yield capture
 
-    # Start the app using UI Automator 2's app_start
-    print("\nStarting app...")
-    device.app_start(app_package, ".MainActivity")
-    sleep(3)  # Wait for app to load
+    capture.stop()
 
-    # Handle any remaining permission dialogs
-    if device(text="Allow").exists:
-        device(text="Allow").click()
-        sleep(1)
 
-    # Verify app is running
-    current_app = device.app_current()
-    print(f"Current app: {current_app}")
-    assert current_app['package'] == app_package, "App is not running!"
+@pytest.fixture(scope="session")
+def memory_sampler(request, device_preparer):
+    """Sample the app's memory during tests when enabled with --memory-sampling"""
+    mode = request.config.getoption("--memory-sampling")
+    if mode == "off":
+        yield None
+        return
+
+    points = MemorySampler.POINTS if mode == "nav" else ("test",)
+    sampler = MemorySampler(device_preparer.device, device_preparer.app_package, points=points)
+    set_active_sampler(sampler)
+
+    yield sampler
+
+    set_active_sampler(None)
+
+
+@pytest.fixture(scope="session")
+def visual_regression(request, device_preparer):
+    """Compare screenshots with visual baselines when enabled with --visual-regression"""
+    mode = request.config.getoption("--visual-regression")
+    update = request.config.getoption("--update-baselines")
+    if mode == "off" and not update:
+        yield None
+        return
+
+    visual = VisualRegression(device_preparer.device, mode=mode, update=update)
+    set_active_visual(visual)
+
+    yield visual
+
+    set_active_visual(None)
+    visual.shutdown()
+
+
+@pytest.fixture
+def d(request, device_preparer, app_watchdog, logcat_capture, memory_sampler, visual_regression):
+    """Hand over a device with a freshly cleared and running app"""
+    # The previous test's teardown starts preparing the device in the background,
+    # so usually only the tail of that work is left to wait for here
+    device = device_preparer.wait_until_ready()
+    # Display metrics are fetched once per session; only the rotation is checked per test
+    get_device_profile(device).refresh_if_rotated()
+    if app_watchdog is not None:
+        app_watchdog.arm()
+    if logcat_capture is not None:
+        pid = app_watchdog.pid if app_watchdog is not None else None
+        logcat_capture.start(request.node.nodeid, pid=pid)
+    if memory_sampler is not None:
+        memory_sampler.start_test()
 
     yield device
 
-    # Cleanup after tests
-    print("\nCleaning up after tests...")
-    device.app_stop(app_package)
-    run_adb_command(f"-s {device_id} shell am force-stop {app_package}")
+    if memory_sampler is not None:
+        memory_sampler.end_test(request.node.nodeid)
+
+    # The app is stopped on purpose from here on
+    if logcat_capture is not None:
+        logcat_capture.stop()
+    if app_watchdog is not None:
+        app_watchdog.disarm()
+
+    # Reset and relaunch the app for the next test while this test's
+    # report and screenshots are processed
+    if _device_test_follows(request):
+        print("\nPreparing device for the next test...")
+        device_preparer.prepare_async()
+
+
+def _device_test_follows(request):
+    """Check whether a later test of the session still needs the device."""
+    session = request.session
+    if session.shouldstop or session.shouldfail:
+        return False
+    items = session.items
+    index = items.index(request.node) if request.node in items else len(items)
+    return any('d' in item.fixturenames and item.get_closest_marker("skip") is None for item in items[index + 1:])
 
 
 @pytest.fixture
 def screenshots_dir():
-    """Get the screenshots directory for saving test screenshots"""
-    screenshots_dir = os.path.join(os.getcwd(), 'screenshots')
-    os.makedirs(screenshots_dir, exist_ok=True)
-    return screenshots_dir
-
-
-def run_adb_command(command):
-    """Run an ADB command and return its output"""
-    try:
-        # Use explicit path to ADB and force local server
-        adb_path = os.path.expanduser("~/AppData/Local/Android/Sdk/platform-tools/adb.exe")
-        if not os.path.exists(adb_path):
-            print(f"ADB not found at {adb_path}")
-            # Try alternative path
-            adb_path = "adb"  # Use adb from PATH
-
-        result = subprocess.run(f"{adb_path} {command}", shell=True, capture_output=True, text=True)
-        if result.stderr:
-            print(f"ADB command warning/error: {result.stderr}")
-        return result.stdout.strip()
-    except Exception as e:
-        print(f"Error running ADB command: {e}")
-        return None
+    """Get the screenshots directory of the current test run"""
+    return reporter.screenshots_folder
 
 
 @pytest.hookimpl(hookwrapper=True)
@@ -195,19 +306,39 @@ def pytest_runtest_makereport(item, call):
 
     test_fn = item.function.__name__
 
+    app_watchdog = item.funcargs.get('app_watchdog')
+    if report.when == "call" and app_watchdog is not None:
+        # The test is over; a crash must not fail the screenshot and report steps below
+        app_watchdog.disarm()
+
     if report.when == "call" and report.failed and 'd' in item.funcargs:
         device = item.funcargs['d']
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        screenshot_dir = os.path.join(os.getcwd(), 'screenshots')
-        os.makedirs(screenshot_dir, exist_ok=True)
-
-        screenshot_path = os.path.join(
-            screenshot_dir,
-            f"fail_{test_fn}_{timestamp}.png"
-        )
-
-        device.screenshot(screenshot_path)
+        reporter.artifacts.save_screenshot(device, f"fail_{test_fn}_{timestamp}.png", test=item.nodeid)
     if report.when == "call":
+        # Attach the crash stack when the app crashed during the test
+        crash_report = app_watchdog.crash_report() if app_watchdog is not None else None
+        if crash_report:
+            reporter.add_test_detail(item.nodeid, 'crash_log', crash_report)
+
+        # Write the test's logcat buffer and link it from the report row
+        logcat_capture = item.funcargs.get('logcat_capture')
+        if logcat_capture is not None and logcat_capture.should_flush(report.failed):
+            reporter.add_test_detail(item.nodeid, 'logcat', logcat_capture.flush(reporter.artifacts))
+
+        # Waiting for the test's comparisons is only needed when changed screenshots fail it
+        visual = item.funcargs.get('visual_regression')
+        if visual is not None:
+            changed = visual.collect(item.nodeid, wait_for_results=visual.mode == "fail")
+            heatmaps = [result['heatmap'] for _, result in changed if result.get('heatmap')]
+            if heatmaps:
+                reporter.add_test_detail(item.nodeid, 'visual_diff',
+                                         os.path.relpath(heatmaps[0], reporter.artifacts.run_folder))
+            if changed and visual.mode == "fail" and report.passed:
+                report.outcome = "failed"
+                report.longrepr = "Screenshots differ from their visual baselines: " + ", ".join(
+                    f"{name} ({result['status']})" for name, result in changed)
+
         if item.function.__doc__:
             steps = [step.strip() for step in item.function.__doc__.split('\n') if step.strip()]
             for step in steps:
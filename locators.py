@@ -1,6 +1,18 @@
 """
 Locators for the EatVermont app UI elements using XPath selectors
 """
+from collections import namedtuple
+
+
+class ImageLocator(namedtuple('ImageLocator', ['template', 'region', 'fallback'])):
+    """
+    Locator for icons without text or content-desc, matched as an image template.
+
+    template: Template name in templates/ (captured with capture_template.py)
+    region: (left, top, right, bottom) search region as fractions of the screen size
+    fallback: XPath used while no template is captured or the template is not found
+    """
+    __slots__ = ()
 
 
 class LoginPage:
@@ -21,6 +33,13 @@ class LoginPage:
     VERIFY_EMAIL_MESSAGE = '//android.widget.TextView[@text="Check Email"]'
 
 
+class AppStart:
+    """Locators for the first meaningful screen after the app starts"""
+    # Sign-in screen for a cleared app, home screen once a user is signed in
+    FIRST_SCREEN = ('//android.widget.TextView[@text="Get Started"]'
+                    ' | //android.view.ViewGroup[@content-desc="Search"]')
+
+
 class Permissions:
     """Locators for permission dialogs"""
     ALLOW_BUTTON = '//android.widget.Button[@text="Allow"]'
@@ -70,6 +89,7 @@ class BottomNavBar:
     SEARCH = '//android.view.ViewGroup[@content-desc="Search"]'
     EVENTS = '//android.widget.TextView[@text="Events"]'
     FAVORITES = '//*[@content-desc="Favorites"]/com.horcrux.svg.SvgView[1]'
+    FAVORITES_ICON = ImageLocator('bottom_nav_favorites', (0, 0.85, 1, 1), FAVORITES)
     DAY_TRIPS_BUTTON = '//android.widget.TextView[@text="Day Trips"]'
     CHECK_IN_BUTTON = '//android.widget.TextView[@text="Check In"]'
     TRAILS_BUTTON = '//android.widget.TextView[@text="Trails"]'
@@ -107,6 +127,10 @@ class EventsScreen:
         '//android.widget.TextView[@text="{}"]')  # The day text itself
     EVENTS_SCREEN_TILE_1 = '//android.widget.TextView[@text and @index="2"]'
     EVENTS_SCREEN_NO_EVENTS = '//android.widget.TextView[@text="No Events"]'
+    # Day strip of the calendar, or the empty list message: shown once the events screen is up
+    EVENTS_SCREEN_LOADED = ('//android.widget.TextView[@text="Monday" or @text="Tuesday" or @text="Wednesday"'
+                            ' or @text="Thursday" or @text="Friday" or @text="Saturday" or @text="Sunday"'
+                            ' or @text="No Events"]')
     EVENT_TITLE = '//android.widget.TextView[contains(@text, "{}")]'
 
 
@@ -181,6 +205,7 @@ class Events:
                                  '/android.view.ViewGroup[1]/android.view.ViewGroup[2]/android.view.ViewGroup[2]'
                                  '/android.view.ViewGroup[1]/android.view.ViewGroup[1]/android.view.ViewGroup[1]'
                                  '/android.view.ViewGroup[1]/com.horcrux.svg.SvgView[1]/com.horcrux.svg.GroupView[1]')
+    EVENTS_POPUP_CLOSE_ICON = ImageLocator('events_popup_close', (0.5, 0, 1, 0.5), EVENTS_POPUP_CLOSE_BUTTON)
     CAROUSEL_ITEM = '//*[@content-desc="{}"]/android.view.ViewGroup[3]/android.widget.TextView[3]'
     EVENT_DETAILS_TEXT = ('//android.widget.TextView[contains(@text, "Date") or contains(@text, "Time") '
                           'or contains(@text, "Where")]')
@@ -212,6 +237,7 @@ class Businesses:
                               'android.view.ViewGroup[1]/android.view.ViewGroup[1]/android.view.ViewGroup[1]'
                               '/android.view.ViewGroup[1]/android.view.ViewGroup[1]/com.horcrux.svg.SvgView[1]'
                               '/com.horcrux.svg.GroupView[1]')
+    BUSINESSES_BACK_ICON = ImageLocator('business_back', (0, 0, 0.5, 0.3), BUSINESSES_BACK_BUTTON)
 
 
 class DayTrips:
@@ -243,6 +269,7 @@ class DayTrips:
     DATE_PICKER = '//android.view.ViewGroup[@content-desc="{}"]'
     DATE_PICKER_RIGHT_ARROW = ('//*[@resource-id="undefined.header.rightArrow"]/com.horcrux.svg.SvgView[1]'
                                '/com.horcrux.svg.GroupView[1]')
+    DATE_PICKER_RIGHT_ARROW_ICON = ImageLocator('date_picker_right_arrow', (0.5, 0, 1, 0.8), DATE_PICKER_RIGHT_ARROW)
     DATE_PICKER_SELECTED_DATE = '//android.widget.TextView[@text="{}"]'
     AUTO_RECOMMEND_BUTTON = '//android.widget.TextView[@text="Auto-Recommend"]'
     CUSTOM_DAY_TRIP_EVENTS = '//android.widget.TextView[@text="Events"]'
@@ -389,3 +416,15 @@ class PlansPopup:
                                 '/android.view.ViewGroup[1]'
                                 '/android.view.ViewGroup[2]'
                                 '/com.horcrux.svg.SvgView[1]')
+
+
+class VisualMasks:
+    """Dynamic regions masked in visual baseline comparisons, per screenshot name"""
+    # Feeds, dates and event tiles change from day to day
+    EVENT_TILES = '//android.widget.HorizontalScrollView'
+    SCREENSHOTS = {
+        '3_1_1_home_screen_events': [EVENT_TILES],
+        '3_5_3_bottom_nav_home_screen': [EVENT_TILES],
+        '6_2_1_events_details': [Events.EVENT_DETAILS_TEXT],
+        '8_1_1_day_trips_details': [DayTrips.DAY_TRIPS_DETAILS_PLACES],
+    }
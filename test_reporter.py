@@ -1,22 +1,47 @@
+from __future__ import annotations
+
 import os
 from datetime import datetime
-import pandas as pd
-from typing import Dict, List, Any
-import pytest
-from _pytest.nodes import Item
-from _pytest.reports import TestReport
-from _pytest.runner import CallInfo
+from typing import List, TYPE_CHECKING
 import traceback
-import inspect
-import shutil
+
+from utils_artifacts import ArtifactStore
+
+if TYPE_CHECKING:
+    import pytest
+    from _pytest.reports import TestReport
+
+# Reporter of the running pytest session, set by conftest.pytest_configure
+_active_reporter = None
+
+
+def set_active_reporter(reporter):
+    """Register the reporter of the running pytest session."""
+    global _active_reporter
+    _active_reporter = reporter
+
+
+def get_active_reporter():
+    """
+    Get the reporter of the running pytest session.
+
+    Returns:
+        ExcelReporter: The active reporter, or None outside a pytest session
+    """
+    return _active_reporter
 
 
 class ExcelReporter:
+    # Columns holding paths of artifacts in the run folder, written as links
+    LINK_COLUMNS = ('logcat', 'visual_diff')
+
     def __init__(self):
         self.results = []
         self.current_test = {}
         self.screenshots = {}
         self.steps = {}
+        self.details = {}
+        self.metrics = {}
         self.processed_tests = set()
         self.timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         # Create the base reports directory if it doesn't exist
@@ -28,9 +53,9 @@ class ExcelReporter:
             f'Eat_Vermont_Test_Run_{self.timestamp}'
         )
         os.makedirs(self.run_folder, exist_ok=True)
-        # Create a screenshots subfolder
-        self.screenshots_folder = os.path.join(self.run_folder, 'screenshots')
-        os.makedirs(self.screenshots_folder, exist_ok=True)
+        # All artifacts of the run (screenshots first) are written through this store
+        self.artifacts = ArtifactStore(self.run_folder)
+        self.screenshots_folder = self.artifacts.screenshots_folder
 
     def _extract_steps_from_docstring(self, docstring: str) -> List[str]:
         """Extract steps from docstring in a clean format."""
@@ -73,6 +98,7 @@ class ExcelReporter:
             'traceback': '',
             'steps': ''
         }
+        self.artifacts.current_test = nodeid
 
     def add_step(self, nodeid: str, step: str):
         """Add a step to the current test"""
@@ -80,6 +106,17 @@ class ExcelReporter:
             self.steps[nodeid] = []
         self.steps[nodeid].append(step)
 
+    def add_test_detail(self, nodeid: str, column: str, value: str, append: bool = False):
+        """Add an extra column value (e.g. a crash log) to the row of a test, or a new line to it with append"""
+        details = self.details.setdefault(nodeid, {})
+        if append and details.get(column):
+            value = f"{details[column]}\n{value}"
+        details[column] = value
+
+    def add_metric(self, sheet: str, row: dict):
+        """Add a row of performance measurements to an extra sheet of the report"""
+        self.metrics.setdefault(sheet, []).append(row)
+
     def pytest_runtest_logreport(self, report: TestReport):
         """Called for test setup, call, and teardown."""
         if report.when == "call":  # Only process during the call phase
@@ -121,21 +158,14 @@ class ExcelReporter:
                 self.current_test['end_time'] = datetime.now()
                 self.current_test['duration'] = (self.current_test['end_time'] - self.current_test['start_time']).total_seconds()
                 
-                # Add the test result to our collection
-                self.results.append(self.current_test.copy())
+                # Add the test result to our collection, extra columns after the standard ones
+                result = self.current_test.copy()
+                result.update(self.details.pop(report.nodeid, {}))
+                self.results.append(result)
                 print(f"Added test result with steps: {self.current_test['steps']}")  # Debug print
 
     def pytest_sessionfinish(self, session: pytest.Session, exitstatus: int):
         """Called after whole test run finished, right before returning the exit status to the system."""
-        # Move screenshots from root screenshots folder to test run folder
-        root_screenshots_dir = os.path.join(os.getcwd(), 'screenshots')
-        if os.path.exists(root_screenshots_dir):
-            for screenshot in os.listdir(root_screenshots_dir):
-                src = os.path.join(root_screenshots_dir, screenshot)
-                dst = os.path.join(self.screenshots_folder, screenshot)
-                shutil.move(src, dst)
-                print(f"Moved screenshot {screenshot} to test run folder")
-
         # Create summary file
         summary_file = os.path.join(self.run_folder, 'test_run_summary.txt')
         with open(summary_file, 'w') as f:
@@ -158,11 +188,12 @@ class ExcelReporter:
             report_file = f"test_report_{self.timestamp}.xlsx"
             f.write(f"Test Report: {report_file}\n")
             
-            # Add screenshots info
-            screenshots = os.listdir(self.screenshots_folder)
+            # Add screenshots info from the artifact manifest
+            screenshots = [e for e in self.artifacts.entries() if e['kind'] == 'screenshots']
             f.write(f"Screenshots: {len(screenshots)} files in screenshots/\n")
 
-        # Create Excel report
+        # Create Excel report; pandas is only needed once the report is rendered
+        import pandas as pd
         df = pd.DataFrame(self.results)
         excel_file = os.path.join(self.run_folder, f"test_report_{self.timestamp}.xlsx")
         
@@ -182,6 +213,9 @@ class ExcelReporter:
             if col not in df.columns:
                 df[col] = ''
                 
+        # Extra columns are only set for some tests
+        df = df.fillna('')
+
         # Convert all columns to string to avoid Excel formatting issues
         for col in df.columns:
             df[col] = df[col].astype(str)
@@ -207,6 +241,8 @@ class ExcelReporter:
             worksheet.set_column('F:F', 26)  # steps
             worksheet.set_column('G:G', 13)  # end_time
             worksheet.set_column('H:H', 6)  # duration
+            if len(df.columns) > 8:
+                worksheet.set_column(8, len(df.columns) - 1, 40)  # extra columns (e.g. crash_log)
 
             # Format header
             header_format = workbook.add_format({
@@ -293,6 +329,8 @@ class ExcelReporter:
                             worksheet.write(row_num, col_num, value, base_format)
                     elif df.columns[col_num] == 'steps':
                         worksheet.write(row_num, col_num, str_value, steps_format)
+                    elif df.columns[col_num] in self.LINK_COLUMNS and str_value:
+                        worksheet.write_url(row_num, col_num, f"external:{str_value}", base_format, str_value)
                     else:
                         worksheet.write(row_num, col_num, str_value, base_format)
                 
@@ -314,5 +352,16 @@ class ExcelReporter:
             # Fit to page when printing
             worksheet.fit_to_pages(1, 0)
 
+            # Write one sheet per kind of performance measurement
+            for sheet_name, rows in self.metrics.items():
+                metrics_df = pd.DataFrame(rows)
+                metrics_df.to_excel(writer, sheet_name=sheet_name[:31], index=False)
+                metrics_sheet = writer.sheets[sheet_name[:31]]
+                for col_num, value in enumerate(metrics_df.columns.values):
+                    metrics_sheet.write(0, col_num, value, header_format)
+                metrics_sheet.set_column(0, len(metrics_df.columns) - 1, 16)
+                metrics_sheet.autofilter(0, 0, len(metrics_df), len(metrics_df.columns) - 1)
+                metrics_sheet.freeze_panes(1, 0)
+
 
 
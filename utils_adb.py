@@ -0,0 +1,79 @@
+"""
+Utility functions for running ADB commands
+"""
+import functools
+import os
+import subprocess
+
+
+@functools.lru_cache(maxsize=None)
+def get_adb_path():
+    """
+    Get the ADB executable to use for host-side commands.
+
+    Returns:
+        str: Explicit path to the Android SDK ADB if present, otherwise "adb" from PATH
+        (looked up once, as frame sampling runs ADB many times per second)
+    """
+    # Use explicit path to ADB and force local server
+    adb_path = os.path.expanduser("~/AppData/Local/Android/Sdk/platform-tools/adb.exe")
+    if not os.path.exists(adb_path):
+        print(f"ADB not found at {adb_path}")
+        # Try alternative path
+        adb_path = "adb"  # Use adb from PATH
+    return adb_path
+
+
+def run_adb_command(command):
+    """Run an ADB command and return its output"""
+    try:
+        adb_path = get_adb_path()
+        result = subprocess.run(f"{adb_path} {command}", shell=True, capture_output=True, text=True)
+        if result.stderr:
+            print(f"ADB command warning/error: {result.stderr}")
+        return result.stdout.strip()
+    except Exception as e:
+        print(f"Error running ADB command: {e}")
+        return None
+
+
+def run_adb_binary_command(command):
+    """
+    Run an ADB command whose output is binary, e.g. `exec-out screencap`.
+
+    Args:
+        command: ADB arguments, as for run_adb_command
+
+    Returns:
+        bytes: Raw output of the command, or None if it failed
+    """
+    try:
+        adb_path = get_adb_path()
+        result = subprocess.run(f"{adb_path} {command}", shell=True, capture_output=True)
+        if result.returncode != 0:
+            print(f"ADB command failed: {result.stderr.decode(errors='replace')}")
+            return None
+        return result.stdout
+    except Exception as e:
+        print(f"Error running ADB command: {e}")
+        return None
+
+
+def get_app_pid(device_id, package):
+    """
+    Get the pid of a running app.
+
+    Args:
+        device_id: ADB serial of the device
+        package: Package name of the app
+
+    Returns:
+        int: Pid of the app, or None if it is not running
+    """
+    output = run_adb_command(f"-s {device_id} shell pidof {package}")
+    if not output:
+        return None
+    try:
+        return int(output.split()[0])
+    except ValueError:
+        return None
@@ -0,0 +1,244 @@
+"""
+Utility functions for detecting app crashes during tests
+"""
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from utils_adb import get_app_pid
+
+# Watchdog of the running pytest session, set by conftest
+_active_watchdog = None
+
+
+def set_active_watchdog(watchdog):
+    """Register the crash watchdog of the running pytest session."""
+    global _active_watchdog
+    _active_watchdog = watchdog
+
+
+def get_active_watchdog():
+    """
+    Get the crash watchdog of the running pytest session.
+
+    Returns:
+        AppCrashWatchdog: The active watchdog, or None if crash detection is disabled
+    """
+    return _active_watchdog
+
+
+class AppCrashedError(AssertionError):
+    """Raised when the app crashes, stops responding or dies while a test is running."""
+
+
+class AppCrashWatchdog:
+    """
+    Fails the running test as soon as the app crashes, instead of letting it wait
+    for locators that can no longer appear.
+
+    Crashes are detected from the shared logcat stream (FATAL EXCEPTION of the app's
+    pid, ANR, process death) and by a liveness probe checking the app's pid. Once a
+    crash is seen, the next UI Automator call of the test raises AppCrashedError
+    with the crash stack.
+    """
+
+    PROBE_INTERVAL = 2
+    PROBE_MAX_MISSES = 3
+    STACK_SETTLE_TIME = 0.5
+    STACK_MAX_WAIT = 3
+    STACK_MAX_LINES = 200
+
+    def __init__(self, device, device_id, app_package, logcat_stream):
+        """
+        Initialize AppCrashWatchdog for the app under test.
+
+        Args:
+            device: UIAutomator2 device instance
+            device_id: ADB serial of the device
+            app_package: Package name of the app to watch
+            logcat_stream: Running LogcatStream of the device
+        """
+        self.device = device
+        self.device_id = device_id
+        self.app_package = app_package
+        self.logcat_stream = logcat_stream
+        self.pid = None
+        self.crash = None
+        self._armed = False
+        self._restart_expected = False
+        self._last_crash_line = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._probe_thread = None
+        self._original_jsonrpc_call = None
+        self._start_proc = re.compile(rf"Start proc (\d+):{re.escape(app_package)}/")
+        self._died = re.compile(rf"Process {re.escape(app_package)} \(pid (\d+)\) has died")
+
+    def install(self):
+        """Start listening to logcat, start the liveness probe and guard the device's RPC calls."""
+        self.logcat_stream.add_listener(self._on_logcat_line)
+        self._original_jsonrpc_call = self.device.jsonrpc_call
+
+        def guarded_jsonrpc_call(*args, **kwargs):
+            self.check()
+            return self._original_jsonrpc_call(*args, **kwargs)
+
+        self.device.jsonrpc_call = guarded_jsonrpc_call
+        self._stop.clear()
+        self._probe_thread = threading.Thread(target=self._probe_liveness, name="app-liveness-probe", daemon=True)
+        self._probe_thread.start()
+
+    def uninstall(self):
+        """Undo install()."""
+        self._stop.set()
+        if self._probe_thread is not None:
+            self._probe_thread.join(self.PROBE_INTERVAL * 2)
+            self._probe_thread = None
+        self.logcat_stream.remove_listener(self._on_logcat_line)
+        if self._original_jsonrpc_call is not None:
+            self.device.jsonrpc_call = self._original_jsonrpc_call
+            self._original_jsonrpc_call = None
+
+    def arm(self):
+        """Start watching the app for the current test. The app must already be running."""
+        pid = self.query_pid()
+        with self._lock:
+            self.pid = pid
+            self.crash = None
+            self._restart_expected = False
+            self._armed = True
+
+    def disarm(self):
+        """
+        Stop watching the app, e.g. before the device is reset for the next test.
+
+        Returns:
+            str: Crash report of the test, or None if the app did not crash
+        """
+        with self._lock:
+            self._armed = False
+        return self.crash_report()
+
+    @contextmanager
+    def expected_restart(self):
+        """Context manager for steps that stop or restart the app on purpose."""
+        with self._lock:
+            self._restart_expected = True
+        try:
+            yield
+        finally:
+            pid = self.query_pid()
+            with self._lock:
+                self.pid = pid
+                self._restart_expected = False
+
+    def check(self):
+        """
+        Raise if the app crashed while the watchdog is armed.
+
+        Raises:
+            AppCrashedError: If a crash, ANR or process death was detected
+        """
+        if not self._armed or self.crash is None:
+            return
+        self._wait_for_stack()
+        raise AppCrashedError(self.crash_report())
+
+    def crash_report(self):
+        """
+        Get a readable report of the detected crash.
+
+        Returns:
+            str: Crash kind, summary and stack, or None if no crash was detected
+        """
+        crash = self.crash
+        if crash is None:
+            return None
+        lines = [f"App {self.app_package} crashed ({crash['kind']})"]
+        # The stack starts with the summary line when the crash came from logcat
+        lines.extend(crash['stack'] or [crash['summary']])
+        return "\n".join(lines)
+
+    def query_pid(self):
+        """
+        Get the pid of the app from the device.
+
+        Returns:
+            int: Pid of the app, or None if it is not running
+        """
+        return get_app_pid(self.device_id, self.app_package)
+
+    def _record_crash(self, kind, summary, line=None):
+        """Record the first crash of the test; later lines only extend its stack."""
+        with self._lock:
+            if not self._armed or self._restart_expected or self.crash is not None:
+                return
+            self.crash = {
+                'kind': kind,
+                'summary': summary,
+                'pid': line.pid if line else self.pid,
+                'tid': line.tid if line else None,
+                'stack': [line.raw] if line else [],
+            }
+            self._last_crash_line = time.monotonic()
+        print(f"\nApp crash detected ({kind}): {summary}")
+
+    def _on_logcat_line(self, line):
+        """Logcat listener detecting crashes of the app."""
+        if not self._armed:
+            return
+        message = line.message
+
+        match = self._start_proc.search(message)
+        if match:
+            with self._lock:
+                if self._restart_expected or self.pid is None:
+                    self.pid = int(match.group(1))
+            return
+
+        crash = self.crash
+        if crash is not None:
+            # Lines following the crash from the same thread belong to its stack
+            if line.pid == crash['pid'] and line.tid == crash['tid'] and len(crash['stack']) < self.STACK_MAX_LINES:
+                crash['stack'].append(line.raw)
+                self._last_crash_line = time.monotonic()
+            return
+
+        if line.tag == "AndroidRuntime" and message.startswith("FATAL EXCEPTION") and line.pid == self.pid:
+            self._record_crash("FATAL EXCEPTION", message, line)
+        elif line.tag == "AndroidRuntime" and message.startswith(f"Process: {self.app_package}, PID:"):
+            self._record_crash("FATAL EXCEPTION", message, line)
+        elif line.tag == "ActivityManager" and message.startswith(f"ANR in {self.app_package}"):
+            self._record_crash("ANR", message, line)
+        else:
+            match = self._died.search(message)
+            if match and int(match.group(1)) == self.pid:
+                self._record_crash("process died", message, line)
+
+    def _probe_liveness(self):
+        """Thread target checking that the app's pid is still alive while armed."""
+        misses = 0
+        while not self._stop.wait(self.PROBE_INTERVAL):
+            if not self._armed or self._restart_expected or self.crash is not None or self.pid is None:
+                misses = 0
+                continue
+            pid = self.query_pid()
+            if pid == self.pid:
+                misses = 0
+            elif pid is not None:
+                self._record_crash("process died", f"pid {self.pid} is no longer running (current pid: {pid})")
+            else:
+                # pidof also finds nothing when adb hiccups, so only repeated misses count as death
+                misses += 1
+                if misses >= self.PROBE_MAX_MISSES:
+                    self._record_crash("process died", f"pid {self.pid} was not found in {misses} probes")
+                    misses = 0
+
+    def _wait_for_stack(self):
+        """Give logcat a moment to deliver the rest of the crash stack."""
+        deadline = time.monotonic() + self.STACK_MAX_WAIT
+        while time.monotonic() < deadline:
+            if time.monotonic() - self._last_crash_line >= self.STACK_SETTLE_TIME:
+                return
+            time.sleep(0.1)
@@ -0,0 +1,153 @@
+"""
+Utility functions for test run artifacts
+"""
+import json
+import os
+import threading
+from datetime import datetime
+
+from utils_screencap import save_screenshot
+
+# Artifact store of the running pytest session, set by conftest.pytest_configure
+_active_store = None
+
+
+def set_active_store(store):
+    """Register the artifact store of the running pytest session."""
+    global _active_store
+    _active_store = store
+
+
+def get_active_store():
+    """
+    Get the artifact store of the running pytest session.
+
+    Returns:
+        ArtifactStore: The active store, or None outside a pytest session
+    """
+    return _active_store
+
+
+class ArtifactStore:
+    """
+    Single place that decides where test run artifacts are written.
+
+    Every artifact goes straight to its final path inside the run folder and gets
+    a line in the run's manifest, so nothing has to be moved at the end of the session.
+    """
+
+    MANIFEST_FILE = "manifest.jsonl"
+
+    def __init__(self, run_folder):
+        """
+        Initialize ArtifactStore for a test run folder.
+
+        Args:
+            run_folder: Folder of the current test run
+        """
+        self.run_folder = run_folder
+        self.manifest_path = os.path.join(run_folder, self.MANIFEST_FILE)
+        self.screenshots_folder = self.folder_for("screenshots")
+        self.current_test = None
+        self._lock = threading.Lock()
+
+    def folder_for(self, kind):
+        """
+        Get (and create) the run subfolder for a kind of artifact.
+
+        Args:
+            kind: Artifact kind, used as subfolder name (e.g. 'screenshots', 'logs')
+
+        Returns:
+            str: Path of the subfolder
+        """
+        folder = os.path.join(self.run_folder, kind)
+        os.makedirs(folder, exist_ok=True)
+        return folder
+
+    def path_for(self, filename, kind="screenshots"):
+        """
+        Get the final path of an artifact.
+
+        Args:
+            filename: File name of the artifact
+            kind: Artifact kind (default: 'screenshots')
+
+        Returns:
+            str: Path inside the run folder
+        """
+        return os.path.join(self.folder_for(kind), filename)
+
+    def record(self, path, kind, test=None, **details):
+        """
+        Add a manifest entry for an artifact that was written to the run folder.
+
+        Args:
+            path: Path of the artifact
+            kind: Artifact kind
+            test: Test node id the artifact belongs to (default: the running test)
+            **details: Extra JSON-serializable fields for the entry
+
+        Returns:
+            dict: The manifest entry
+        """
+        entry = {
+            'path': os.path.relpath(path, self.run_folder),
+            'kind': kind,
+            'test': test or self.current_test,
+            'created': datetime.now().isoformat(timespec='seconds'),
+        }
+        entry.update(details)
+        with self._lock:
+            with open(self.manifest_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+        return entry
+
+    def save_screenshot(self, device, filename, test=None):
+        """
+        Take a screenshot directly into the run's screenshots folder.
+
+        Args:
+            device: UIAutomator2 device instance
+            filename: File name of the screenshot
+            test: Test node id the screenshot belongs to (default: the running test)
+
+        Returns:
+            str: Path where the screenshot was saved
+        """
+        path = self.path_for(filename, "screenshots")
+        save_screenshot(device, path)
+        self.record(path, "screenshots", test=test)
+        return path
+
+    def save_bytes(self, filename, data, kind, test=None, **details):
+        """
+        Write an artifact from bytes directly into the run folder.
+
+        Args:
+            filename: File name of the artifact
+            data: Content of the artifact
+            kind: Artifact kind, used as subfolder name
+            test: Test node id the artifact belongs to (default: the running test)
+            **details: Extra JSON-serializable fields for the manifest entry
+
+        Returns:
+            str: Path where the artifact was saved
+        """
+        path = self.path_for(filename, kind)
+        with open(path, 'wb') as f:
+            f.write(data)
+        self.record(path, kind, test=test, **details)
+        return path
+
+    def entries(self):
+        """
+        Read the manifest of the run.
+
+        Returns:
+            list: Manifest entries in the order they were written
+        """
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
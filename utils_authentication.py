@@ -4,6 +4,7 @@ Utility functions for authentication
 from time import sleep
 from locators import Events, PlansPopup, LoginPage, GuestMode
 from utils_device_interaction import LaunchApp
+from utils_image_locator import ImageMatcher
 from utils_wait import WaitUtils
 
 
@@ -16,6 +17,7 @@ class SignInPrepare:
             device: UIAutomator2 device instance
         """
         self.device = device
+        self.images = ImageMatcher(device)
 
     def sign_in_and_prepare(self):
         """Sign in and handle initial popups"""
@@ -91,7 +93,7 @@ class SignInPrepare:
         """
         Handle events popup if it appears.
         """
-        close_button = self.device.xpath(Events.EVENTS_POPUP_CLOSE_BUTTON)
+        close_button = self.images.element(Events.EVENTS_POPUP_CLOSE_ICON)
         if close_button.exists:
             close_button.click()
             sleep(2)
@@ -99,7 +101,7 @@ class SignInPrepare:
 
         events_popup = self.device.xpath(Events.EVENTS_POPUP_MAIN)
         if events_popup.exists:
-            close_button = self.device.xpath(Events.EVENTS_POPUP_CLOSE_BUTTON)
+            close_button = self.images.element(Events.EVENTS_POPUP_CLOSE_ICON)
             if close_button.exists:
                 close_button.click()
                 sleep(2)
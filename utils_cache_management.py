@@ -1,12 +1,15 @@
+import json
 import os
-import time
 import shutil
+import threading
+import time
 
 
 def clear_python_cache():
     """
     Remove Python bytecode cache folders (__pycache__).
     These are safe to delete as they will be regenerated when needed.
+    Not run automatically: keeping the caches avoids recompiling every module on each run.
     """
     root_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -16,58 +19,154 @@ def clear_python_cache():
             shutil.rmtree(pycache_path)
 
 
-def clear_screenshot_cache(days_old=7):
-    """
-    Remove screenshots older than specified days.
-
-    Args:
-        days_old: Number of days, screenshots older than this will be removed
-    """
-    root_dir = os.path.dirname(os.path.abspath(__file__))
-    screenshot_dir = os.path.join(root_dir, "screenshots")
-
-    if not os.path.exists(screenshot_dir):
-        return
-
-    cutoff_time = time.time() - (days_old * 86400)
-
-    removed_count = 0
-    for filename in os.listdir(screenshot_dir):
-        file_path = os.path.join(screenshot_dir, filename)
-        if os.path.isfile(file_path) and os.path.getmtime(file_path) < cutoff_time:
-            os.remove(file_path)
-            removed_count += 1
-
-
-
-def clear_old_reports(days_old=30):
+class ArtifactJanitor:
     """
-    Remove test reports older than specified days.
+    Prunes old screenshots and test reports in a background thread.
 
-    Args:
-        days_old: Number of days, reports older than this will be removed
+    Entries are removed when they are older than the age limit, then the oldest
+    entries are removed until each directory fits in the size quota. Sizes and
+    modification times are kept in an index file inside each directory, so only
+    entries that appeared since the previous run have to be stat-ed or walked.
     """
-    root_dir = os.path.dirname(os.path.abspath(__file__))
-    reports_dir = os.path.join(root_dir, "reports")
-
-    if not os.path.exists(reports_dir):
-        return
-
-    cutoff_time = time.time() - (days_old * 86400)
-
-    removed_files = 0
-    removed_dirs = 0
-
-    for item in os.listdir(reports_dir):
-        item_path = os.path.join(reports_dir, item)
-
-        # Skip if it's a recent file
-        if os.path.getmtime(item_path) >= cutoff_time:
-            continue
 
-        if os.path.isfile(item_path):
-            os.remove(item_path)
-            removed_files += 1
-        elif os.path.isdir(item_path):
-            shutil.rmtree(item_path)
-            removed_dirs += 1
\ No newline at end of file
+    INDEX_FILE = ".janitor_index.json"
+    MANAGED_DIRS = ("screenshots", "reports")
+
+    def __init__(self, max_age_days=1, max_total_mb=2048, protected=(), root_dir=None):
+        """
+        Initialize ArtifactJanitor.
+
+        Args:
+            max_age_days: Entries older than this number of days are removed
+            max_total_mb: Maximum total size of each managed directory in megabytes
+            protected: Paths that must never be removed (e.g. the current run folder)
+            root_dir: Directory containing the managed folders (default: this repository)
+        """
+        self.root_dir = root_dir or os.path.dirname(os.path.abspath(__file__))
+        self.max_age_days = max_age_days
+        self.max_total_bytes = int(max_total_mb * 1024 * 1024)
+        self.protected = {os.path.abspath(path) for path in protected}
+        self.removed = []
+        self._thread = None
+
+    def start(self):
+        """Start pruning in a background daemon thread."""
+        self._thread = threading.Thread(target=self.run, name="artifact-janitor", daemon=True)
+        self._thread.start()
+
+    def join(self, timeout=None):
+        """
+        Wait for the background pruning to finish.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            bool: True if pruning has finished
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
+
+    def run(self):
+        """Prune every managed directory."""
+        for name in self.MANAGED_DIRS:
+            directory = os.path.join(self.root_dir, name)
+            try:
+                self.prune_directory(directory)
+            except OSError as e:
+                print(f"Error pruning {directory}: {e}")
+
+    def prune_directory(self, directory):
+        """
+        Remove entries of a directory that are too old or exceed the size quota.
+
+        Args:
+            directory: Path of the screenshots or reports directory
+
+        Returns:
+            list: Paths of the removed entries
+        """
+        if not os.path.isdir(directory):
+            return []
+
+        index = self._load_index(directory)
+        entries = {}
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name == self.INDEX_FILE or os.path.abspath(entry.path) in self.protected:
+                    continue
+                known = index.get(entry.name)
+                if known is None:
+                    known = self._describe(entry)
+                entries[entry.name] = known
+
+        cutoff_time = time.time() - (self.max_age_days * 86400)
+        removed = []
+        # Oldest first, so the quota pass removes the oldest entries
+        ordered = sorted(entries.items(), key=lambda item: item[1]['mtime'])
+        total_size = sum(info['size'] for info in entries.values())
+        for name, info in ordered:
+            if info['mtime'] >= cutoff_time and total_size <= self.max_total_bytes:
+                continue
+            path = os.path.join(directory, name)
+            if self._remove(path):
+                removed.append(path)
+                total_size -= info['size']
+                del entries[name]
+
+        self._save_index(directory, entries)
+        self.removed.extend(removed)
+        return removed
+
+    def _describe(self, entry):
+        """Return the index record (mtime and total size) for a new directory entry."""
+        stat = entry.stat(follow_symlinks=False)
+        if entry.is_dir(follow_symlinks=False):
+            size = self._directory_size(entry.path)
+        else:
+            size = stat.st_size
+        return {'mtime': stat.st_mtime, 'size': size}
+
+    def _directory_size(self, path):
+        """Return the total size of the files below a directory."""
+        size = 0
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    size += self._directory_size(entry.path)
+                else:
+                    size += entry.stat(follow_symlinks=False).st_size
+        return size
+
+    def _remove(self, path):
+        """Remove a file or directory, returning True on success."""
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+            return True
+        except FileNotFoundError:
+            return True
+        except OSError as e:
+            print(f"Could not remove {path}: {e}")
+            return False
+
+    def _load_index(self, directory):
+        """Load the persisted index of a directory, or an empty index."""
+        index_path = os.path.join(directory, self.INDEX_FILE)
+        try:
+            with open(index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self, directory, entries):
+        """Persist the index of a directory."""
+        index_path = os.path.join(directory, self.INDEX_FILE)
+        temp_path = index_path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(entries, f)
+        os.replace(temp_path, index_path)
@@ -3,7 +3,12 @@ Utility functions for device interaction
 """
 from time import sleep
 import time
+from contextlib import nullcontext
 from locators import LoginPage, SettingsScreen, AskAI
+from test_reporter import get_active_reporter
+from utils_app_watchdog import get_active_watchdog
+from utils_perf import summarize
+from utils_wait import WaitUtils
 
 
 class LaunchApp:
@@ -20,9 +25,12 @@ class LaunchApp:
     def clear_app_state(self):
         """Clear app data and restart the app"""
         print("Clearing app state...")
-        self.device.app_stop(self.app_id)
-        self.device.app_clear(self.app_id)
-        self.device.app_start(self.app_id)
+        # Stopping the app on purpose must not be reported as a crash
+        watchdog = get_active_watchdog()
+        with watchdog.expected_restart() if watchdog else nullcontext():
+            self.device.app_stop(self.app_id)
+            self.device.app_clear(self.app_id)
+            self.device.app_start(self.app_id)
         print("App state cleared and restarted")
 
     def handle_notification_permission(self):
@@ -83,6 +91,11 @@ class SearchSubmit:
 
 
 class SearchAI:
+    RESPONSE_TIMEOUT = 60
+    ECHO_TIMEOUT = 5
+    STABLE_FOR = 2
+    SHEET_NAME = "Ask AI Latency"
+
     def __init__(self, device):
         """
         Initialize SearchAI with a device instance.
@@ -91,6 +104,7 @@ class SearchAI:
             device: UIAutomator2 device instance
         """
         self.device = device
+        self.wait = WaitUtils(device, default_timeout=self.RESPONSE_TIMEOUT)
         self.WAIT_TIME_AFTER_CLICK = 2
         self.WAIT_TIME_AFTER_TYPING = 1
 
@@ -100,12 +114,31 @@ class SearchAI:
 
         Args:
             search_term: The term to search for.
+
+        Returns:
+            dict: Response timings in seconds, see submit_prompt()
         """
         ask_ai_button = self.device.xpath(AskAI.ASKAI_ICON)
         assert ask_ai_button.wait(timeout=5), "Could not find Ask AI button"
         ask_ai_button.click()
         sleep(self.WAIT_TIME_AFTER_CLICK)
 
+        return self.submit_prompt(search_term)
+
+    def submit_prompt(self, search_term):
+        """
+        Enters a prompt in the open Ask AI chat, submits it and waits for the answer.
+
+        The prompt is echoed in the chat right after submitting; the first hierarchy
+        change after the echo is taken as the first result, and the answer is complete
+        once the hierarchy has not changed for STABLE_FOR seconds.
+
+        Args:
+            search_term: The prompt to submit.
+
+        Returns:
+            dict: submit_to_first_result and submit_to_stable in seconds (None if not reached within RESPONSE_TIMEOUT)
+        """
         chat_input = None
 
         if self.device.xpath(AskAI.CHAT_INPUT).exists:
@@ -123,8 +156,52 @@ class SearchAI:
         sleep(self.WAIT_TIME_AFTER_TYPING)
         self.device.send_keys(search_term)
         sleep(self.WAIT_TIME_AFTER_TYPING)
+
+        baseline = self.device.dump_hierarchy()
+        submitted = time.perf_counter()
         self.device.press("enter")
-        sleep(10)
+
+        timings = {'submit_to_first_result': None, 'submit_to_stable': None}
+        echoed = self.wait.wait_for_hierarchy_change(baseline, timeout=self.ECHO_TIMEOUT)
+        first_result = self.wait.wait_for_hierarchy_change(echoed or baseline)
+        if first_result is not None:
+            timings['submit_to_first_result'] = round(time.perf_counter() - submitted, 2)
+            last_change = self.wait.wait_for_hierarchy_stable(stable_for=self.STABLE_FOR)
+            if last_change is not None:
+                timings['submit_to_stable'] = round(last_change - submitted, 2)
+
+        print(f"Ask AI timings for '{search_term}': {timings}")
+        self.report_timings(search_term, timings)
+        return timings
+
+    def run_corpus(self, prompts):
+        """
+        Submits every prompt of a corpus in one Ask AI chat and summarizes the latencies.
+
+        Args:
+            prompts: Prompts to submit, in order
+
+        Returns:
+            dict: Summary (count, min, median, p95, max) per timing
+        """
+        results = [self.search_and_submit_ai(prompts[0])]
+        for prompt in prompts[1:]:
+            results.append(self.submit_prompt(prompt))
+
+        summary = {}
+        reporter = get_active_reporter()
+        for timing in ('submit_to_first_result', 'submit_to_stable'):
+            summary[timing] = summarize([result[timing] for result in results])
+            if reporter is not None:
+                reporter.add_metric(self.SHEET_NAME, {'prompt': f"corpus summary ({timing})", **summary[timing]})
+        return summary
+
+    def report_timings(self, search_term, timings):
+        """Add the timings of a prompt to the Ask AI Latency sheet of the report."""
+        reporter = get_active_reporter()
+        if reporter is not None:
+            reporter.add_metric(self.SHEET_NAME, {'test': reporter.artifacts.current_test,
+                                                  'prompt': search_term, **timings})
 
 
 class ForgotPassword:
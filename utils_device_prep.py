@@ -0,0 +1,165 @@
+"""
+Utility functions for preparing the device between tests
+"""
+import threading
+from time import sleep
+
+from utils_adb import run_adb_command
+
+
+class DevicePreparer:
+    """
+    Resets and relaunches the app so every test starts from a clean, running app.
+
+    The preparation can run synchronously, or in a background thread started while
+    the previous test's report, screenshots and teardown are still being processed.
+    The next test then only waits for whatever part of the work is still in flight.
+    """
+
+    PERMISSIONS = [
+        'android.permission.ACCESS_FINE_LOCATION',
+        'android.permission.ACCESS_COARSE_LOCATION',
+        'android.permission.CAMERA',
+        'android.permission.READ_EXTERNAL_STORAGE',
+        'android.permission.POST_NOTIFICATIONS',
+        'android.permission.RECORD_AUDIO',
+        'android.permission.READ_CALENDAR',
+        'android.permission.WRITE_CALENDAR'
+    ]
+    FAST_INPUT_IME = "com.github.uiautomator/.FastInputIME"
+    MAIN_ACTIVITY = ".MainActivity"
+
+    UIAUTOMATOR_WAIT = 2
+    APP_START_TIMEOUT = 20
+    ALLOW_DIALOG_TIMEOUT = 3
+    READY_TIMEOUT = 120
+
+    def __init__(self, device, device_id, app_package):
+        """
+        Initialize DevicePreparer with a device instance.
+
+        Args:
+            device: UIAutomator2 device instance
+            device_id: ADB serial of the device
+            app_package: Application package name to reset and launch
+        """
+        self.device = device
+        self.device_id = device_id
+        self.app_package = app_package
+        self._thread = None
+        self._error = None
+
+    def prepare(self):
+        """
+        Restart UI Automator, clear the app, grant permissions, set the IME and start the app.
+
+        Returns:
+            UIAutomator2 device instance with the app running in the foreground
+
+        Raises:
+            AssertionError: If the app is not running after the preparation
+        """
+        self.restart_uiautomator()
+        self.reset_app()
+        self.launch_app()
+        return self.device
+
+    def prepare_async(self):
+        """
+        Start preparing the device for the next test in a background thread.
+        Does nothing if a preparation is already in flight.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._error = None
+        self._thread = threading.Thread(target=self._prepare_in_background,
+                                        name="device-preparer", daemon=True)
+        self._thread.start()
+
+    def wait_until_ready(self, timeout=None):
+        """
+        Wait for the background preparation and hand over the ready device.
+
+        Args:
+            timeout: Maximum time to wait in seconds (default: READY_TIMEOUT)
+
+        Returns:
+            UIAutomator2 device instance with the app running in the foreground
+
+        Raises:
+            AssertionError: If the preparation did not finish within the timeout
+            Exception: Any error raised by the background preparation
+        """
+        timeout = timeout or self.READY_TIMEOUT
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return self.prepare()
+
+        thread.join(timeout)
+        assert not thread.is_alive(), f"Device was not ready after {timeout} seconds"
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        return self.device
+
+    def shutdown(self):
+        """Wait for any in-flight preparation and stop the app at the end of the session."""
+        if self._thread is not None:
+            self._thread.join(self.READY_TIMEOUT)
+            self._thread = None
+        self._error = None
+        self.device.app_stop(self.app_package)
+        run_adb_command(f"-s {self.device_id} shell am force-stop {self.app_package}")
+
+    def _prepare_in_background(self):
+        """Thread target storing the preparation error for wait_until_ready()."""
+        try:
+            self.prepare()
+        except Exception as e:
+            print(f"\nBackground device preparation failed: {e}")
+            self._error = e
+
+    def restart_uiautomator(self):
+        """Restart the UI Automator service on the device."""
+        print("\nRestarting UI Automator service...")
+        run_adb_command(f"-s {self.device_id} shell am force-stop com.github.uiautomator")
+        run_adb_command(f"-s {self.device_id} shell am force-stop com.github.uiautomator.test")
+        self.device.stop_uiautomator()
+        sleep(self.UIAUTOMATOR_WAIT)
+        # start_uiautomator() only returns once the service answers
+        self.device.start_uiautomator()
+
+    def reset_app(self):
+        """Stop and clear the app, then grant permissions and set FastInputIME as default."""
+        print("\nCleaning up app state...")
+        force_stop_output = run_adb_command(f"-s {self.device_id} shell am force-stop {self.app_package}")
+        clear_output = run_adb_command(f"-s {self.device_id} shell pm clear {self.app_package}")
+        print(f"Force stop output: {force_stop_output}")
+        print(f"Clear output: {clear_output}")
+
+        print("\nGranting app permissions...")
+        grants = "; ".join(f"pm grant {self.app_package} {permission}" for permission in self.PERMISSIONS)
+        run_adb_command(f'-s {self.device_id} shell "{grants}"')
+
+        print("\nSetting FastInputIME as default...")
+        run_adb_command(f"-s {self.device_id} shell ime set {self.FAST_INPUT_IME}")
+
+    def launch_app(self):
+        """
+        Start the app, wait until it is in the foreground and accept any permission dialog.
+
+        Raises:
+            AssertionError: If the app is not running after launch
+        """
+        print("\nStarting app...")
+        self.device.app_start(self.app_package, self.MAIN_ACTIVITY)
+        self.device.app_wait(self.app_package, timeout=self.APP_START_TIMEOUT, front=True)
+
+        # Handle any remaining permission dialogs
+        if self.device(text="Allow").exists(timeout=self.ALLOW_DIALOG_TIMEOUT):
+            self.device(text="Allow").click()
+            sleep(1)
+
+        current_app = self.device.app_current()
+        print(f"Current app: {current_app}")
+        assert current_app['package'] == self.app_package, "App is not running!"
@@ -0,0 +1,137 @@
+"""
+Utility functions for caching the display metrics of the device under test
+"""
+
+# Profiles per device serial, shared by all helpers of the session
+_profiles = {}
+
+
+def get_device_profile(device):
+    """
+    Get the cached profile of a device, fetching it on first use.
+
+    Args:
+        device: UIAutomator2 device instance
+
+    Returns:
+        DeviceProfile: Profile of the device
+    """
+    profile = _profiles.get(device.serial)
+    if profile is None:
+        profile = _profiles[device.serial] = DeviceProfile(device)
+    return profile
+
+
+def invalidate_device_profile(device):
+    """
+    Drop the cached profile of a device, e.g. after changing its orientation or resolution.
+
+    Args:
+        device: UIAutomator2 device instance
+    """
+    _profiles.pop(device.serial, None)
+
+
+class DeviceProfile:
+    """
+    Display size, density, SDK level, orientation and navigation bar inset of a device.
+
+    Fetched with one device.info and one window_size() call, instead of one of them
+    per ScreenSwipe construction or coordinate computation. Gestures are given in
+    normalized coordinates (fractions of the screen) and resolved to pixels locally;
+    uiautomator2 would ask the device for its size again to resolve fractions.
+    """
+
+    PORTRAIT_ROTATIONS = (0, 2)
+
+    def __init__(self, device):
+        """
+        Initialize DeviceProfile with a device instance and fetch the metrics.
+
+        Args:
+            device: UIAutomator2 device instance
+        """
+        self.device = device
+        self.refresh()
+
+    def refresh(self):
+        """Fetch the metrics from the device."""
+        info = self.device.info
+        # Full screen in the current orientation, the coordinate space of taps and screenshots
+        self.width, self.height = self.device.window_size()
+        # Area available to the app, without the navigation bar
+        self.display_width = info['displayWidth']
+        self.display_height = info['displayHeight']
+        self.rotation = info.get('displayRotation', 0)
+        self.sdk = info.get('sdkInt')
+        dp_width = info.get('displaySizeDpX')
+        self.density = round(self.display_width / dp_width, 2) if dp_width else None
+        if self.rotation in self.PORTRAIT_ROTATIONS:
+            self.navigation_bar = max(0, self.height - self.display_height)
+        else:
+            self.navigation_bar = max(0, self.width - self.display_width)
+
+    def refresh_if_rotated(self):
+        """
+        Refetch the metrics if the screen was rotated since they were fetched.
+
+        Returns:
+            bool: True if the screen was rotated
+        """
+        rotation = self.device.info.get('displayRotation', 0)
+        if rotation == self.rotation:
+            return False
+        print(f"Screen rotated from {self.rotation} to {rotation}, refreshing the device profile")
+        self.refresh()
+        return True
+
+    @property
+    def orientation(self):
+        """str: 'portrait' or 'landscape'"""
+        return 'portrait' if self.rotation in self.PORTRAIT_ROTATIONS else 'landscape'
+
+    @property
+    def size(self):
+        """tuple: (width, height) of the full screen in pixels"""
+        return self.width, self.height
+
+    @property
+    def display_size(self):
+        """tuple: (width, height) of the area available to the app in pixels"""
+        return self.display_width, self.display_height
+
+    def point(self, x, y):
+        """
+        Resolve normalized coordinates to pixels.
+
+        Args:
+            x: Horizontal position as a fraction of the display width
+            y: Vertical position as a fraction of the display height
+
+        Returns:
+            tuple: (x, y) in pixels
+        """
+        return int(self.display_width * x), int(self.display_height * y)
+
+    def click(self, x, y):
+        """
+        Tap at normalized coordinates.
+
+        Args:
+            x: Horizontal position as a fraction of the display width
+            y: Vertical position as a fraction of the display height
+        """
+        self.device.click(*self.point(x, y))
+
+    def swipe(self, start_x, start_y, end_x, end_y, duration=0.5):
+        """
+        Swipe between normalized coordinates.
+
+        Args:
+            start_x: Start as a fraction of the display width
+            start_y: Start as a fraction of the display height
+            end_x: End as a fraction of the display width
+            end_y: End as a fraction of the display height
+            duration: Duration of the swipe in seconds
+        """
+        self.device.swipe(*self.point(start_x, start_y), *self.point(end_x, end_y), duration=duration)
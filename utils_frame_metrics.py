@@ -0,0 +1,163 @@
+"""
+Utility functions for measuring frame times while scrolling
+"""
+from contextlib import contextmanager
+
+from test_reporter import get_active_reporter
+
+
+class FrameMetrics:
+    """
+    Measures rendering smoothness of the app around a UI action using
+    `dumpsys gfxinfo <package> framestats`.
+
+    Opt-in: measurements are only taken when FrameMetrics.enabled is set
+    (conftest sets it with --frame-metrics), so regular runs skip the extra
+    dumpsys calls.
+    """
+
+    enabled = False
+
+    SHEET_NAME = "Frame Metrics"
+    PROFILE_DATA_MARKER = "---PROFILEDATA---"
+    DEFAULT_FRAME_INTERVAL_NS = 1e9 / 60
+    # Frame durations are only reliable for frames without flags (e.g. not the first frame of a window)
+    VALID_FLAGS = 0
+
+    def __init__(self, device, app_package='com.eatvermont'):
+        """
+        Initialize FrameMetrics with a device instance.
+
+        Args:
+            device: UIAutomator2 device instance
+            app_package: Package name of the app to measure
+        """
+        self.device = device
+        self.app_package = app_package
+
+    @contextmanager
+    def measure(self, label):
+        """
+        Context manager measuring the frames rendered by the app inside the block.
+        Does nothing unless FrameMetrics.enabled is set.
+
+        Args:
+            label: Name of the measured action, shown in the report
+
+        Yields:
+            dict: Filled with the frame statistics when the block exits (empty when disabled)
+        """
+        stats = {}
+        if not self.enabled:
+            yield stats
+            return
+
+        self.reset()
+        yield stats
+        stats.update(self.analyze(self.collect()))
+        self.report(label, stats)
+
+    def reset(self):
+        """Clear the frame statistics the app collected so far."""
+        self.device.shell(["dumpsys", "gfxinfo", self.app_package, "reset"])
+
+    def collect(self):
+        """
+        Read the per-frame timestamps of the frames rendered since the last reset.
+
+        Returns:
+            tuple: (column names, list of rows of nanosecond timestamps)
+        """
+        output = self.device.shell(["dumpsys", "gfxinfo", self.app_package, "framestats"]).output
+        return self.parse_framestats(output)
+
+    def parse_framestats(self, output):
+        """
+        Parse the PROFILEDATA sections of a framestats dump.
+
+        Args:
+            output: Output of `dumpsys gfxinfo <package> framestats`
+
+        Returns:
+            tuple: (column names, list of rows of integer values); rows of every window are combined
+        """
+        columns = None
+        rows = []
+        in_profile_data = False
+        for line in output.splitlines():
+            line = line.strip()
+            if line == self.PROFILE_DATA_MARKER:
+                in_profile_data = not in_profile_data
+                continue
+            if not in_profile_data or not line:
+                continue
+            values = line.rstrip(",").split(",")
+            if values[0] == "Flags":
+                columns = values
+            elif columns is not None and len(values) == len(columns):
+                try:
+                    rows.append([int(value) for value in values])
+                except ValueError:
+                    continue
+        return columns or [], rows
+
+    def analyze(self, framestats):
+        """
+        Compute jank and frame time statistics.
+
+        Args:
+            framestats: (column names, rows) as returned by collect()
+
+        Returns:
+            dict: frames, janky_frames, jank_pct, p50_ms, p90_ms, p99_ms, max_ms and missed_vsyncs
+        """
+        # NumPy is only needed when frame metrics are enabled
+        import numpy as np
+
+        columns, rows = framestats
+        if not rows:
+            return {'frames': 0}
+        data = np.asarray(rows, dtype=np.int64)
+        column = {name: index for index, name in enumerate(columns)}
+
+        data = data[data[:, column['Flags']] == self.VALID_FLAGS]
+        if len(data) == 0:
+            return {'frames': 0}
+
+        intended_vsync = data[:, column['IntendedVsync']]
+        durations = data[:, column['FrameCompleted']] - intended_vsync
+        if 'FrameDeadline' in column:
+            frame_interval = float(np.median(data[:, column['FrameDeadline']] - intended_vsync))
+        else:
+            frame_interval = self.DEFAULT_FRAME_INTERVAL_NS
+
+        # A frame is janky when it took longer than one frame interval to complete
+        janky = durations > frame_interval
+        # Vsyncs the frame started late by, e.g. because the UI thread was busy
+        missed_vsyncs = np.floor((data[:, column['Vsync']] - intended_vsync) / frame_interval)
+        p50, p90, p99 = np.percentile(durations, [50, 90, 99]) / 1e6
+
+        return {
+            'frames': int(len(durations)),
+            'janky_frames': int(janky.sum()),
+            'jank_pct': round(float(janky.mean()) * 100, 1),
+            'p50_ms': round(float(p50), 2),
+            'p90_ms': round(float(p90), 2),
+            'p99_ms': round(float(p99), 2),
+            'max_ms': round(float(durations.max()) / 1e6, 2),
+            'missed_vsyncs': int(np.clip(missed_vsyncs, 0, None).sum()),
+        }
+
+    def report(self, label, stats):
+        """
+        Add the statistics of an action to the Frame Metrics sheet of the report.
+
+        Args:
+            label: Name of the measured action
+            stats: Statistics returned by analyze()
+        """
+        print(f"Frame metrics for {label}: {stats}")
+        reporter = get_active_reporter()
+        if reporter is None:
+            return
+        reporter.add_metric(self.SHEET_NAME, {'test': reporter.artifacts.current_test, 'action': label, **stats})
@@ -0,0 +1,172 @@
+"""
+Utility functions for sampling screen frames and detecting when the map finished rendering
+"""
+import time
+
+from config import MAP_RENDER, SCREEN_CAPTURE
+from test_reporter import get_active_reporter
+from utils_screencap import RawScreencap
+
+
+class FrameSampler:
+    """
+    Grabs low-resolution grayscale frames of the screen or a region of it.
+
+    Frames are downscaled by keeping every `step`-th pixel, which is enough to
+    tell whether the screen is still changing and keeps each comparison cheap.
+    With the raw capture backend the region is cropped before the gray conversion,
+    and device.screenshot() is only used when raw capture fails.
+    """
+
+    RAW_RETRY_AFTER = 5
+
+    def __init__(self, device, step=4):
+        """
+        Initialize FrameSampler with a device instance.
+
+        Args:
+            device: UIAutomator2 device instance
+            step: Keep every step-th pixel in both directions
+        """
+        self.device = device
+        self.step = step
+        self.screencap = RawScreencap(device) if SCREEN_CAPTURE['backend'] == 'raw' else None
+        self._raw_failed_at = None
+
+    def grab(self, region=None):
+        """
+        Grab one frame.
+
+        Args:
+            region: (left, top, right, bottom) as fractions of the screen size (default: whole screen)
+
+        Returns:
+            numpy.ndarray: 2D uint8 array of gray values
+        """
+        # After a failed raw capture, use screenshots for a while instead of retrying every frame
+        if self.screencap is not None and (self._raw_failed_at is None
+                                           or time.monotonic() - self._raw_failed_at >= self.RAW_RETRY_AFTER):
+            frame = self.screencap.grab(region, self.step, gray=True)
+            if frame is not None:
+                self._raw_failed_at = None
+                return frame
+            self._raw_failed_at = time.monotonic()
+        import numpy as np
+
+        frame = np.asarray(self.device.screenshot().convert('L'))
+        # Crop before striding, as the raw capture does, so both give frames of the same shape
+        if region is not None:
+            height, width = frame.shape
+            left, top, right, bottom = region
+            frame = frame[int(top * height):int(bottom * height), int(left * width):int(right * width)]
+        return frame[::self.step, ::self.step]
+
+    @staticmethod
+    def difference(previous, current, pixel_threshold=0):
+        """
+        Compare two frames of the same size.
+
+        Args:
+            previous: Earlier frame
+            current: Later frame
+            pixel_threshold: Gray value change a pixel needs to count as changed
+
+        Returns:
+            float: Share of changed pixels in percent
+        """
+        import numpy as np
+
+        changed = np.abs(current.astype(np.int16) - previous.astype(np.int16)) > pixel_threshold
+        return float(changed.mean()) * 100
+
+
+class MapRenderDetector:
+    """
+    Detects when the map finished rendering its tiles and markers.
+
+    Map rendering does not show up in the UI hierarchy, so frames of the map
+    region are compared instead: the map counts as rendered once the share of
+    changed pixels stayed below MAP_RENDER['change_threshold_pct'] for
+    MAP_RENDER['settle_frames'] consecutive frames after it changed. Right after
+    a tap the map has often not started redrawing, so still frames only end the
+    wait after a change or after MAP_RENDER['min_wait_s'].
+    """
+
+    SHEET_NAME = "Map Render"
+
+    def __init__(self, device):
+        """
+        Initialize MapRenderDetector with a device instance.
+
+        Args:
+            device: UIAutomator2 device instance
+        """
+        self.device = device
+        self.sampler = FrameSampler(device, step=MAP_RENDER['frame_step'])
+        self.region = MAP_RENDER['region']
+        self.pixel_threshold = MAP_RENDER['pixel_threshold']
+        self.change_threshold = MAP_RENDER['change_threshold_pct']
+        self.settle_frames = MAP_RENDER['settle_frames']
+        self.min_wait = MAP_RENDER['min_wait_s']
+        self.timeout = MAP_RENDER['timeout']
+
+    def wait_for_render(self, label, started_at=None, timeout=None):
+        """
+        Wait until the map region stops changing and report the time it took.
+
+        Args:
+            label: Name of the action that made the map render (e.g. 'events_filter')
+            started_at: time.perf_counter() of the action (default: now)
+            timeout: Maximum time to wait for the map in seconds (default: MAP_RENDER['timeout'])
+
+        Returns:
+            dict: rendered_s (seconds from the action until the last change, None if the
+            map never settled), frames compared, changed (False if the map never redrew
+            within min_wait_s) and settled
+        """
+        started_at = time.perf_counter() if started_at is None else started_at
+        deadline = time.perf_counter() + (self.timeout if timeout is None else timeout)
+
+        previous = self.sampler.grab(self.region)
+        rendered_at = time.perf_counter()
+        frames = 0
+        still_frames = 0
+        changed = False
+        while time.perf_counter() < deadline:
+            current = self.sampler.grab(self.region)
+            captured_at = time.perf_counter()
+            frames += 1
+            if self.sampler.difference(previous, current, self.pixel_threshold) > self.change_threshold:
+                rendered_at = captured_at
+                still_frames = 0
+                changed = True
+            else:
+                still_frames += 1
+                if still_frames >= self.settle_frames and (changed or captured_at - started_at >= self.min_wait):
+                    break
+            previous = current
+
+        # Still frames without any change only show the redraw had not started
+        settled = changed and still_frames >= self.settle_frames
+        result = {
+            'rendered_s': round(rendered_at - started_at, 3) if settled else None,
+            'frames': frames,
+            'changed': changed,
+            'settled': settled,
+        }
+        self.report(label, result)
+        return result
+
+    def report(self, label, result):
+        """
+        Add the render time of an action to the Map Render sheet of the report.
+
+        Args:
+            label: Name of the action
+            result: Result returned by wait_for_render()
+        """
+        print(f"Map render for {label}: {result}")
+        reporter = get_active_reporter()
+        if reporter is None:
+            return
+        reporter.add_metric(self.SHEET_NAME, {'test': reporter.artifacts.current_test, 'action': label, **result})
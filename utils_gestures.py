@@ -0,0 +1,167 @@
+"""
+Utility functions for running gesture sequences as one device-side script
+"""
+import math
+from time import sleep
+
+from config import GESTURE_BATCH
+from utils_device_profile import get_device_profile
+
+
+class GestureBatch:
+    """
+    Sequence of swipes, drags, taps and waits sent to the device as one shell script.
+
+    Each swipe or tap becomes an `input` command and each wait a device-side `sleep`,
+    chained with `;` and run by a single device.shell() call that returns once
+    the last gesture has finished. A multi-swipe helper then costs one round trip
+    instead of a swipe RPC plus a host-side sleep per gesture. Drags need their
+    down, moves and up injected by one process, so each drag is one swipePoints
+    call of the UI Automator server between the shell scripts.
+
+    Coordinates are fractions of the screen, resolved with the cached device profile.
+
+    Usage:
+        GestureBatch(device).swipe(0.5, 0.8, 0.5, 0.2).wait(2).swipe(0.5, 0.8, 0.5, 0.2).run()
+    """
+
+    def __init__(self, device):
+        """
+        Initialize GestureBatch with a device instance.
+
+        Args:
+            device: UIAutomator2 device instance
+        """
+        self.device = device
+        self.profile = get_device_profile(device)
+        # Shell commands, or (points, segment duration) of drags
+        self.commands = []
+
+    def __len__(self):
+        return len(self.commands)
+
+    def _add(self, command, duration):
+        self.commands.append((command, duration))
+        return self
+
+    def tap(self, x, y):
+        """
+        Add a tap.
+
+        Args:
+            x: Horizontal position as a fraction of the display width
+            y: Vertical position as a fraction of the display height
+
+        Returns:
+            GestureBatch: self, for chaining
+        """
+        px, py = self.profile.point(x, y)
+        return self._add(f"input tap {px} {py}", 0)
+
+    def swipe(self, start_x, start_y, end_x, end_y, duration=0.5):
+        """
+        Add a swipe. A short swipe flings the list on release.
+
+        Args:
+            start_x: Start as a fraction of the display width
+            start_y: Start as a fraction of the display height
+            end_x: End as a fraction of the display width
+            end_y: End as a fraction of the display height
+            duration: Duration of the swipe in seconds
+
+        Returns:
+            GestureBatch: self, for chaining
+        """
+        x1, y1 = self.profile.point(start_x, start_y)
+        x2, y2 = self.profile.point(end_x, end_y)
+        return self._add(f"input swipe {x1} {y1} {x2} {y2} {int(duration * 1000)}", duration)
+
+    def drag(self, start_x, start_y, end_x, end_y, duration=1.0, hold=None):
+        """
+        Add a drag that holds still at the end before releasing, so the list does not fling.
+
+        The pointer moves through drag_steps points and then keeps reporting the end
+        point for the hold time, so the release velocity is zero. All of it is one
+        swipePoints call: separate `input motionevent` calls would each start a VM on
+        the device and keep the pointer down long enough to long-press a card.
+
+        Args:
+            start_x: Start as a fraction of the display width
+            start_y: Start as a fraction of the display height
+            end_x: End as a fraction of the display width
+            end_y: End as a fraction of the display height
+            duration: Duration of the movement in seconds
+            hold: Time held at the end before releasing in seconds (default from config)
+
+        Returns:
+            GestureBatch: self, for chaining
+        """
+        hold = GESTURE_BATCH['drag_hold_s'] if hold is None else hold
+        x1, y1 = self.profile.point(start_x, start_y)
+        x2, y2 = self.profile.point(end_x, end_y)
+        steps = GESTURE_BATCH['drag_steps']
+        segment = duration / steps
+        points = [(x1 + (x2 - x1) * step // steps, y1 + (y2 - y1) * step // steps) for step in range(steps + 1)]
+        points += [(x2, y2)] * math.ceil(hold / segment)
+        return self._add((points, segment), segment * (len(points) - 1))
+
+    def wait(self, seconds):
+        """
+        Add a device-side pause, e.g. to let a list settle between swipes.
+
+        Args:
+            seconds: Pause in seconds
+
+        Returns:
+            GestureBatch: self, for chaining
+        """
+        if seconds <= 0:
+            return self
+        return self._add(f"sleep {seconds:g}", seconds)
+
+    def script(self):
+        """
+        Get the shell script of the batch, with drags as comments.
+
+        Returns:
+            str: Commands chained with ';'
+        """
+        return "; ".join(command if isinstance(command, str) else f"# drag {command[0][0]} -> {command[0][-1]}"
+                         for command, _ in self.commands)
+
+    def _run_script(self, commands):
+        """Run shell commands in one call; pure pauses are waited on the host, without a round trip."""
+        if not commands:
+            return
+        duration = sum(seconds for _, seconds in commands)
+        if all(command.startswith("sleep ") for command, _ in commands):
+            sleep(duration)
+            return
+        script = "; ".join(command for command, _ in commands)
+        response = self.device.shell(script, timeout=duration + GESTURE_BATCH['timeout_margin_s'])
+        assert response.exit_code == 0, f"Gesture batch failed ({response.exit_code}): {response.output}"
+
+    def run(self):
+        """
+        Run the batch and wait until it has finished: the shell commands between two drags
+        in one call each, every drag in one swipePoints call. The batch is emptied, so the
+        same instance can be reused for the next sequence.
+
+        Returns:
+            bool: True if the batch ran successfully
+
+        Raises:
+            AssertionError: If a script failed
+        """
+        commands, self.commands = self.commands, []
+        pending = []
+        for command, seconds in commands:
+            if isinstance(command, str):
+                pending.append((command, seconds))
+                continue
+            self._run_script(pending)
+            pending = []
+            points, segment = command
+            self.device.swipe_points(points, duration=segment)
+        self._run_script(pending)
+        return True
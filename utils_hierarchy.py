@@ -0,0 +1,803 @@
+"""
+Utility functions for storing UI hierarchy snapshots compactly and querying them through inverted indexes
+"""
+import bisect
+import io
+import re
+from array import array
+from collections import defaultdict
+from xml.sax.saxutils import quoteattr
+
+from lxml import etree
+from uiautomator2.xpath import PageSource
+
+BOUNDS_PATTERN = re.compile(r'\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]')
+# Invisible characters uiautomator2 also removes before parsing a dump
+INVISIBLE_CHARACTERS = re.compile(r'[\u200B-\u200F\uFEFF]')
+
+
+class StringTable:
+    """Interns strings, so every distinct value is kept once and nodes refer to it by id."""
+
+    def __init__(self):
+        self._ids = {}
+        self._strings = []
+
+    def __len__(self):
+        return len(self._strings)
+
+    def __getitem__(self, string_id):
+        return self._strings[string_id]
+
+    def find(self, value):
+        """
+        Get the id of a string without adding it.
+
+        Args:
+            value: String to look up
+
+        Returns:
+            int: Id of the string, or -1 if it is not in the table
+        """
+        return self._ids.get(value, -1)
+
+    def intern(self, value):
+        """
+        Get the id of a string, adding it to the table if it is new.
+
+        Args:
+            value: String to intern
+
+        Returns:
+            int: Id of the string
+        """
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self._strings)
+            self._strings.append(value)
+        return string_id
+
+
+class NodeStore:
+    """
+    Hierarchy nodes in parallel int32 arrays instead of an element tree.
+
+    Node i is the i-th node of the dump in document order. Its parent, first child,
+    next sibling and the index after its last descendant are kept in one array
+    each, its bounds as four consecutive values of a bounds array, and every
+    attribute as a column of ids into the store's StringTable, so the class names,
+    resource ids and flags repeated across nodes are stored once. The table belongs
+    to the store and is freed with it, so texts of past screens are not kept for
+    the session. A node takes well under 100 bytes, compared to kilobytes as an
+    lxml element.
+    """
+
+    NONE = -1
+
+    def __init__(self):
+        self.strings = StringTable()
+        self.parents = array('i')
+        self.first_children = array('i')
+        self.next_siblings = array('i')
+        self.ends = array('i')
+        self.bounds_table = array('i')
+        self.columns = {}
+        self.root_attributes = {}
+
+    def __len__(self):
+        return len(self.parents)
+
+    @classmethod
+    def from_xml(cls, xml):
+        """
+        Build a store from a hierarchy dump, streaming it so no element tree is kept.
+
+        Args:
+            xml: Output of device.dump_hierarchy()
+
+        Returns:
+            NodeStore: Store with the nodes of the dump
+        """
+        store = cls()
+        stack = []
+        last_children = {}
+        data = INVISIBLE_CHARACTERS.sub('', xml).encode('utf-8')
+        for event, element in etree.iterparse(io.BytesIO(data), events=('start', 'end')):
+            if element.tag != 'node':
+                if event == 'start' and element.tag == 'hierarchy':
+                    store.root_attributes = dict(element.attrib)
+                continue
+            if event == 'end':
+                store.ends[stack.pop()] = len(store.parents)
+                element.clear()
+                continue
+
+            index = len(store.parents)
+            parent = stack[-1] if stack else cls.NONE
+            store.parents.append(parent)
+            store.first_children.append(cls.NONE)
+            store.next_siblings.append(cls.NONE)
+            store.ends.append(index + 1)
+            if parent != cls.NONE:
+                if parent in last_children:
+                    store.next_siblings[last_children[parent]] = index
+                else:
+                    store.first_children[parent] = index
+                last_children[parent] = index
+
+            match = BOUNDS_PATTERN.match(element.get('bounds', ''))
+            store.bounds_table.extend([int(value) for value in match.groups()] if match else (0, 0, 0, 0))
+            for column in store.columns.values():
+                column.append(cls.NONE)
+            for name, value in element.attrib.items():
+                if name == 'bounds':
+                    continue
+                if name not in store.columns:
+                    store.columns[name] = array('i', [cls.NONE]) * (index + 1)
+                store.columns[name][index] = store.strings.intern(value)
+            stack.append(index)
+        return store
+
+    def to_xml(self):
+        """
+        Write the nodes back as a hierarchy dump.
+
+        Returns:
+            str: XML in the format of device.dump_hierarchy()
+        """
+        root_attributes = ''.join(f" {name}={quoteattr(value)}" for name, value in self.root_attributes.items())
+        parts = [f"<?xml version='1.0' encoding='UTF-8' standalone='yes' ?><hierarchy{root_attributes}>"]
+        open_nodes = []
+        for index in range(len(self)):
+            while open_nodes and self.ends[open_nodes[-1]] <= index:
+                open_nodes.pop()
+                parts.append("</node>")
+            attributes = ''.join(f" {name}={quoteattr(self.strings[column[index]])}"
+                                 for name, column in self.columns.items() if column[index] != self.NONE)
+            left, top, right, bottom = self.bounds(index)
+            attributes += f' bounds="[{left},{top}][{right},{bottom}]"'
+            if self.ends[index] == index + 1:
+                parts.append(f"<node{attributes} />")
+            else:
+                parts.append(f"<node{attributes}>")
+                open_nodes.append(index)
+        parts.extend("</node>" for _ in open_nodes)
+        parts.append("</hierarchy>")
+        return ''.join(parts)
+
+    def nbytes(self):
+        """
+        Get the memory used by the node arrays, without the strings themselves.
+
+        Returns:
+            int: Size in bytes
+        """
+        arrays = [self.parents, self.first_children, self.next_siblings, self.ends, self.bounds_table,
+                  *self.columns.values()]
+        return sum(len(values) * values.itemsize for values in arrays)
+
+    def attribute(self, index, name):
+        """
+        Get an attribute of a node.
+
+        Args:
+            index: Node index
+            name: Attribute name as in the dump, e.g. 'text', 'class', 'clickable'
+
+        Returns:
+            str: Attribute value, '' if the node does not have it
+        """
+        column = self.columns.get(name)
+        if column is None or column[index] == self.NONE:
+            return ''
+        return self.strings[column[index]]
+
+    def values(self, name):
+        """
+        Get an attribute of all nodes.
+
+        Args:
+            name: Attribute name as in the dump
+
+        Returns:
+            list: Attribute value per node in document order, '' where a node does not have it
+        """
+        column = self.columns.get(name)
+        if column is None:
+            return [''] * len(self)
+        return ['' if string_id == self.NONE else self.strings[string_id] for string_id in column]
+
+    def bounds(self, index):
+        """
+        Get the bounds of a node.
+
+        Args:
+            index: Node index
+
+        Returns:
+            tuple: (left, top, right, bottom) in pixels
+        """
+        return tuple(self.bounds_table[index * 4:index * 4 + 4])
+
+    def parent(self, index):
+        """Get the index of a node's parent, or None for the top node."""
+        parent = self.parents[index]
+        return None if parent == self.NONE else parent
+
+    def children(self, index):
+        """Get the indexes of a node's children in document order."""
+        children = []
+        child = self.first_children[index]
+        while child != self.NONE:
+            children.append(child)
+            child = self.next_siblings[child]
+        return children
+
+    def is_descendant(self, index, ancestor):
+        """Check whether a node lies in the subtree of another; descendants follow their ancestor in document order."""
+        return ancestor < index < self.ends[ancestor]
+
+
+class TextIndex:
+    """
+    Inverted index over one attribute of all nodes of a snapshot.
+
+    Exact values map to their nodes; prefixes are answered by bisecting the sorted
+    distinct values, and substrings through a trigram index over the distinct
+    values, so a query only verifies the values sharing all trigrams of the substring.
+    """
+
+    GRAM = 3
+
+    def __init__(self, values):
+        """
+        Build the index.
+
+        Args:
+            values: Attribute value per node, in document order ('' for nodes without it)
+        """
+        self._nodes = defaultdict(list)
+        for node, value in enumerate(values):
+            if value:
+                self._nodes[value].append(node)
+        self._values = sorted(self._nodes)
+        self._grams = defaultdict(set)
+        for position, value in enumerate(self._values):
+            for start in range(len(value) - self.GRAM + 1):
+                self._grams[value[start:start + self.GRAM]].add(position)
+
+    def exact(self, value):
+        """
+        Get the nodes with a value.
+
+        Args:
+            value: Attribute value
+
+        Returns:
+            list: Node indexes in document order
+        """
+        return list(self._nodes.get(value, ()))
+
+    def prefix(self, prefix):
+        """
+        Get the nodes whose value starts with a prefix.
+
+        Args:
+            prefix: Start of the attribute value
+
+        Returns:
+            list: Node indexes in document order
+        """
+        nodes = []
+        position = bisect.bisect_left(self._values, prefix)
+        while position < len(self._values) and self._values[position].startswith(prefix):
+            nodes.extend(self._nodes[self._values[position]])
+            position += 1
+        return sorted(nodes)
+
+    def contains(self, substring):
+        """
+        Get the nodes whose value contains a substring, like XPath contains().
+
+        Args:
+            substring: Part of the attribute value
+
+        Returns:
+            list: Node indexes in document order
+        """
+        if len(substring) < self.GRAM:
+            candidates = range(len(self._values))
+        else:
+            grams = sorted((self._grams.get(substring[start:start + self.GRAM], set())
+                            for start in range(len(substring) - self.GRAM + 1)), key=len)
+            candidates = set.intersection(*grams)
+        nodes = []
+        for position in candidates:
+            value = self._values[position]
+            if substring in value:
+                nodes.extend(self._nodes[value])
+        return sorted(nodes)
+
+
+class SnapshotNode:
+    """One element of a HierarchySnapshot, with the exists/click interface of XPath selectors."""
+
+    __slots__ = ('snapshot', 'index')
+
+    def __init__(self, snapshot, index):
+        """
+        Initialize SnapshotNode.
+
+        Args:
+            snapshot: HierarchySnapshot the node belongs to
+            index: Position of the node in document order
+        """
+        self.snapshot = snapshot
+        self.index = index
+
+    def __eq__(self, other):
+        return isinstance(other, SnapshotNode) and other.snapshot is self.snapshot and other.index == self.index
+
+    def __hash__(self):
+        return hash((id(self.snapshot), self.index))
+
+    def __repr__(self):
+        return f"<SnapshotNode {self.index} {self.class_name} text={self.text!r} content-desc={self.content_desc!r}>"
+
+    @property
+    def exists(self):
+        """bool: Always True, the node was on screen when the snapshot was taken"""
+        return True
+
+    @property
+    def text(self):
+        return self.snapshot.attribute(self.index, 'text')
+
+    @property
+    def content_desc(self):
+        return self.snapshot.attribute(self.index, 'content-desc')
+
+    @property
+    def resource_id(self):
+        return self.snapshot.attribute(self.index, 'resource-id')
+
+    @property
+    def class_name(self):
+        return self.snapshot.attribute(self.index, 'class')
+
+    @property
+    def bounds(self):
+        """tuple: (left, top, right, bottom) in pixels"""
+        return self.snapshot.bounds(self.index)
+
+    def center(self):
+        """
+        Get the center of the node.
+
+        Returns:
+            tuple: (x, y) in pixels
+        """
+        left, top, right, bottom = self.bounds
+        return (left + right) // 2, (top + bottom) // 2
+
+    def parent(self):
+        """
+        Get the parent node.
+
+        Returns:
+            SnapshotNode: The parent, or None for the top node
+        """
+        parent = self.snapshot.parent(self.index)
+        return None if parent is None else SnapshotNode(self.snapshot, parent)
+
+    def children(self, class_name=None):
+        """
+        Get the child nodes.
+
+        Args:
+            class_name: Only return children of this class
+
+        Returns:
+            list: SnapshotNode children in document order
+        """
+        return [SnapshotNode(self.snapshot, child) for child in self.snapshot.children(self.index)
+                if class_name is None or self.snapshot.attribute(child, 'class') == class_name]
+
+    def descendants(self, class_name=None):
+        """
+        Get the nodes in the subtree below this one.
+
+        Args:
+            class_name: Only return descendants of this class
+
+        Returns:
+            list: SnapshotNode descendants in document order
+        """
+        end = self.snapshot.store.ends[self.index]
+        return [SnapshotNode(self.snapshot, index) for index in range(self.index + 1, end)
+                if class_name is None or self.snapshot.attribute(index, 'class') == class_name]
+
+    def texts(self):
+        """
+        Get the non-empty texts of this node and its descendants.
+
+        Returns:
+            list: Texts in document order
+        """
+        end = self.snapshot.store.ends[self.index]
+        texts = (self.snapshot.attribute(index, 'text') for index in range(self.index, end))
+        return [text for text in texts if text]
+
+    def ancestors(self):
+        """
+        Get the ancestors from the parent up to the top node.
+
+        Returns:
+            list: SnapshotNode ancestors, nearest first
+        """
+        ancestors = []
+        node = self.parent()
+        while node is not None:
+            ancestors.append(node)
+            node = node.parent()
+        return ancestors
+
+    def click(self):
+        """
+        Tap the center of the node on the device the snapshot was captured from.
+
+        Raises:
+            AssertionError: If the snapshot was not captured from a device
+        """
+        assert self.snapshot.device is not None, "Snapshot was not captured from a device"
+        self.snapshot.device.click(*self.center())
+
+
+class SpatialIndex:
+    """
+    Geometric queries over the bounds of all nodes of a snapshot.
+
+    The bounds are a zero-copy (n, 4) NumPy view of the NodeStore's bounds array,
+    so every query is a vectorized comparison over all nodes that takes
+    microseconds and needs no device call. NumPy is only imported by the index,
+    so snapshots that are never queried geometrically do not load it.
+    """
+
+    def __init__(self, snapshot):
+        """
+        Build the index.
+
+        Args:
+            snapshot: HierarchySnapshot to index
+        """
+        import numpy as np
+
+        self.snapshot = snapshot
+        store = snapshot.store
+        self.bounds = np.frombuffer(store.bounds_table, dtype=np.int32).reshape(-1, 4)
+        self.centers_y = (self.bounds[:, 1] + self.bounds[:, 3]) // 2
+        self.areas = ((self.bounds[:, 2] - self.bounds[:, 0]).clip(0)
+                      * (self.bounds[:, 3] - self.bounds[:, 1]).clip(0))
+        self.interactive = np.zeros(len(store), dtype=bool)
+        for name in ('clickable', 'long-clickable', 'checkable', 'scrollable'):
+            column = store.columns.get(name)
+            if column is not None:
+                self.interactive |= np.frombuffer(column, dtype=np.int32) == store.strings.find('true')
+
+    @property
+    def screen(self):
+        """tuple: Bounds of the top node, i.e. the visible screen"""
+        return tuple(int(value) for value in self.bounds[0]) if len(self.bounds) else (0, 0, 0, 0)
+
+    def _nodes(self, mask):
+        return [SnapshotNode(self.snapshot, int(index)) for index in mask.nonzero()[0]]
+
+    def in_viewport(self, viewport=None, fully=False):
+        """
+        Get the nodes inside a viewport.
+
+        Args:
+            viewport: (left, top, right, bottom) in pixels (default: the screen)
+            fully: Only return nodes that are completely inside, instead of overlapping it
+
+        Returns:
+            list: SnapshotNode matches in document order
+        """
+        left, top, right, bottom = viewport or self.screen
+        b = self.bounds
+        if fully:
+            mask = (b[:, 0] >= left) & (b[:, 1] >= top) & (b[:, 2] <= right) & (b[:, 3] <= bottom)
+        else:
+            mask = (b[:, 0] < right) & (b[:, 2] > left) & (b[:, 1] < bottom) & (b[:, 3] > top)
+        return self._nodes(mask & (self.areas > 0))
+
+    def fully_visible_items(self, container):
+        """
+        Get the items of a list container that are completely visible inside it.
+
+        The items are the container's children, or the children of its only child
+        when it wraps its content in one view, as ScrollView does.
+
+        Args:
+            container: SnapshotNode of the scrollable container
+
+        Returns:
+            list: SnapshotNode items in document order
+        """
+        items = container.children()
+        if len(items) == 1:
+            items = items[0].children()
+        left, top, right, bottom = container.bounds
+        visible = []
+        for item in items:
+            item_left, item_top, item_right, item_bottom = item.bounds
+            if (left <= item_left and top <= item_top and item_right <= right and item_bottom <= bottom
+                    and item_bottom > item_top):
+                visible.append(item)
+        return visible
+
+    def nearest_to_y(self, y, nodes=None):
+        """
+        Get the node whose vertical center is nearest to a y coordinate.
+
+        Args:
+            y: Y coordinate in pixels
+            nodes: SnapshotNode candidates (default: all nodes with a size)
+
+        Returns:
+            SnapshotNode: The nearest node, or None if there are no candidates
+        """
+        import numpy as np
+
+        if nodes is not None:
+            indexes = np.array([node.index for node in nodes], dtype=np.intp)
+        else:
+            indexes = np.flatnonzero(self.areas > 0)
+        if not len(indexes):
+            return None
+        nearest = indexes[np.argmin(np.abs(self.centers_y[indexes] - y))]
+        return SnapshotNode(self.snapshot, int(nearest))
+
+    def hit(self, x, y, interactive=False):
+        """
+        Get the topmost node at a point.
+
+        Nodes later in document order are drawn above earlier ones, so the topmost
+        node is the last one whose bounds contain the point.
+
+        Args:
+            x: X coordinate in pixels
+            y: Y coordinate in pixels
+            interactive: Only consider clickable, checkable or scrollable nodes
+
+        Returns:
+            SnapshotNode: The topmost node, or None if no node contains the point
+        """
+        b = self.bounds
+        mask = (b[:, 0] <= x) & (x < b[:, 2]) & (b[:, 1] <= y) & (y < b[:, 3])
+        if interactive:
+            mask &= self.interactive
+        hits = mask.nonzero()[0]
+        return SnapshotNode(self.snapshot, int(hits[-1])) if len(hits) else None
+
+    def is_interactive(self, x, y):
+        """
+        Check whether a tap at a point would hit a clickable, checkable or scrollable node.
+
+        Args:
+            x: X coordinate in pixels
+            y: Y coordinate in pixels
+
+        Returns:
+            bool: True if an interactive node contains the point
+        """
+        return self.hit(x, y, interactive=True) is not None
+
+    def free_point(self, region=None, grid=8, max_area_share=0.5):
+        """
+        Find a point where a tap only hits the background, e.g. to dismiss a sheet or popup.
+
+        Args:
+            region: (left, top, right, bottom) to search in pixels (default: the screen)
+            grid: Number of points tried per row and column
+            max_area_share: Interactive nodes covering at least this share of the screen count as background
+
+        Returns:
+            tuple: (x, y) in pixels, or None if every point hits a control
+        """
+        left, top, right, bottom = region or self.screen
+        if right <= left or bottom <= top:
+            return None
+        screen_area = max(int(self.areas[0]), 1) if len(self.areas) else 1
+        for row in range(1, grid):
+            for column in range(1, grid):
+                x = left + (right - left) * column // grid
+                y = top + (bottom - top) * row // grid
+                node = self.hit(x, y, interactive=True)
+                if node is None or self.areas[node.index] >= screen_area * max_area_share:
+                    return x, y
+        return None
+
+
+class HierarchySnapshot:
+    """
+    Parsed hierarchy dump of one screen.
+
+    The nodes are kept in a NodeStore, numbered in document order; text,
+    content-desc, resource-id and class are indexed with a TextIndex on first use. Queries for several values at once
+    (e.g. all seven days of the week) are answered from one dump through the
+    indexes, instead of one XPath evaluation of the whole tree per value.
+    """
+
+    INDEXED_ATTRIBUTES = ('text', 'content-desc', 'resource-id', 'class')
+
+    def __init__(self, xml=None, device=None, store=None):
+        """
+        Parse a hierarchy dump into a NodeStore.
+
+        Args:
+            xml: Output of device.dump_hierarchy()
+            device: UIAutomator2 device instance the dump came from, used by SnapshotNode.click()
+            store: NodeStore to use instead of parsing xml
+        """
+        self.device = device
+        self.store = store if store is not None else NodeStore.from_xml(xml)
+        # Built on the first query, so snapshots that are only kept stay small
+        self._indexes = {}
+        self._spatial = None
+
+    @classmethod
+    def capture(cls, device):
+        """
+        Dump the hierarchy of the current screen.
+
+        Args:
+            device: UIAutomator2 device instance
+
+        Returns:
+            HierarchySnapshot: Snapshot of the current screen
+        """
+        return cls(device.dump_hierarchy(), device)
+
+    def __len__(self):
+        return len(self.store)
+
+    def to_xml(self):
+        """
+        Get the snapshot as a hierarchy dump.
+
+        Returns:
+            str: XML in the format of device.dump_hierarchy()
+        """
+        return self.store.to_xml()
+
+    def attribute(self, index, name):
+        """
+        Get an attribute of a node.
+
+        Args:
+            index: Node index
+            name: Attribute name as in the dump, e.g. 'text', 'content-desc', 'clickable'
+
+        Returns:
+            str: Attribute value, '' if the node does not have it
+        """
+        return self.store.attribute(index, name)
+
+    def bounds(self, index):
+        """
+        Get the bounds of a node.
+
+        Args:
+            index: Node index
+
+        Returns:
+            tuple: (left, top, right, bottom) in pixels
+        """
+        return self.store.bounds(index)
+
+    def parent(self, index):
+        """Get the index of a node's parent, or None for the top node."""
+        return self.store.parent(index)
+
+    def children(self, index):
+        """Get the indexes of a node's children in document order."""
+        return self.store.children(index)
+
+    def index(self, attribute):
+        """
+        Get the index of an attribute, building it on first use.
+
+        Args:
+            attribute: One of INDEXED_ATTRIBUTES
+
+        Returns:
+            TextIndex: Index of the attribute
+        """
+        if attribute not in self._indexes:
+            self._indexes[attribute] = TextIndex(self.store.values(attribute))
+        return self._indexes[attribute]
+
+    def spatial(self):
+        """
+        Get the spatial index of the snapshot, building it on first use.
+
+        Returns:
+            SpatialIndex: Geometric queries over the node bounds
+        """
+        if self._spatial is None:
+            self._spatial = SpatialIndex(self)
+        return self._spatial
+
+    def find(self, attribute, value=None, prefix=None, contains=None, class_name=None):
+        """
+        Find nodes by one attribute through its index.
+
+        Args:
+            attribute: One of INDEXED_ATTRIBUTES
+            value: Exact attribute value
+            prefix: Start of the attribute value
+            contains: Part of the attribute value, like XPath contains()
+            class_name: Only return nodes of this class
+
+        Returns:
+            list: SnapshotNode matches in document order
+        """
+        index = self.index(attribute)
+        if value is not None:
+            nodes = index.exact(value)
+        elif prefix is not None:
+            nodes = index.prefix(prefix)
+        else:
+            nodes = index.contains(contains)
+        if class_name is not None:
+            nodes = [node for node in nodes if self.store.attribute(node, 'class') == class_name]
+        return [SnapshotNode(self, node) for node in nodes]
+
+    def find_any(self, attribute, values, match='contains', class_name=None):
+        """
+        Find the nodes for several values of one attribute at once.
+
+        Args:
+            attribute: One of INDEXED_ATTRIBUTES
+            values: Attribute values, prefixes or substrings to look up
+            match: 'exact', 'prefix' or 'contains'
+            class_name: Only return nodes of this class
+
+        Returns:
+            dict: Value to the list of SnapshotNode matches in document order; values without matches map to []
+        """
+        keyword = {'exact': 'value', 'prefix': 'prefix', 'contains': 'contains'}[match]
+        return {value: self.find(attribute, class_name=class_name, **{keyword: value}) for value in values}
+
+    def first(self, attribute, values, match='contains', class_name=None):
+        """
+        Find the first node in document order that matches any of several values.
+
+        Args:
+            attribute: One of INDEXED_ATTRIBUTES
+            values: Attribute values, prefixes or substrings to look up
+            match: 'exact', 'prefix' or 'contains'
+            class_name: Only return nodes of this class
+
+        Returns:
+            SnapshotNode: The first match, or None if nothing matches
+        """
+        matches = [node for nodes in self.find_any(attribute, values, match, class_name).values() for node in nodes]
+        return min(matches, key=lambda node: node.index, default=None)
+
+    def xpath(self, expression):
+        """
+        Evaluate an XPath expression on the snapshot, for queries the indexes cannot answer.
+
+        Args:
+            expression: XPath expression as used with device.xpath()
+
+        Returns:
+            list: SnapshotNode matches in document order
+        """
+        # The tree only lives for this query; the snapshot itself keeps the compact store
+        root = PageSource(self.to_xml()).root
+        positions = {element: index for index, element in enumerate(element for element in root.iter()
+                                                                    if element is not root)}
+        return [SnapshotNode(self, positions[element]) for element in root.xpath(expression) if element in positions]
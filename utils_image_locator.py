@@ -0,0 +1,245 @@
+"""
+Utility functions for locating icons by image template matching
+"""
+import glob
+import os
+import re
+
+from config import IMAGE_LOCATOR
+from utils_device_profile import get_device_profile
+from utils_frame_sampling import FrameSampler
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+TEMPLATE_NAME = re.compile(r"^(?P<name>.+)@(?P<width>\d+)x(?P<height>\d+)\.png$")
+
+
+def template_path(name, width, height):
+    """
+    Get the file of a template captured at a screen resolution.
+
+    Args:
+        name: Template name
+        width: Screen width in pixels
+        height: Screen height in pixels
+
+    Returns:
+        str: Path of the template file
+    """
+    return os.path.join(TEMPLATE_DIR, f"{name}@{width}x{height}.png")
+
+
+def downsample(image, factor):
+    """
+    Shrink a gray image by averaging factor x factor pixel blocks.
+
+    Args:
+        image: 2D array
+        factor: Shrink factor (1 keeps the image)
+
+    Returns:
+        numpy.ndarray: 2D float32 array
+    """
+    import numpy as np
+
+    image = np.asarray(image, dtype=np.float32)
+    if factor == 1:
+        return image
+    rows, cols = image.shape[0] // factor, image.shape[1] // factor
+    return image[:rows * factor, :cols * factor].reshape(rows, factor, cols, factor).mean(axis=(1, 3))
+
+
+def normalized_cross_correlation(image, template, min_std=1.0):
+    """
+    Score every placement of a template inside an image.
+
+    Window sums come from float64 integral images and the correlation from one FFT
+    product, so no placement is looped over in Python and no window is copied.
+    Windows flatter than min_std gray levels score 0: they cannot show the template,
+    and their near-zero variance would otherwise inflate the score.
+
+    Args:
+        image: 2D float array to search
+        template: 2D float array, smaller than the image
+        min_std: Standard deviation below which a window or the template counts as flat
+
+    Returns:
+        numpy.ndarray: 2D array of scores between -1 and 1, one per top-left placement
+    """
+    import numpy as np
+
+    image = np.asarray(image, dtype=np.float64)
+    template = np.asarray(template, dtype=np.float64)
+    template_height, template_width = template.shape
+    out_shape = (image.shape[0] - template_height + 1, image.shape[1] - template_width + 1)
+    count = template.size
+    centered = template - template.mean()
+    template_norm = np.sqrt((centered ** 2).sum())
+    if template_norm < min_std * np.sqrt(count):
+        return np.zeros(out_shape)
+
+    # Sum and sum of squares of every window from integral images
+    integral = np.pad(image, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+    integral_sq = np.pad(image ** 2, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+
+    def window_sums(table):
+        return (table[template_height:, template_width:] - table[:-template_height, template_width:]
+                - table[template_height:, :-template_width] + table[:-template_height, :-template_width])
+
+    sums = window_sums(integral)
+    window_var = np.maximum(window_sums(integral_sq) - sums ** 2 / count, 0)
+
+    # Correlation as a convolution with the flipped template; placements that fit
+    # the image do not wrap around, so the transform size is the image size
+    spectrum = np.fft.rfft2(image) * np.fft.rfft2(centered[::-1, ::-1], s=image.shape)
+    # The centered template sums to zero, so the window mean does not need to be subtracted
+    numerator = np.fft.irfft2(spectrum, s=image.shape)[template_height - 1:, template_width - 1:]
+
+    flat = window_var < (min_std ** 2) * count
+    scores = numerator / (np.sqrt(np.where(flat, 1, window_var)) * template_norm)
+    scores[flat] = 0
+    return np.clip(scores, -1, 1)
+
+
+class ImageElement:
+    """
+    Element found by an ImageLocator, with the exists/click interface of XPath selectors.
+
+    Falls back to the locator's XPath while no template is captured for the screen
+    resolution or the template is not found on screen.
+    """
+
+    def __init__(self, matcher, locator):
+        """
+        Initialize ImageElement.
+
+        Args:
+            matcher: ImageMatcher of the device
+            locator: ImageLocator of the element
+        """
+        self.matcher = matcher
+        self.locator = locator
+        # Match of the last exists check, reused by click() so the screen is only captured once
+        self._match = None
+
+    @property
+    def exists(self):
+        """bool: True if the template or the fallback XPath is found"""
+        self._match = self.matcher.locate(self.locator)
+        return self._match is not None or self.matcher.device.xpath(self.locator.fallback).exists
+
+    def click(self):
+        """
+        Tap the center of the matched template, or the fallback XPath element.
+
+        Raises:
+            XPathElementNotFoundError: If neither the template nor the fallback is found
+        """
+        match, self._match = self._match or self.matcher.locate(self.locator), None
+        if match is None:
+            self.matcher.device.xpath(self.locator.fallback).click()
+            return
+        x, y, _ = match
+        self.matcher.device.click(x, y)
+
+
+class ImageMatcher:
+    """
+    Finds ImageLocator templates on screen with normalized cross-correlation.
+
+    The search region of the screenshot and the template are both shrunk by
+    IMAGE_LOCATOR['downsample'] before matching. Templates are loaded once per
+    screen resolution; a template captured at another resolution is scaled to
+    the device's width.
+    """
+
+    # Prepared templates per (name, width, height), shared by all matchers
+    _templates = {}
+
+    def __init__(self, device):
+        """
+        Initialize ImageMatcher with a device instance.
+
+        Args:
+            device: UIAutomator2 device instance
+        """
+        self.device = device
+        self.width, self.height = get_device_profile(device).size
+        self.factor = IMAGE_LOCATOR['downsample']
+        self.sampler = FrameSampler(device, step=1)
+
+    def element(self, locator):
+        """
+        Get an element for an ImageLocator.
+
+        Args:
+            locator: ImageLocator from locators.py
+
+        Returns:
+            ImageElement: Element with exists and click()
+        """
+        return ImageElement(self, locator)
+
+    def load_template(self, name):
+        """
+        Load a template prepared for this screen resolution.
+
+        Args:
+            name: Template name
+
+        Returns:
+            numpy.ndarray: Downsampled 2D float32 template, or None if it was never captured
+        """
+        key = (name, self.width, self.height)
+        if key not in self._templates:
+            self._templates[key] = self._prepare_template(name)
+        return self._templates[key]
+
+    def _prepare_template(self, name):
+        """Read a template file and scale it to this screen resolution."""
+        import numpy as np
+        from PIL import Image
+
+        path = template_path(name, self.width, self.height)
+        scale = 1.0
+        if not os.path.exists(path):
+            candidates = sorted(glob.glob(os.path.join(TEMPLATE_DIR, f"{glob.escape(name)}@*.png")))
+            if not candidates:
+                return None
+            path = candidates[0]
+            scale = self.width / int(TEMPLATE_NAME.match(os.path.basename(path)).group('width'))
+
+        image = Image.open(path).convert('L')
+        if scale != 1.0:
+            image = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+                                 Image.BILINEAR)
+        return downsample(np.asarray(image), self.factor)
+
+    def locate(self, locator):
+        """
+        Find a template in its search region.
+
+        Args:
+            locator: ImageLocator from locators.py
+
+        Returns:
+            tuple: (x, y, score) of the template's center in screen pixels, or None if it is not found
+        """
+        import numpy as np
+
+        template = self.load_template(locator.template)
+        if template is None:
+            return None
+        region = downsample(self.sampler.grab(locator.region), self.factor)
+        if region.shape[0] < template.shape[0] or region.shape[1] < template.shape[1]:
+            return None
+
+        scores = normalized_cross_correlation(region, template)
+        row, col = np.unravel_index(np.argmax(scores), scores.shape)
+        score = float(scores[row, col])
+        if score < IMAGE_LOCATOR['min_score']:
+            return None
+
+        left, top = locator.region[0] * self.width, locator.region[1] * self.height
+        x = left + (col + template.shape[1] / 2) * self.factor
+        y = top + (row + template.shape[0] / 2) * self.factor
+        return int(x), int(y), round(score, 3)
@@ -0,0 +1,177 @@
+"""
+Utility functions for benchmarking the app start time
+"""
+import re
+import time
+from contextlib import nullcontext
+from time import sleep
+
+from config import LAUNCH_BENCHMARK
+from locators import AppStart
+from test_reporter import get_active_reporter
+from utils_adb import get_app_pid, run_adb_command
+from utils_app_watchdog import get_active_watchdog
+from utils_perf import PerfHistory, compare_to_previous, summarize
+
+
+class LaunchBenchmark:
+    """
+    Measures cold, warm and hot start of the app.
+
+    Each launch goes through `am start -W`, which reports the time to the first
+    frame (TotalTime) and the time until the launch returned (WaitTime). The time
+    until the first meaningful screen (Get Started or Search) is shown is measured
+    on the host and covers the app's own startup work after the first frame.
+    """
+
+    MODES = ("cold", "warm", "hot")
+    METRICS = ("total_time", "wait_time", "first_screen_time")
+    MAIN_ACTIVITY = ".MainActivity"
+    SETTLE_WAIT = 2
+    BACK_PRESSES = 5
+    HISTORY_NAME = "app_start"
+    SHEET_NAME = "App Start"
+
+    def __init__(self, device, app_package='com.eatvermont'):
+        """
+        Initialize LaunchBenchmark with a device instance.
+
+        Args:
+            device: UIAutomator2 device instance
+            app_package: Package name of the app to start
+        """
+        self.device = device
+        self.device_id = device.serial
+        self.app_package = app_package
+        self.marker_timeout = LAUNCH_BENCHMARK['marker_timeout']
+
+    def run(self, repeat, modes=None):
+        """
+        Start the app repeatedly in every start mode.
+
+        Args:
+            repeat: Number of launches per mode
+            modes: Start modes to measure (default: LAUNCH_BENCHMARK['modes'])
+
+        Returns:
+            dict: List of launch samples per mode
+        """
+        modes = modes or LAUNCH_BENCHMARK['modes']
+        results = {mode: [] for mode in modes}
+        # The benchmark stops the app on purpose
+        watchdog = get_active_watchdog()
+        with watchdog.expected_restart() if watchdog else nullcontext():
+            for mode in modes:
+                for i in range(repeat):
+                    sample = self.launch_once(mode)
+                    print(f"{mode} start {i + 1}/{repeat}: {sample}")
+                    results[mode].append(sample)
+        return results
+
+    def launch_once(self, mode):
+        """
+        Bring the app into the state of a start mode, then start it once.
+
+        Args:
+            mode: 'cold' (no process), 'warm' (process alive, activity destroyed) or 'hot' (app in background)
+
+        Returns:
+            dict: total_time, wait_time and first_screen_time in milliseconds, and the launch state reported by Android
+
+        Raises:
+            AssertionError: If the app does not show its first screen within the marker timeout
+        """
+        assert mode in self.MODES, f"Unknown start mode: {mode}"
+        self._prepare_mode(mode)
+        sleep(self.SETTLE_WAIT)
+
+        start = time.perf_counter()
+        output = run_adb_command(f"-s {self.device_id} shell am start -W -n {self.app_package}/{self.MAIN_ACTIVITY}")
+        shown = self.device.xpath(AppStart.FIRST_SCREEN).wait(timeout=self.marker_timeout)
+        first_screen_time = (time.perf_counter() - start) * 1000
+        assert shown, f"First screen not shown {self.marker_timeout} seconds after {mode} start"
+
+        sample = self.parse_am_start(output or "")
+        sample['first_screen_time'] = round(first_screen_time)
+        return sample
+
+    @staticmethod
+    def parse_am_start(output):
+        """
+        Parse the output of `am start -W`.
+
+        Args:
+            output: Output of the command
+
+        Returns:
+            dict: total_time and wait_time in milliseconds (None if not reported) and launch_state
+        """
+        def field(name):
+            match = re.search(rf"^{name}:\s*(\S+)", output, re.MULTILINE)
+            return match.group(1) if match else None
+
+        total_time = field("TotalTime")
+        wait_time = field("WaitTime")
+        return {
+            'total_time': int(total_time) if total_time else None,
+            'wait_time': int(wait_time) if wait_time else None,
+            'launch_state': field("LaunchState"),
+        }
+
+    def _prepare_mode(self, mode):
+        """Stop, background or finish the app according to the start mode."""
+        if mode == "cold":
+            run_adb_command(f"-s {self.device_id} shell am force-stop {self.app_package}")
+        elif mode == "hot":
+            self.device.press("home")
+        else:
+            # Back out of the app so its activity is destroyed while the process stays alive
+            for _ in range(self.BACK_PRESSES):
+                if self.device.app_current().get('package') != self.app_package:
+                    break
+                self.device.press("back")
+                sleep(0.5)
+            self.device.press("home")
+            assert get_app_pid(self.device_id, self.app_package), "App process did not survive for a warm start"
+
+    def report(self, results, tolerance=None):
+        """
+        Summarize the samples, add them to the Excel report and the start time history,
+        and compare them with the previous run on the same device.
+
+        Args:
+            results: Samples per mode as returned by run()
+            tolerance: Allowed relative increase of a median (default: LAUNCH_BENCHMARK['regression_tolerance'])
+
+        Returns:
+            list: Descriptions of the medians that regressed beyond the tolerance
+        """
+        tolerance = LAUNCH_BENCHMARK['regression_tolerance'] if tolerance is None else tolerance
+        history = PerfHistory(self.HISTORY_NAME)
+        previous = history.last(device=self.device_id)
+        reporter = get_active_reporter()
+
+        summary = {}
+        regressions = []
+        for mode, samples in results.items():
+            summary[mode] = {}
+            for metric in self.METRICS:
+                stats = summarize([sample[metric] for sample in samples])
+                summary[mode][metric] = stats
+                previous_median = ((previous or {}).get('summary', {}).get(mode, {}).get(metric) or {}).get('median')
+                change, regressed = compare_to_previous(stats['median'], previous_median, tolerance)
+                if regressed:
+                    regressions.append(f"{mode} {metric}: median {stats['median']} ms, "
+                                       f"previously {previous_median} ms (+{change}%)")
+                if reporter is not None:
+                    reporter.add_metric(self.SHEET_NAME, {
+                        'mode': mode,
+                        'metric': metric,
+                        **stats,
+                        'previous_median': previous_median,
+                        'change_pct': change,
+                        'regressed': regressed,
+                    })
+
+        history.append({'device': self.device_id, 'summary': summary})
+        return regressions
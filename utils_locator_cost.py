@@ -0,0 +1,504 @@
+"""
+Utility functions for estimating and measuring the cost of the XPath locators in locators.py
+"""
+import glob
+import inspect
+import math
+import os
+import re
+import statistics
+import string
+import time
+
+from lxml import etree
+from uiautomator2.xpath import PageSource
+
+import locators
+from config import LOCATOR_COST
+
+FUNCTION_CALL = re.compile(r'\b(contains|starts-with|translate|normalize-space|string-length|substring|not|count)\(')
+NESTED_PATH = re.compile(r'(?<![\w@.-])(\.\.?//|\.\./|(?:ancestor|ancestor-or-self|descendant|descendant-or-self|'
+                         r'following|following-sibling|preceding|preceding-sibling|child|parent|self)::)')
+ANCESTOR_WITH_DESCENDANT = re.compile(r'^//(?P<target>[\w.*-]+)\[ancestor::(?P<ancestor>[\w.*-]+)'
+                                      r'\[(?:descendant::|\.//)(?P<descendant>.+)\]\]$')
+PLACEHOLDER = "placeholder"
+
+
+def iter_locators(module=locators):
+    """
+    Collect every XPath locator of the locator classes.
+
+    Format string locators get their fields filled with a placeholder, locator
+    methods are called with one, and image locators contribute their fallback XPath.
+
+    Args:
+        module: Module containing the locator classes
+
+    Returns:
+        list: (name, xpath) tuples, e.g. ('Businesses.BUSINESS_ABOUT_TAB', '//*[...]')
+    """
+    found = []
+    for class_name, cls in inspect.getmembers(module, inspect.isclass):
+        if cls.__module__ != module.__name__ or issubclass(cls, locators.ImageLocator):
+            continue
+        for attribute, value in vars(cls).items():
+            name = f"{class_name}.{attribute}"
+            if isinstance(value, staticmethod):
+                found.append((name + "()", value.__func__(PLACEHOLDER)))
+            elif isinstance(value, locators.ImageLocator):
+                found.append((name + ".fallback", value.fallback))
+            elif isinstance(value, str) and not attribute.startswith('_') and value.startswith(('/', '(')):
+                fields = [field for _, field, _, _ in string.Formatter().parse(value) if field is not None]
+                found.append((name, value.format(*[PLACEHOLDER] * len(fields)) if fields else value))
+    return found
+
+
+def split_top_level(expression, separators):
+    """
+    Split an expression at separators that are outside of quotes, brackets and parentheses.
+
+    Args:
+        expression: XPath expression or part of it
+        separators: Separator strings, longest first
+
+    Returns:
+        list: (separator, part) tuples; the separator is '' for a leading part without one
+    """
+    parts = []
+    depth = 0
+    quote = None
+    separator = ''
+    start = 0
+    i = 0
+    while i < len(expression):
+        char = expression[i]
+        if quote:
+            quote = None if char == quote else quote
+        elif char in '"\'':
+            quote = char
+        elif char in '[(':
+            depth += 1
+        elif char in '])':
+            depth -= 1
+        elif depth == 0:
+            match = next((s for s in separators if expression.startswith(s, i)), None)
+            if match is not None:
+                if i > start or separator:
+                    parts.append((separator, expression[start:i]))
+                separator = match
+                i += len(match)
+                start = i
+                continue
+        i += 1
+    parts.append((separator, expression[start:]))
+    return parts
+
+
+def parse_step(separator, step):
+    """
+    Split a location step into axis, node test and predicates.
+
+    Args:
+        separator: '/' or '//' in front of the step ('' for the first step of a relative path)
+        step: Step text, e.g. 'following::android.widget.TextView[@text="Read More"][1]'
+
+    Returns:
+        tuple: (axis, node_test, predicates)
+    """
+    step = step.strip()
+    bracket = step.find('[')
+    head = step if bracket == -1 else step[:bracket]
+    predicates = []
+    depth = 0
+    quote = None
+    for i in range(len(head), len(step)):
+        char = step[i]
+        if quote:
+            quote = None if char == quote else quote
+        elif char in '"\'':
+            quote = char
+        elif char == '[':
+            if depth == 0:
+                start = i + 1
+            depth += 1
+        elif char == ']':
+            depth -= 1
+            if depth == 0:
+                predicates.append(step[start:i])
+
+    if head == '..':
+        axis, node_test = 'parent', 'node()'
+    elif head == '.':
+        axis, node_test = 'self', 'node()'
+    elif head.startswith('@'):
+        axis, node_test = 'attribute', head[1:]
+    elif '::' in head:
+        axis, node_test = head.split('::', 1)
+    else:
+        axis, node_test = 'child', head
+    if separator == '//' and axis == 'child':
+        axis = 'descendant'
+    return axis, node_test, predicates
+
+
+def nested_paths(predicate):
+    """
+    Find the relative location paths inside a predicate, e.g. './/android.widget.TextView[@text="x"]'.
+
+    Args:
+        predicate: Predicate text without brackets
+
+    Returns:
+        list: Path expressions that are evaluated for every candidate node
+    """
+    paths = []
+    position = 0
+    while True:
+        match = NESTED_PATH.search(predicate, position)
+        if match is None:
+            return paths
+        if _inside_quotes(predicate, match.start()):
+            position = match.end()
+            continue
+        # The path runs until the next top-level operator of the predicate
+        end = match.start()
+        depth = 0
+        quote = None
+        while end < len(predicate):
+            char = predicate[end]
+            if quote:
+                quote = None if char == quote else quote
+            elif char in '"\'':
+                quote = char
+            elif char in '[(':
+                depth += 1
+            elif char in '])':
+                if depth == 0:
+                    break
+                depth -= 1
+            elif depth == 0 and (char in ' =,!<>|'):
+                break
+            end += 1
+        paths.append(predicate[match.start():end])
+        position = end
+
+
+def _inside_quotes(text, index):
+    """Check whether a position of an expression lies inside a string literal."""
+    quote = None
+    for char in text[:index]:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in '"\'':
+            quote = char
+    return quote is not None
+
+
+def _axis_visits(axis, nodes, depth, subtree):
+    """Estimate the nodes an axis visits from one context node with the given subtree size."""
+    fanout = LOCATOR_COST['fanout']
+    if axis in ('descendant', 'descendant-or-self'):
+        return subtree
+    if axis in ('following', 'preceding'):
+        return nodes / 2
+    if axis in ('ancestor', 'ancestor-or-self'):
+        return depth
+    if axis in ('child', 'following-sibling', 'preceding-sibling'):
+        return fanout
+    return 1
+
+
+def _predicate_share(predicate):
+    """Estimate the share of candidates a predicate keeps."""
+    if predicate.strip().isdigit():
+        return 0
+    # An equality test on an attribute is written to match a single element
+    if re.search(r'@[\w-]+\s*=\s*["\']', predicate) and ' or ' not in predicate:
+        return 0
+    return LOCATOR_COST['match_share']
+
+
+def path_cost(expression, nodes, depth, context=1.0, subtree=None):
+    """
+    Estimate the nodes visited to evaluate an XPath expression.
+
+    A descendant scan visits the subtree of its context node: the whole tree from
+    the root, about `depth` nodes from an average element, and about nodes / depth
+    per ancestor, so that walking up and scanning down again costs a full scan per
+    candidate.
+
+    Args:
+        expression: XPath expression
+        nodes: Assumed number of nodes in the hierarchy
+        depth: Assumed depth of the hierarchy
+        context: Number of context nodes the expression starts from
+        subtree: Subtree size of the context nodes (default: the whole tree)
+
+    Returns:
+        tuple: (visited nodes, estimated number of matches)
+    """
+    total_cost = 0.0
+    total_matches = 0.0
+    for _, branch in split_top_level(expression.strip(), ('|',)):
+        branch = branch.strip()
+        if branch.startswith('(') and branch.endswith(')'):
+            branch = branch[1:-1]
+        current = context
+        current_subtree = nodes if subtree is None else subtree
+        for separator, step in split_top_level(branch, ('//', '/')):
+            if not step.strip():
+                continue
+            axis, node_test, predicates = parse_step(separator, step)
+            visited = current * _axis_visits(axis, nodes, depth, current_subtree)
+            candidates = visited if node_test in ('*', 'node()') else visited * LOCATOR_COST['typed_share']
+            current_subtree = nodes / depth if axis in ('ancestor', 'ancestor-or-self') else depth
+            total_cost += visited
+            for predicate in predicates:
+                functions = len(FUNCTION_CALL.findall(predicate))
+                inner = sum(path_cost(path, nodes, depth, subtree=current_subtree)[0]
+                            for path in nested_paths(predicate))
+                total_cost += candidates * (1 + functions + inner)
+                share = _predicate_share(predicate)
+                candidates = max(1.0, candidates * share) if share else min(candidates, 1.0)
+            current = max(candidates, 1.0)
+        total_matches += current
+    return total_cost, total_matches
+
+
+def analyze(xpath):
+    """
+    Classify the complexity of an XPath expression and flag costly constructs.
+
+    Args:
+        xpath: XPath expression
+
+    Returns:
+        dict: cost (estimated node visits for LOCATOR_COST['reference_nodes']), complexity
+        ('O(n)', 'O(n^2)', ...), steps (top-level location steps) and flags
+    """
+    nodes, depth = LOCATOR_COST['reference_nodes'], LOCATOR_COST['reference_depth']
+    cost = path_cost(xpath, nodes, depth)[0]
+    # The growth of the cost when the tree doubles gives the degree of the polynomial
+    large = path_cost(xpath, nodes * 100, depth)[0]
+    larger = path_cost(xpath, nodes * 200, depth)[0]
+    degree = max(1, round(math.log2(larger / large)))
+
+    steps = [step for _, step in split_top_level(xpath, ('//', '/')) if step.strip()]
+    flags = []
+    if xpath.startswith('//*'):
+        flags.append('wildcard scan')
+    if len(steps) > LOCATOR_COST['max_steps']:
+        flags.append(f'absolute path ({len(steps)} steps)')
+    if re.search(r'\b(following|preceding)::', xpath):
+        flags.append('following/preceding axis')
+    if re.search(r'ancestor::[^\[]*\[(descendant::|\.//)', xpath):
+        flags.append('ancestor with descendant predicate')
+    elif re.search(r'\[[^\]]*(descendant::|\.//)', xpath):
+        flags.append('descendant predicate')
+    return {
+        'cost': round(cost),
+        'complexity': 'O(n)' if degree == 1 else f'O(n^{degree})',
+        'steps': len(steps),
+        'flags': flags,
+    }
+
+
+def load_dumps(folder=None):
+    """
+    Load recorded hierarchy dumps the way uiautomator2 evaluates XPath on them.
+
+    Args:
+        folder: Directory of .xml dumps (default: LOCATOR_COST['dump_dir'] in this repository)
+
+    Returns:
+        dict: Dump name to lxml root element
+    """
+    folder = folder or os.path.join(os.path.dirname(os.path.abspath(__file__)), LOCATOR_COST['dump_dir'])
+    dumps = {}
+    for path in sorted(glob.glob(os.path.join(folder, '*.xml'))):
+        with open(path, encoding='utf-8') as f:
+            dumps[os.path.splitext(os.path.basename(path))[0]] = PageSource(f.read()).root
+    return dumps
+
+
+def record_dump(device, name, folder=None):
+    """
+    Save the hierarchy of the current screen as a dump for timing locators.
+
+    Args:
+        device: UIAutomator2 device instance
+        name: Dump name, e.g. 'business_details'
+        folder: Directory of the dumps (default: LOCATOR_COST['dump_dir'] in this repository)
+
+    Returns:
+        str: Path of the dump
+    """
+    folder = folder or os.path.join(os.path.dirname(os.path.abspath(__file__)), LOCATOR_COST['dump_dir'])
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{name}.xml")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(device.dump_hierarchy())
+    return path
+
+
+def time_locator(xpath, dumps, repeats=None):
+    """
+    Time an XPath expression against recorded dumps.
+
+    Args:
+        xpath: XPath expression
+        dumps: Dump name to root element, as returned by load_dumps()
+        repeats: Evaluations per dump (default: LOCATOR_COST['repeats'])
+
+    Returns:
+        dict: worst_ms (median time on the slowest dump), worst_dump and matches per dump
+    """
+    repeats = repeats or LOCATOR_COST['repeats']
+    compiled = etree.XPath(xpath)
+    worst_ms, worst_dump, matches = 0.0, None, {}
+    for name, root in dumps.items():
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            result = compiled(root)
+            timings.append(time.perf_counter() - started)
+        matches[name] = len(result)
+        median_ms = statistics.median(timings) * 1000
+        if median_ms > worst_ms:
+            worst_ms, worst_dump = median_ms, name
+    return {'worst_ms': round(worst_ms, 3), 'worst_dump': worst_dump, 'matches': matches}
+
+
+def suggest(xpath, analysis, dumps=None):
+    """
+    Suggest cheaper forms of a costly locator.
+
+    Mechanical rewrites are offered for known constructs; with recorded dumps, a
+    path anchored on the nearest uniquely identifiable ancestor is added as well.
+    A suggestion is verified when it selects the same elements as the locator on
+    every dump where the locator matches. Rewrites that are not equivalent in
+    general (following-sibling::, a named class, an anchored path) are only
+    returned when they are verified.
+
+    Args:
+        xpath: XPath expression
+        analysis: Result of analyze() for the expression
+        dumps: Dump name to root element (optional)
+
+    Returns:
+        list: dicts with xpath, cost, note and verified (True, False, or None without matching dumps)
+    """
+    candidates = []
+    match = ANCESTOR_WITH_DESCENDANT.match(xpath)
+    if match:
+        candidates.append((f"//{match['descendant']}/ancestor::{match['ancestor']}//{match['target']}",
+                           "start from the distinctive descendant and walk up once instead of per candidate",
+                           True))
+    if 'following::' in xpath:
+        candidates.append((xpath.replace('following::', 'following-sibling::'),
+                           "following-sibling:: only looks at the siblings instead of the rest of the document",
+                           False))
+    if dumps and xpath.startswith('//*'):
+        tags = {node.tag for root in dumps.values() for node in _evaluate(xpath, root) or []}
+        if len(tags) == 1:
+            candidates.append((f"//{tags.pop()}{xpath[3:]}", "name the class instead of *", False))
+    if dumps and (analysis['steps'] > LOCATOR_COST['max_steps'] or analysis['cost'] > LOCATOR_COST['max_cost']):
+        for root in dumps.values():
+            found = _evaluate(xpath, root)
+            if found and len(found) == 1:
+                anchored = anchored_path(found[0], root)
+                if anchored:
+                    candidates.append((anchored, "anchored on the nearest uniquely identifiable element",
+                                       False))
+                break
+
+    suggestions = []
+    for candidate, note, equivalent in candidates:
+        cost = analyze(candidate)['cost']
+        if cost >= analysis['cost'] and 'absolute path' not in ' '.join(analysis['flags']):
+            continue
+        verified = None
+        for root in (dumps or {}).values():
+            expected = _evaluate(xpath, root)
+            if not expected:
+                continue
+            same = _evaluate(candidate, root) == expected
+            verified = same if verified is None else verified and same
+        if not equivalent and verified is not True:
+            continue
+        suggestions.append({'xpath': candidate, 'cost': cost, 'note': note, 'verified': verified})
+    return suggestions
+
+
+def _evaluate(xpath, root):
+    """Evaluate an expression on a dump, returning None if lxml rejects it."""
+    try:
+        return root.xpath(xpath)
+    except etree.XPathError:
+        return None
+
+
+def anchored_path(node, root):
+    """
+    Build a short path to an element from its nearest ancestor (or itself) with a unique attribute.
+
+    Args:
+        node: Element of a dump
+        root: Root element of the dump
+
+    Returns:
+        str: XPath expression, or None if no ancestor within LOCATOR_COST['max_steps'] levels is unique
+    """
+    steps = []
+    current = node
+    for _ in range(LOCATOR_COST['max_steps']):
+        for attribute in ('resource-id', 'content-desc', 'text'):
+            value = current.get(attribute)
+            if value and '"' not in value:
+                anchor = f'//{current.tag}[@{attribute}="{value}"]'
+                if len(root.xpath(anchor)) == 1:
+                    return anchor + ''.join(reversed(steps))
+        parent = current.getparent()
+        if parent is None:
+            return None
+        siblings = [child for child in parent if child.tag == current.tag]
+        steps.append(f"/{current.tag}[{siblings.index(current) + 1}]")
+        current = parent
+    return None
+
+
+def rank_locators(dumps=None):
+    """
+    Analyze every locator and rank them by cost.
+
+    Args:
+        dumps: Dump name to root element; when given, locators are timed and ranked by the measured time
+
+    Returns:
+        list: dicts with name, xpath, the analyze() fields, timing fields when dumps are given, and suggestions
+    """
+    rows = []
+    for name, xpath in iter_locators():
+        row = {'name': name, 'xpath': xpath, **analyze(xpath)}
+        if dumps:
+            row.update(time_locator(xpath, dumps))
+        row['suggestions'] = suggest(xpath, row, dumps) if row['flags'] else []
+        rows.append(row)
+    key = (lambda row: row['worst_ms']) if dumps else (lambda row: row['cost'])
+    return sorted(rows, key=key, reverse=True)
+
+
+def over_budget(rows):
+    """
+    Find locators over the cost budget that are not listed as known costly locators.
+
+    Args:
+        rows: Result of rank_locators()
+
+    Returns:
+        list: Rows over LOCATOR_COST['max_cost'] or, when timed, LOCATOR_COST['max_ms']
+    """
+    known = set(LOCATOR_COST['known_costly'])
+    return [row for row in rows
+            if row['name'] not in known
+            and (row['cost'] > LOCATOR_COST['max_cost'] or row.get('worst_ms', 0) > LOCATOR_COST['max_ms'])]
@@ -0,0 +1,230 @@
+"""
+Utility functions for streaming device logs
+"""
+import gzip
+import os
+import re
+import subprocess
+import threading
+from collections import deque, namedtuple
+from datetime import datetime
+
+from utils_adb import get_adb_path, get_app_pid
+
+LogcatLine = namedtuple('LogcatLine', ['timestamp', 'pid', 'tid', 'level', 'tag', 'message', 'raw'])
+
+# threadtime format: "10-19 12:34:56.789  1234  1250 E AndroidRuntime: FATAL EXCEPTION: main"
+THREADTIME_PATTERN = re.compile(
+    r'^(?P<timestamp>\d\d-\d\d \d\d:\d\d:\d\d\.\d+)\s+(?P<pid>\d+)\s+(?P<tid>\d+)\s+'
+    r'(?P<level>[VDIWEFA])\s+(?P<tag>.*?)\s*: (?P<message>.*)$')
+
+
+def parse_logcat_line(raw):
+    """
+    Parse a line of `adb logcat -v threadtime` output.
+
+    Args:
+        raw: Line as printed by logcat
+
+    Returns:
+        LogcatLine: Parsed line, or None for lines that are not log entries (e.g. buffer headers)
+    """
+    raw = raw.rstrip('\r\n')
+    match = THREADTIME_PATTERN.match(raw)
+    if not match:
+        return None
+    return LogcatLine(match.group('timestamp'), int(match.group('pid')), int(match.group('tid')),
+                      match.group('level'), match.group('tag'), match.group('message'), raw)
+
+
+class LogcatStream:
+    """
+    Streams `adb logcat` from a single process in a background thread.
+
+    Every parsed line is handed to the registered listeners, so the crash watchdog
+    and the per-test log capture share one logcat connection.
+    """
+
+    BUFFERS = ("main", "system", "crash")
+    STOP_TIMEOUT = 5
+
+    def __init__(self, device_id, buffers=None):
+        """
+        Initialize LogcatStream for a device.
+
+        Args:
+            device_id: ADB serial of the device
+            buffers: Logcat buffers to read (default: main, system and crash)
+        """
+        self.device_id = device_id
+        self.buffers = buffers or self.BUFFERS
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._process = None
+        self._thread = None
+
+    def add_listener(self, listener):
+        """
+        Register a callable receiving every LogcatLine.
+
+        Args:
+            listener: Callable taking a LogcatLine
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Unregister a listener added with add_listener()."""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def start(self):
+        """Start streaming new log lines (older lines in the device buffer are skipped)."""
+        if self._thread is not None:
+            return
+        command = [get_adb_path(), "-s", self.device_id, "logcat", "-v", "threadtime",
+                   "-T", "1", "-b", ",".join(self.buffers)]
+        self._process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                         text=True, encoding="utf-8", errors="replace", bufsize=1)
+        self._thread = threading.Thread(target=self._read_lines, name="logcat-stream", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the logcat process and the reader thread."""
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(self.STOP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        if self._thread is not None:
+            self._thread.join(self.STOP_TIMEOUT)
+        self._process = None
+        self._thread = None
+
+    def _read_lines(self):
+        """Thread target dispatching each parsed line to the listeners."""
+        for raw in self._process.stdout:
+            line = parse_logcat_line(raw)
+            if line is None:
+                continue
+            with self._lock:
+                listeners = list(self._listeners)
+            for listener in listeners:
+                try:
+                    listener(line)
+                except Exception as e:
+                    print(f"Logcat listener error: {e}")
+
+
+class LogcatCapture:
+    """
+    Keeps the logcat lines of the running test in a bounded ring buffer.
+
+    Only lines of the app's processes (and lines of the watched system tags that
+    mention the app) are kept, and only the most recent BUFFER_LINES of them, so a
+    long run never holds more than one buffer in memory. The buffer is written to
+    the run folder as gzip-compressed text only when flush() is called, i.e. for
+    failed tests or when every test is captured.
+    """
+
+    MODES = ("failed", "always", "off")
+    BUFFER_LINES = 5000
+    SYSTEM_TAGS = ("AndroidRuntime", "ActivityManager", "ActivityTaskManager", "libc", "DEBUG")
+
+    def __init__(self, logcat_stream, app_package, mode="failed", buffer_lines=None, tags=()):
+        """
+        Initialize LogcatCapture on a running LogcatStream.
+
+        Args:
+            logcat_stream: Running LogcatStream of the device
+            app_package: Package name of the app whose lines are kept
+            mode: 'failed' to flush failed tests only, 'always' to flush every test, 'off' to disable
+            buffer_lines: Maximum number of lines kept per test (default: BUFFER_LINES)
+            tags: Extra tags whose lines are kept whatever their pid
+        """
+        assert mode in self.MODES, f"Unknown logcat capture mode: {mode}"
+        self.logcat_stream = logcat_stream
+        self.app_package = app_package
+        self.mode = mode
+        self.buffer_lines = buffer_lines or self.BUFFER_LINES
+        self.tags = set(tags)
+        self.test = None
+        self.pids = set()
+        self.dropped = 0
+        self._buffer = deque(maxlen=self.buffer_lines)
+        self._start_proc = re.compile(rf"Start proc (\d+):{re.escape(app_package)}[/:]")
+
+    def start(self, test, pid=None):
+        """
+        Start capturing the lines of a test into a fresh buffer.
+
+        Args:
+            test: Node id of the test
+            pid: Pid of the running app, looked up on the device if not given
+                 (later app processes are picked up from logcat)
+        """
+        self.stop()
+        self.test = test
+        if not pid:
+            # The app was started before this test's capture, so no "Start proc" line will name it
+            pid = get_app_pid(self.logcat_stream.device_id, self.app_package)
+        self.pids = {pid} if pid else set()
+        self.dropped = 0
+        self._buffer = deque(maxlen=self.buffer_lines)
+        self.logcat_stream.add_listener(self._on_logcat_line)
+
+    def stop(self):
+        """Stop capturing; the buffer is kept until the next start()."""
+        self.logcat_stream.remove_listener(self._on_logcat_line)
+
+    def should_flush(self, failed):
+        """
+        Check whether the buffer of a test should be written.
+
+        Args:
+            failed: True if the test failed
+
+        Returns:
+            bool: True if the buffer should be flushed in the current mode
+        """
+        return self.mode == "always" or (self.mode == "failed" and failed)
+
+    def flush(self, artifacts):
+        """
+        Write the buffer as gzip-compressed text into the run's logs folder.
+
+        Args:
+            artifacts: ArtifactStore of the run
+
+        Returns:
+            str: Path of the written log, relative to the run folder
+        """
+        # Stop appending before reading the buffer from this thread
+        self.stop()
+        lines = list(self._buffer)
+        if self.dropped:
+            lines.insert(0, f"--- {self.dropped} earlier lines dropped (buffer size {self.buffer_lines}) ---")
+        data = gzip.compress(("\n".join(lines) + "\n").encode("utf-8"))
+        test_name = self.test.split("::")[-1] if self.test else "session"
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        path = artifacts.save_bytes(f"logcat_{test_name}_{timestamp}.log.gz", data, "logs", test=self.test,
+                                    lines=len(self._buffer), dropped=self.dropped)
+        return os.path.relpath(path, artifacts.run_folder)
+
+    def _on_logcat_line(self, line):
+        """Logcat listener keeping the lines of the app."""
+        if line.pid in self.pids:
+            keep = True
+        elif line.tag in self.SYSTEM_TAGS or line.tag in self.tags:
+            match = self._start_proc.search(line.message)
+            if match:
+                self.pids.add(int(match.group(1)))
+            keep = line.tag in self.tags or self.app_package in line.message
+        else:
+            keep = False
+        if keep:
+            if len(self._buffer) == self.buffer_lines:
+                self.dropped += 1
+            self._buffer.append(line.raw)
@@ -0,0 +1,245 @@
+"""
+Utility functions for sampling the app's memory usage
+"""
+import functools
+import inspect
+import re
+import threading
+import time
+from array import array
+
+from test_reporter import get_active_reporter
+
+# Sampler of the running pytest session, set by conftest
+_active_sampler = None
+
+
+def set_active_sampler(sampler):
+    """Register the memory sampler of the running pytest session."""
+    global _active_sampler
+    _active_sampler = sampler
+
+
+def get_active_sampler():
+    """
+    Get the memory sampler of the running pytest session.
+
+    Returns:
+        MemorySampler: The active sampler, or None if memory sampling is disabled
+    """
+    return _active_sampler
+
+
+class MemoryTimeSeries:
+    """
+    Compact time series of memory samples.
+
+    Every field is kept in its own typed array (kilobytes as 32-bit integers),
+    so long soak runs only cost a few bytes per sample.
+    """
+
+    FIELDS = ("total_pss", "java_heap", "native_heap", "graphics")
+
+    def __init__(self):
+        """Initialize an empty time series."""
+        self.times = array('d')
+        self.labels = []
+        self.values = {field: array('i') for field in self.FIELDS}
+
+    def __len__(self):
+        return len(self.times)
+
+    def append(self, label, sample):
+        """
+        Add a sample.
+
+        Args:
+            label: Point at which the sample was taken (e.g. 'test_start', 'NavEvents.add_favorite_event')
+            sample: Values in kilobytes per field (missing fields are stored as -1)
+        """
+        self.times.append(time.time())
+        self.labels.append(label)
+        for field in self.FIELDS:
+            value = sample.get(field)
+            self.values[field].append(-1 if value is None else value)
+
+    def rows(self, start=0):
+        """
+        Get samples as report rows.
+
+        Args:
+            start: Index of the first sample
+
+        Returns:
+            list: One dict per sample with time, point and the value of each field in kilobytes
+        """
+        rows = []
+        for index in range(start, len(self.times)):
+            row = {'time': time.strftime('%H:%M:%S', time.localtime(self.times[index])),
+                   'point': self.labels[index]}
+            for field in self.FIELDS:
+                value = self.values[field][index]
+                row[f"{field}_kb"] = value if value >= 0 else None
+            rows.append(row)
+        return rows
+
+
+def analyze_trend(values, min_growth_kb=10240, monotonic_ratio=0.8):
+    """
+    Check a series of memory values for steady growth, e.g. one value per soak loop iteration.
+
+    Args:
+        values: Values in kilobytes, in sampling order
+        min_growth_kb: Total growth from first to last value needed to flag a leak
+        monotonic_ratio: Share of steps that must not decrease to call the growth monotonic
+
+    Returns:
+        dict: growth_kb, slope_kb_per_sample, non_decreasing_ratio and leak_suspected
+    """
+    values = [value for value in values if value is not None and value >= 0]
+    if len(values) < 3:
+        return {'growth_kb': None, 'slope_kb_per_sample': None, 'non_decreasing_ratio': None,
+                'leak_suspected': False}
+
+    count = len(values)
+    mean_x = (count - 1) / 2
+    mean_y = sum(values) / count
+    # Least squares slope of value over sample index
+    slope = (sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+             / sum((x - mean_x) ** 2 for x in range(count)))
+    steps = [later - earlier for earlier, later in zip(values, values[1:])]
+    non_decreasing = sum(1 for step in steps if step >= 0) / len(steps)
+    growth = values[-1] - values[0]
+
+    return {
+        'growth_kb': growth,
+        'slope_kb_per_sample': round(slope, 1),
+        'non_decreasing_ratio': round(non_decreasing, 2),
+        'leak_suspected': growth >= min_growth_kb and slope > 0 and non_decreasing >= monotonic_ratio,
+    }
+
+
+class MemorySampler:
+    """
+    Samples `dumpsys meminfo <package>` of the app at configurable points.
+
+    Points: 'test' samples at test start and end, 'nav' additionally samples after
+    every call of a navigation helper decorated with sample_memory_after_calls.
+    """
+
+    POINTS = ("test", "nav")
+    SHEET_NAME = "Memory"
+    SUMMARY_FIELDS = {
+        'total_pss': re.compile(r"TOTAL(?: PSS)?:\s+(\d+)"),
+        'java_heap': re.compile(r"Java Heap:\s+(\d+)"),
+        'native_heap': re.compile(r"Native Heap:\s+(\d+)"),
+        'graphics': re.compile(r"Graphics:\s+(\d+)"),
+    }
+
+    def __init__(self, device, app_package='com.eatvermont', points=("test",)):
+        """
+        Initialize MemorySampler with a device instance.
+
+        Args:
+            device: UIAutomator2 device instance
+            app_package: Package name of the app to sample
+            points: Sampling points, any of POINTS
+        """
+        self.device = device
+        self.app_package = app_package
+        self.points = set(points)
+        self.series = MemoryTimeSeries()
+        self._test_start_index = 0
+
+    def sample(self, label):
+        """
+        Take one sample of the app's memory.
+
+        Args:
+            label: Point at which the sample is taken
+
+        Returns:
+            dict: Sampled values in kilobytes (empty if the app is not running)
+        """
+        output = self.device.shell(["dumpsys", "meminfo", self.app_package]).output
+        sample = self.parse_meminfo(output)
+        if sample:
+            self.series.append(label, sample)
+        return sample
+
+    def parse_meminfo(self, output):
+        """
+        Parse the App Summary section of `dumpsys meminfo <package>`.
+
+        Args:
+            output: Output of the command
+
+        Returns:
+            dict: total_pss, java_heap, native_heap and graphics in kilobytes (fields not found are omitted)
+        """
+        summary_start = output.find("App Summary")
+        summary = output[summary_start:] if summary_start >= 0 else output
+        sample = {}
+        for field, pattern in self.SUMMARY_FIELDS.items():
+            match = pattern.search(summary)
+            if match:
+                sample[field] = int(match.group(1))
+        return sample
+
+    def start_test(self):
+        """Sample at the start of a test."""
+        self._test_start_index = len(self.series)
+        self.sample("test_start")
+
+    def end_test(self, test):
+        """
+        Sample at the end of a test and add the test's samples to the Memory sheet of the report.
+
+        Args:
+            test: Node id of the test
+        """
+        self.sample("test_end")
+        reporter = get_active_reporter()
+        if reporter is None:
+            return
+        for row in self.series.rows(self._test_start_index):
+            reporter.add_metric(self.SHEET_NAME, {'test': test, **row})
+
+    def after_nav_call(self, label):
+        """Sample after a navigation helper call when 'nav' points are enabled."""
+        if "nav" in self.points:
+            self.sample(label)
+
+
+_nav_call_depth = threading.local()
+
+
+def sample_memory_after_calls(cls):
+    """
+    Class decorator sampling the app's memory after every public method call.
+
+    Only the outermost call is sampled when helpers call each other, and nothing
+    is done unless a sampler with 'nav' points is active.
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(method):
+            continue
+        setattr(cls, name, _sampled(method, f"{cls.__name__}.{name}"))
+    return cls
+
+
+def _sampled(method, label):
+    """Wrap a method so the active sampler samples after its outermost call."""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        depth = getattr(_nav_call_depth, 'value', 0)
+        _nav_call_depth.value = depth + 1
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            _nav_call_depth.value = depth
+        sampler = _active_sampler
+        if depth == 0 and sampler is not None:
+            sampler.after_nav_call(label)
+        return result
+    return wrapper
@@ -0,0 +1,163 @@
+"""
+Utility functions for performance measurements and their history across runs
+"""
+import json
+import os
+import statistics
+from datetime import datetime
+
+
+def percentile(values, pct):
+    """
+    Get a percentile of a list of values, interpolating between the closest ranks.
+
+    Args:
+        values: Measured values
+        pct: Percentile between 0 and 100
+
+    Returns:
+        float: The percentile, or None for an empty list
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(values):
+    """
+    Summarize measured values.
+
+    Args:
+        values: Measured values (None entries are ignored)
+
+    Returns:
+        dict: count, min, median, p95 and max of the values (None if there are no values)
+    """
+    values = [value for value in values if value is not None]
+    if not values:
+        return {'count': 0, 'min': None, 'median': None, 'p95': None, 'max': None}
+    return {
+        'count': len(values),
+        'min': min(values),
+        'median': statistics.median(values),
+        'p95': percentile(values, 95),
+        'max': max(values),
+    }
+
+
+class PerfHistory:
+    """
+    Append-only history of a performance measurement across test runs.
+
+    Every run adds one JSON line to perf_results/<name>.jsonl. The folder is kept
+    outside reports/, so the artifact janitor never prunes it.
+    """
+
+    HISTORY_DIR = "perf_results"
+
+    def __init__(self, name, root_dir=None):
+        """
+        Initialize PerfHistory for a measurement.
+
+        Args:
+            name: Name of the measurement, used as file name
+            root_dir: Directory containing perf_results (default: this repository)
+        """
+        root_dir = root_dir or os.path.dirname(os.path.abspath(__file__))
+        self.folder = os.path.join(root_dir, self.HISTORY_DIR)
+        self.path = os.path.join(self.folder, f"{name}.jsonl")
+
+    def records(self):
+        """
+        Read every recorded run.
+
+        Returns:
+            list: Records in the order they were written
+        """
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def last(self, **match):
+        """
+        Get the most recent record whose fields match the given values.
+
+        Args:
+            **match: Field values the record must have (e.g. device='R58M...')
+
+        Returns:
+            dict: The record, or None if there is none
+        """
+        for record in reversed(self.records()):
+            if all(record.get(key) == value for key, value in match.items()):
+                return record
+        return None
+
+    def append(self, record):
+        """
+        Add a record for the current run.
+
+        Args:
+            record: JSON-serializable dict; a 'timestamp' field is added if missing
+
+        Returns:
+            dict: The stored record
+        """
+        record = dict(record)
+        record.setdefault('timestamp', datetime.now().isoformat(timespec='seconds'))
+        os.makedirs(self.folder, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + "\n")
+        return record
+
+
+def compare_to_previous(current, previous, tolerance):
+    """
+    Compare a measured value with the one of the previous run.
+
+    Args:
+        current: Value of this run
+        previous: Value of the previous run, or None
+        tolerance: Allowed relative increase (e.g. 0.2 for 20%)
+
+    Returns:
+        tuple: (change in percent or None, True if the increase exceeds the tolerance)
+    """
+    if current is None or not previous:
+        return None, False
+    change = (current - previous) / previous
+    return round(change * 100, 1), change > tolerance
+
+
+def detect_drift(values, window=5, baseline=20, tolerance=0.25):
+    """
+    Check whether the most recent values drifted away from the earlier ones.
+
+    Args:
+        values: Values in chronological order, the current value last
+        window: Number of most recent values whose median is checked
+        baseline: Number of values before the window whose median is the reference
+        tolerance: Allowed relative change of the recent median
+
+    Returns:
+        dict: recent_median, baseline_median, change_pct and drifted (False while there is too little history)
+    """
+    recent = values[-window:]
+    reference = values[-(window + baseline):-window]
+    if len(recent) < window or len(reference) < window:
+        return {'recent_median': None, 'baseline_median': None, 'change_pct': None, 'drifted': False}
+
+    recent_median = statistics.median(recent)
+    baseline_median = statistics.median(reference)
+    change = (recent_median - baseline_median) / baseline_median if baseline_median else 0
+    return {
+        'recent_median': recent_median,
+        'baseline_median': baseline_median,
+        'change_pct': round(change * 100, 1),
+        'drifted': abs(change) > tolerance,
+    }
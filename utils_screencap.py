@@ -0,0 +1,150 @@
+"""
+Utility functions for capturing raw screen frames with `screencap`
+"""
+import os
+import struct
+
+from config import SCREEN_CAPTURE
+from utils_adb import run_adb_binary_command
+
+
+class RawScreencap:
+    """
+    Captures the screen as raw pixels through `adb exec-out screencap`.
+
+    Unlike device.screenshot(), nothing is encoded on the phone: the RGBA bytes are
+    wrapped in a NumPy array without copying, cropped and downsampled on the host
+    as array views, and only encoded to PNG or WebP when a frame is saved.
+    """
+
+    # Pixel formats of the screencap header (android.graphics.PixelFormat)
+    RGBA_8888 = 1
+    RGBX_8888 = 2
+    BGRA_8888 = 5
+    BYTES_PER_PIXEL = 4
+    # Older Android versions write width, height and format; newer ones add the color space
+    HEADER_SIZES = (12, 16)
+
+    def __init__(self, device):
+        """
+        Initialize RawScreencap with a device instance.
+
+        Args:
+            device: UIAutomator2 device instance
+        """
+        self.device = device
+        self.device_id = device.serial
+
+    def capture(self):
+        """
+        Capture one full-resolution frame.
+
+        Returns:
+            numpy.ndarray: Read-only (height, width, 4) uint8 RGBA array, or None if the capture failed
+        """
+        data = run_adb_binary_command(f"-s {self.device_id} exec-out screencap")
+        if not data:
+            return None
+        return self.parse(data)
+
+    def parse(self, data):
+        """
+        Wrap the output of `screencap` (without -p) in an array.
+
+        Args:
+            data: Raw output of the command
+
+        Returns:
+            numpy.ndarray: (height, width, 4) uint8 RGBA array sharing memory with data, or None if data is invalid
+        """
+        # NumPy is only loaded once a frame is captured, not by every importer of save_screenshot
+        import numpy as np
+
+        if len(data) < self.HEADER_SIZES[0]:
+            return None
+        width, height, pixel_format = struct.unpack_from('<3I', data)
+        header_size = len(data) - width * height * self.BYTES_PER_PIXEL
+        if header_size not in self.HEADER_SIZES:
+            print(f"Unexpected screencap size {len(data)} for {width}x{height}")
+            return None
+
+        frame = np.frombuffer(data, dtype=np.uint8, offset=header_size).reshape(height, width, self.BYTES_PER_PIXEL)
+        if pixel_format == self.BGRA_8888:
+            frame = frame[..., [2, 1, 0, 3]]
+        return frame
+
+    def grab(self, region=None, step=1, gray=False):
+        """
+        Capture a frame, cropped and downsampled on the host.
+
+        Args:
+            region: (left, top, right, bottom) as fractions of the screen size (default: whole screen)
+            step: Keep every step-th pixel in both directions
+            gray: Convert to gray values
+
+        Returns:
+            numpy.ndarray: (height, width, 4) RGBA or (height, width) gray uint8 array, or None if the capture failed
+        """
+        frame = self.capture()
+        if frame is None:
+            return None
+        if region is not None:
+            height, width = frame.shape[:2]
+            left, top, right, bottom = region
+            frame = frame[int(top * height):int(bottom * height), int(left * width):int(right * width)]
+        frame = frame[::step, ::step]
+        return self.to_gray(frame) if gray else frame
+
+    @staticmethod
+    def to_gray(frame):
+        """
+        Convert an RGBA frame to gray values with the ITU-R 601 weights PIL uses.
+
+        Args:
+            frame: (height, width, 4) uint8 array
+
+        Returns:
+            numpy.ndarray: (height, width) uint8 array
+        """
+        import numpy as np
+
+        rgb = frame[..., :3].astype(np.uint16)
+        return ((rgb[..., 0] * 77 + rgb[..., 1] * 150 + rgb[..., 2] * 29) >> 8).astype(np.uint8)
+
+    def save(self, path, frame=None):
+        """
+        Encode a frame and write it to a file; the format follows the file extension (.png or .webp).
+
+        Args:
+            path: Path of the image file
+            frame: RGBA frame to save (default: capture a new one)
+
+        Returns:
+            bool: True if the frame was saved, False if the capture failed
+        """
+        # Pillow and NumPy are only needed when a frame is actually persisted
+        import numpy as np
+        from PIL import Image
+
+        frame = self.capture() if frame is None else frame
+        if frame is None:
+            return False
+        image = Image.fromarray(np.ascontiguousarray(frame), 'RGBA').convert('RGB')
+        if os.path.splitext(path)[1].lower() == '.webp':
+            image.save(path, 'WEBP', quality=SCREEN_CAPTURE['webp_quality'])
+        else:
+            image.save(path, 'PNG', compress_level=SCREEN_CAPTURE['png_compress_level'])
+        return True
+
+
+def save_screenshot(device, path):
+    """
+    Save a screenshot with the configured capture backend, falling back to device.screenshot().
+
+    Args:
+        device: UIAutomator2 device instance
+        path: Path of the image file
+    """
+    if SCREEN_CAPTURE['backend'] == 'raw' and RawScreencap(device).save(path):
+        return
+    device.screenshot(path)
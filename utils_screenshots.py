@@ -3,7 +3,11 @@ Utility functions for screenshots management
 """
 from datetime import datetime
 import os
-import pytest
+
+from config import SCREEN_CAPTURE
+from utils_artifacts import get_active_store
+from utils_screencap import save_screenshot
+from utils_visual_regression import get_active_visual
 
 
 class ScreenshotsManagement:
@@ -24,10 +28,9 @@ class ScreenshotsManagement:
         Returns:
             str: Path to the screenshots directory, or None if not found
         """
-        # Get the current test run folder from the reporter
-        from conftest import reporter
-        if reporter and hasattr(reporter, 'screenshots_folder'):
-            return reporter.screenshots_folder
+        store = get_active_store()
+        if store is not None:
+            return store.screenshots_folder
         return None
 
     def take_screenshot(self, name):
@@ -40,35 +43,31 @@ class ScreenshotsManagement:
         Returns:
             str: Path where the screenshot was saved
         """
-        screenshots_dir = self.get_screenshots_dir()
-        if screenshots_dir is None:
-            screenshots_dir = "screenshots"
-            os.makedirs(screenshots_dir, exist_ok=True)
-
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        screenshot_name = f"{name}_{timestamp}.png"
-        screenshot_path = os.path.join(screenshots_dir, screenshot_name)
-        self.device.screenshot(screenshot_path)
+        screenshot_path = self.save_screenshot(f"{name}_{timestamp}.{SCREEN_CAPTURE['persist_format']}")
         print(f"Screenshot saved: {screenshot_path}")
+        visual = get_active_visual()
+        if visual is not None:
+            visual.check(name, screenshot_path)
         return screenshot_path
 
-    def save_screenshot(self, filename: str, request) -> str:
+    def save_screenshot(self, filename: str, request=None) -> str:
         """
         Save a screenshot to the current test run's screenshots folder.
 
         Args:
             filename: The desired filename for the screenshot
-            request: The pytest request fixture
+            request: The pytest request fixture (unused, kept for existing callers)
 
         Returns:
             str: The path where the screenshot was saved
         """
-        # Get the current test run folder from the reporter
-        reporter = request.config.pluginmanager.get_plugin('excel_reporter')
-        if not reporter:
-            # Fallback to saving in the current directory if reporter not found
-            return self.device.screenshot(filename)
+        store = get_active_store()
+        if store is not None:
+            return store.save_screenshot(self.device, filename)
 
-        # Save screenshot in the test run's screenshots folder
-        screenshot_path = os.path.join(reporter.screenshots_folder, filename)
-        return self.device.screenshot(screenshot_path)
\ No newline at end of file
+        # Outside a pytest session there is no run folder, fall back to ./screenshots
+        os.makedirs("screenshots", exist_ok=True)
+        screenshot_path = os.path.join("screenshots", filename)
+        save_screenshot(self.device, screenshot_path)
+        return screenshot_path
@@ -1,11 +1,18 @@
 """
 Utility functions for scrolling.
 """
-import os
+import math
 from time import sleep
 
-from conftest import screenshots_dir
+from uiautomator2.exceptions import UiObjectNotFoundError
+
+from config import LIST_HARVEST, PRECISE_SCROLL
 from locators import EventsScreen, Events, GuestMode
+from utils_device_profile import get_device_profile
+from utils_frame_metrics import FrameMetrics
+from utils_gestures import GestureBatch
+from utils_hierarchy import HierarchySnapshot
+from utils_screenshots import ScreenshotsManagement
 
 
 class ScreenSwipe:
@@ -17,6 +24,7 @@ class ScreenSwipe:
             device: UIAutomator2 device instance
         """
         self.device = device
+        self.profile = get_device_profile(device)
         self.width, self.height = self._get_screen_dimensions()
 
     def _get_screen_dimensions(self):
@@ -26,10 +34,7 @@ class ScreenSwipe:
         Returns:
             tuple: A tuple containing (width, height)
         """
-        screen_info = self.device.info
-        width = screen_info['displayWidth']
-        height = screen_info['displayHeight']
-        return width, height
+        return self.profile.display_size
 
     def calculate_swipe_coordinates(self):
         """
@@ -57,6 +62,9 @@ class ScreenSwipe:
 
 
 class GeneralScrolling(ScreenSwipe):
+    # Measured touch slop per device serial: how much less the content moves than the finger
+    _slop = {}
+
     def __init__(self, device):
         """
         Initialize GeneralScrolling with a device instance.
@@ -75,24 +83,257 @@ class GeneralScrolling(ScreenSwipe):
         """
         return self.height // 4
 
+    def get_text_center_y(self, text):
+        """
+        Get the vertical center of the element showing a text, from one hierarchy dump.
+
+        Args:
+            text: Exact text of the element
+
+        Returns:
+            int: The y-coordinate of the element's center, or None if it is not on screen
+        """
+        nodes = HierarchySnapshot.capture(self.device).find('text', value=text)
+        return nodes[0].center()[1] if nodes else None
+
+    def _touch_slop(self):
+        slop = self._slop.get(self.device.serial)
+        if slop is None:
+            slop = int(PRECISE_SCROLL['touch_slop_dp'] * (self.profile.density or 1))
+        return slop
+
+    def drag_content(self, distance):
+        """
+        Move the content up by a distance in pixels with drags that rest before releasing,
+        so the list does not fling. Negative distances move the content down.
+
+        The finger travels the distance plus the touch slop the list swallows before it
+        starts moving. Distances longer than one drag are split into several drags,
+        sent as one gesture script.
+
+        Args:
+            distance: Pixels the content should move up
+        """
+        if distance == 0:
+            return
+        height = self.profile.display_height
+        slop = self._touch_slop()
+        # Every drag loses the touch slop, so each one covers an equal share plus the slop
+        drags = math.ceil(abs(distance) / (height * PRECISE_SCROLL['max_span'] - slop))
+        span = (abs(distance) / drags + slop) / height
+        start_y = PRECISE_SCROLL['start_y'] if distance > 0 else 1 - PRECISE_SCROLL['start_y']
+        end_y = start_y - span if distance > 0 else start_y + span
+        batch = GestureBatch(self.device)
+        for _ in range(drags):
+            batch.drag(0.5, start_y, 0.5, end_y)
+        batch.wait(PRECISE_SCROLL['settle_s']).run()
+
+    def drag_text_to(self, text, target_y):
+        """
+        Move an element showing a text to a vertical position with momentum-free drags.
+
+        The element's position before and after the drag shows how far the content
+        actually moved; the difference to the requested distance calibrates the touch
+        slop for later drags and is corrected by at most max_corrections more drags.
+
+        Args:
+            text: Exact text of the element
+            target_y: Vertical position in pixels the element's center should end up at
+
+        Returns:
+            int: Final y-coordinate of the element's center, or None if it is not on screen
+        """
+        current_y = self.get_text_center_y(text)
+        for correction in range(PRECISE_SCROLL['max_corrections'] + 1):
+            if current_y is None or abs(current_y - target_y) <= PRECISE_SCROLL['tolerance_px']:
+                break
+            distance = current_y - target_y
+            self.drag_content(distance)
+            previous_y, current_y = current_y, self.get_text_center_y(text)
+            if current_y is None:
+                break
+            moved = previous_y - current_y
+            missing = abs(distance) - abs(moved)
+            # Only a short miss is slop; a long one means the list reached its end
+            if moved * distance > 0 and 0 <= missing <= 3 * self._touch_slop():
+                self._slop[self.device.serial] = self._touch_slop() + missing
+            print(f"Dragged '{text}' by {moved}px of {distance}px, now at y={current_y} (target {target_y})")
+        return current_y
+
+    def position_text_in_first_quarter(self, text):
+        """
+        Move an element showing a text into the first quarter of the screen.
+
+        Args:
+            text: Exact text of the element
+
+        Returns:
+            int: Final y-coordinate of the element's center, or None if it is not on screen
+        """
+        return self.drag_text_to(text, self.get_target_position_in_first_quarter())
+
     def scroll_to_bottom(self, scroll_times=3, duration=0.5):
         """
         Scrolls to the bottom of the results on the screen.
 
+        The swipes run on the device in one scrollToEnd call of the UI Automator server,
+        which waits for each scroll to finish and stops early once the list stops moving.
+        Without a scrollable node the swipes are sent as one gesture script instead.
+
         Args:
             scroll_times: Number of times to scroll to ensure reaching the bottom.
             duration: Duration of each swipe in seconds.
         """
-        screen_size = self.device.window_size()
-        for _ in range(scroll_times):
-            self.device.swipe(
-                screen_size[0] * 0.5,  # start x: middle of screen
-                screen_size[1] * 0.8,  # start y: 80% down
-                screen_size[0] * 0.5,  # end x: middle of screen
-                screen_size[1] * 0.2,  # end y: 20% down
-                duration=duration
-            )
-            sleep(2)
+        with FrameMetrics(self.device).measure("scroll_to_bottom"):
+            try:
+                # UI Automator injects one move event per step, every 5 ms
+                self.device(scrollable=True).scroll.vert.toEnd(max_swipes=scroll_times,
+                                                               steps=max(1, int(duration / 0.005)))
+            except UiObjectNotFoundError:
+                print("No scrollable node found, swiping the screen instead")
+                batch = GestureBatch(self.device)
+                for _ in range(scroll_times):
+                    # From 80% down to 20% down in the middle of the screen
+                    batch.swipe(0.5, 0.8, 0.5, 0.2, duration=duration)
+                batch.run()
+
+
+class ListHarvester:
+    """
+    Generator over the items of a scrollable list, page by page.
+
+    Each page is one hierarchy snapshot. The fully visible items of the list container
+    are yielded once each, keyed by their content-desc (or their texts) plus their
+    position in the content, so equal items at different places stay apart. The
+    content offset follows items seen on both pages, as the same item moves by
+    exactly the scrolled distance. Pages are turned with momentum-free drags, and
+    harvesting ends when a drag leaves the snapshot unchanged (end of the list) or
+    when an item satisfies the caller's predicate.
+
+    Usage:
+        for item in ListHarvester(d).harvest():
+            print(item.texts())
+    """
+
+    def __init__(self, device, container=None, max_pages=None):
+        """
+        Initialize ListHarvester with a device instance.
+
+        Args:
+            device: UIAutomator2 device instance
+            container: Function that gets the list container SnapshotNode from a
+                       HierarchySnapshot (default: the largest scrollable node)
+            max_pages: Maximum number of pages to read (default from config)
+        """
+        self.device = device
+        self.container = container or self.largest_scrollable
+        self.max_pages = max_pages or LIST_HARVEST['max_pages']
+        self.scroller = GeneralScrolling(device)
+        self.pages = 0
+
+    @staticmethod
+    def largest_scrollable(snapshot):
+        """
+        Get the scrollable node with the largest area, the main list of most screens.
+
+        Args:
+            snapshot: HierarchySnapshot of the screen
+
+        Returns:
+            SnapshotNode: The container, or None if nothing on screen scrolls
+        """
+        scrollables = snapshot.find('scrollable', value='true')
+        if not scrollables:
+            return None
+        spatial = snapshot.spatial()
+        return max(scrollables, key=lambda node: spatial.areas[node.index])
+
+    @staticmethod
+    def label(item):
+        """
+        Get the stable part of an item's key.
+
+        Args:
+            item: SnapshotNode of a list item
+
+        Returns:
+            str: The item's content-desc, or its texts joined, '' if it shows neither
+        """
+        return item.content_desc or " | ".join(item.texts())
+
+    def _page(self):
+        snapshot = HierarchySnapshot.capture(self.device)
+        container = self.container(snapshot)
+        if container is None:
+            return None, []
+        items = snapshot.spatial().fully_visible_items(container)
+        return container, [(self.label(item), item) for item in items if self.label(item)]
+
+    @staticmethod
+    def _shift(previous, entries, scrolled):
+        """Measure how far the content moved from items on both pages; the drag length otherwise."""
+        shifts = sorted(previous[label] - item.bounds[1] for label, item in entries if label in previous)
+        return shifts[len(shifts) // 2] if shifts else scrolled
+
+    def harvest(self, until=None):
+        """
+        Yield each item of the list once, scrolling down until the end of the list.
+
+        Args:
+            until: Function that gets an item SnapshotNode and returns True to stop
+                   after that item
+
+        Yields:
+            SnapshotNode: New items in list order, from the snapshot of their page,
+                          so they can be clicked before the generator resumes
+        """
+        tolerance = LIST_HARVEST['position_tolerance_px']
+        seen = set()
+        offset = 0
+        previous = None
+        signature = None
+        scrolled = 0
+        self.pages = 0
+        while self.pages < self.max_pages:
+            container, entries = self._page()
+            if container is None:
+                print("No scrollable list on screen")
+                return
+            self.pages += 1
+            page_signature = [(label, item.bounds) for label, item in entries]
+            if page_signature == signature:
+                print(f"End of list after {self.pages - 1} pages")
+                return
+            if previous is not None:
+                offset += self._shift(previous, entries, scrolled)
+            for label, item in entries:
+                position = (item.bounds[1] + offset) // tolerance
+                if any((label, position + step) in seen for step in (-1, 0, 1)):
+                    continue
+                seen.add((label, position))
+                yield item
+                if until is not None and until(item):
+                    return
+            previous = {label: item.bounds[1] for label, item in entries}
+            signature = page_signature
+            left, top, right, bottom = container.bounds
+            scrolled = int((bottom - top) * LIST_HARVEST['page_share'])
+            self.scroller.drag_content(scrolled)
+
+    def find(self, predicate):
+        """
+        Scroll through the list until an item satisfies a predicate.
+
+        Args:
+            predicate: Function that gets an item SnapshotNode and returns True for the target
+
+        Returns:
+            SnapshotNode: The first matching item, or None if the list ended without one
+        """
+        for item in self.harvest(until=predicate):
+            if predicate(item):
+                return item
+        return None
 
 
 class EventsScrolling(GeneralScrolling):
@@ -105,12 +346,11 @@ class EventsScrolling(GeneralScrolling):
         """
         super().__init__(device)
 
-    def scroll_to_event_and_click(self, screenshots_dir, current_day=None):
+    def scroll_to_event_and_click(self, current_day=None):
         """
         Scroll to the first event in the calendar and click it.
 
         Args:
-            screenshots_dir: Directory to save screenshots
             current_day: Current day for screenshot naming
 
         Returns:
@@ -119,41 +359,49 @@ class EventsScrolling(GeneralScrolling):
         Raises:
             AssertionError: If neither events nor 'No Events' message is found
         """
-        first_event = self.device.xpath(EventsScreen.EVENTS_SCREEN_TILE_1)
-        no_events_message = self.device.xpath(EventsScreen.EVENTS_SCREEN_NO_EVENTS)
-
-        assert first_event.exists or no_events_message.exists, "Neither events nor 'No Events' message found"
-
-        if not first_event.exists and not no_events_message.exists:
-            max_scroll_attempts = 3
-            found_event = False
-
-            for scroll_attempt in range(max_scroll_attempts):
-                self.scroll_to_bottom(scroll_times=1, duration=0.5)
-
-                first_event = self.device.xpath(EventsScreen.EVENTS_SCREEN_TILE_1)
-                if first_event.exists:
-                    found_event = True
-                    if current_day:
-                        screenshot_path = os.path.join(screenshots_dir,
-                                                       f"3_1_3_home_screen_events_{current_day.lower()}_after_scroll.png")
-                        self.device.screenshot(screenshot_path)
-                    break
+        # Checked before scrolling, which could move the message off screen
+        snapshot = HierarchySnapshot.capture(self.device)
+        if snapshot.xpath(EventsScreen.EVENTS_SCREEN_NO_EVENTS):
+            return False
 
-            if not found_event:
-                assert no_events_message.exists, "No events found and 'No Events' message is not displayed"
-                return False
+        # An event on the first page is found by the tile XPath, whatever the list layout;
+        # only then are the list items harvested page by page
+        tiles = snapshot.xpath(EventsScreen.EVENTS_SCREEN_TILE_1)
+        if tiles:
+            title = tiles[0]
+        else:
+            harvester = ListHarvester(self.device, max_pages=4)
+            event = harvester.find(self._event_title)
+            assert event is not None, "Neither events nor 'No Events' message found"
+            if current_day and harvester.pages > 1:
+                ScreenshotsManagement(self.device).save_screenshot(
+                    f"3_1_3_home_screen_events_{current_day.lower()}_after_scroll.png")
+            title = self._event_title(event)
+
+        event_title = title.text
+        title.click()
+        sleep(2)
+
+        event_title_in_details = self.device.xpath(EventsScreen.EVENT_TITLE.format(event_title))
+        assert event_title_in_details.exists, f"Failed to open event details for '{event_title}'"
+        return True
 
-        if first_event.exists:
-            event_title = first_event.get_text()
-            first_event.click()
-            sleep(2)
+    @staticmethod
+    def _event_title(item):
+        """
+        Get the title of an event tile, the third view of its row as in EventsScreen.EVENTS_SCREEN_TILE_1.
 
-            event_title_in_details = self.device.xpath(EventsScreen.EVENT_TITLE.format(event_title))
-            assert event_title_in_details.exists, f"Failed to open event details for '{event_title}'"
-            return True
+        Args:
+            item: SnapshotNode of a list item
 
-        return False
+        Returns:
+            SnapshotNode: The title TextView, or None if the item is not an event tile
+        """
+        for node in [item] + item.descendants('android.widget.TextView'):
+            if (node.class_name == 'android.widget.TextView' and node.text
+                    and node.snapshot.attribute(node.index, 'index') == '2'):
+                return node
+        return None
 
     def scroll_to_events_within_30(self):
         """
@@ -162,30 +410,11 @@ class EventsScrolling(GeneralScrolling):
         Returns:
             bool: True if the text was found and positioned correctly, False otherwise
         """
-        target_y = self.get_target_position_in_first_quarter()
-        start_x, start_y, end_y = self.calculate_swipe_coordinates()
-
         self.device(scrollable=True).scroll.to(text="Events Within ~30min")
         if not self.device(text="Events Within ~30min").exists(timeout=5):
             return False
 
-        events_elem = self.device(text="Events Within ~30min")
-        bounds = events_elem.info['bounds']
-        current_y = (bounds['top'] + bounds['bottom']) // 2
-
-        max_adjustment_attempts = 3
-        for attempt in range(max_adjustment_attempts):
-            if current_y <= target_y:
-                break
-
-            scroll_distance = (current_y - target_y) // 2
-            self.device.swipe(start_x, start_y, start_x, start_y - scroll_distance, duration=0.5)
-            sleep(1)
-
-            bounds = events_elem.info['bounds']
-            current_y = (bounds['top'] + bounds['bottom']) // 2
-
-        sleep(1)
+        self.position_text_in_first_quarter("Events Within ~30min")
         return True
 
     def scroll_to_events_further_than_30(self):
@@ -195,30 +424,11 @@ class EventsScrolling(GeneralScrolling):
         Returns:
             bool: True if the text was found and positioned correctly, False otherwise
         """
-        target_y = self.get_target_position_in_first_quarter()
-        start_x, start_y, end_y = self.calculate_swipe_coordinates()
-
         self.device(scrollable=True).scroll.to(text="Events Further Than ~30min")
         if not self.device(text="Events Further Than ~30min").exists(timeout=5):
             return False
 
-        events_elem = self.device(text="Events Further Than ~30min")
-        bounds = events_elem.info['bounds']
-        current_y = (bounds['top'] + bounds['bottom']) // 2
-
-        max_adjustment_attempts = 3
-        for attempt in range(max_adjustment_attempts):
-            if current_y <= target_y:
-                break
-
-            scroll_distance = (current_y - target_y) // 2
-            self.device.swipe(start_x, start_y, start_x, start_y - scroll_distance, duration=0.5)
-            sleep(1)
-
-            bounds = events_elem.info['bounds']
-            current_y = (bounds['top'] + bounds['bottom']) // 2
-
-        sleep(1)
+        self.position_text_in_first_quarter("Events Further Than ~30min")
         return True
 
     def scroll_event_card(self):
@@ -302,24 +512,12 @@ class ScrollToCustomDayTrips:
         Raises:
             AssertionError: If Day Trips section is not found after max attempts
         """
-        screen_swipe = ScreenSwipe(self.device)
-        start_x, start_y, end_y = screen_swipe.calculate_swipe_coordinates()
-        target_y = self.general_scroll.get_target_position_in_first_quarter()
-        scroll_end_y = (start_y + end_y) // 2
-        for attempt in range(max_attempts):
-            if self.device(text=self.DAY_TRIPS_TEXT).exists:
-                day_trips_elem = self.device(text=self.DAY_TRIPS_TEXT)
-                bounds = day_trips_elem.info['bounds']
-                current_y = (bounds['top'] + bounds['bottom']) // 2
-
-                if current_y <= target_y:
-                    if current_y < target_y - 100:
-                        self.device.swipe(start_x, end_y, start_x, start_y, duration=self.SCROLL_DURATION)
-                        sleep(self.DEFAULT_WAIT)
-                    else:
-                        break
-            self.device.swipe(start_x, start_y, start_x, scroll_end_y, duration=self.SCROLL_DURATION)
-            sleep(self.DEFAULT_WAIT)
+        scroll_step = self.general_scroll.height // 4
+        with FrameMetrics(self.device).measure("scroll_to_custom_day_trips"):
+            for attempt in range(max_attempts):
+                if self.general_scroll.position_text_in_first_quarter(self.DAY_TRIPS_TEXT) is not None:
+                    break
+                self.general_scroll.drag_content(scroll_step)
 
         assert self.device(text=self.DAY_TRIPS_TEXT).exists(timeout=self.LONG_WAIT), (
             "Day Trips text not found"
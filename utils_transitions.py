@@ -0,0 +1,161 @@
+"""
+Utility functions for measuring screen transition latency
+"""
+import time
+from time import sleep
+
+from config import TRANSITION_SLOS
+from test_reporter import get_active_reporter
+from utils_perf import summarize
+
+
+class TransitionTimer:
+    """
+    Taps an element and waits for the destination screen instead of sleeping a fixed time.
+
+    Two latencies are measured from the tap: until the destination's marker is
+    visible, and until the UI hierarchy stops changing. Both are checked against
+    the SLOs in config.TRANSITION_SLOS and added to the Transitions sheet of the
+    report, with a per-transition summary in the Transition Summary sheet.
+    Destinations without a stable SLO keep animating, so their stable wait is skipped.
+    """
+
+    # Fail tests on SLO violations (conftest sets it with --enforce-slos)
+    enforce = False
+
+    TIMEOUT = 15
+    # Caps the stable wait of screens with an animation not listed in TRANSITION_SLOS
+    STABLE_TIMEOUT = 5
+    STABLE_FOR = 1
+    POLL_INTERVAL = 0.1
+    SHEET_NAME = "Transitions"
+    SUMMARY_SHEET_NAME = "Transition Summary"
+
+    def __init__(self, device):
+        """
+        Initialize TransitionTimer with a device instance.
+
+        Args:
+            device: UIAutomator2 device instance
+        """
+        self.device = device
+
+    def tap(self, element, name, marker=None, fallback_wait=2):
+        """
+        Click an element and wait until the destination screen is visible and stable.
+
+        Args:
+            element: Element to click (XPath or UiObject selector)
+            name: Name of the transition, used for the SLO lookup and the report
+            marker: XPath of an element shown on the destination screen, if it has a reliable one
+            fallback_wait: Minimum time to wait in seconds when there is no marker or it does not show up
+
+        Returns:
+            dict: visible_s and stable_s latencies in seconds (None if not reached)
+
+        Raises:
+            AssertionError: If an SLO is violated while TransitionTimer.enforce is set
+        """
+        tapped = time.perf_counter()
+        element.click()
+        return self.wait_for_destination(name, tapped, marker, fallback_wait)
+
+    def wait_for_destination(self, name, tapped, marker=None, fallback_wait=2):
+        """
+        Wait for the destination screen of a tap that was already made, e.g. by a click retry loop.
+
+        Args:
+            name: Name of the transition, used for the SLO lookup and the report
+            tapped: time.perf_counter() right before the tap
+            marker: XPath of an element shown on the destination screen, if it has a reliable one
+            fallback_wait: Minimum time to wait in seconds when there is no marker or it does not show up
+
+        Returns:
+            dict: visible_s and stable_s latencies in seconds (None if not reached)
+
+        Raises:
+            AssertionError: If an SLO is violated while TransitionTimer.enforce is set
+        """
+        visible = self._wait_for_marker(marker, tapped) if marker else None
+        slo = TRANSITION_SLOS.get(name, TRANSITION_SLOS['default'])
+        stable = self._wait_for_stable(tapped) if slo['stable'] is not None else None
+        if visible is None:
+            # Without a marker seen on screen, never wait less than the fixed wait this replaces
+            remaining = fallback_wait - (time.perf_counter() - tapped)
+            if remaining > 0:
+                sleep(remaining)
+
+        latencies = {'visible_s': visible, 'stable_s': stable}
+        self.record(name, latencies)
+        return latencies
+
+    def record(self, name, latencies):
+        """
+        Check the latencies of a transition against its SLO and add them to the report.
+
+        Args:
+            name: Name of the transition
+            latencies: visible_s and stable_s in seconds
+
+        Raises:
+            AssertionError: If an SLO is violated while TransitionTimer.enforce is set
+        """
+        slo = TRANSITION_SLOS.get(name, TRANSITION_SLOS['default'])
+        violations = [f"{name} {kind} {latencies[f'{kind}_s']} s > SLO {slo[kind]} s"
+                      for kind in ('visible', 'stable')
+                      if latencies[f'{kind}_s'] is not None and latencies[f'{kind}_s'] > slo[kind]]
+        print(f"Transition {name}: {latencies}" + (f" SLO violated: {violations}" if violations else ""))
+
+        reporter = get_active_reporter()
+        if reporter is not None:
+            test = reporter.artifacts.current_test
+            reporter.add_metric(self.SHEET_NAME, {
+                'test': test, 'transition': name, **latencies,
+                'slo_visible_s': slo['visible'], 'slo_stable_s': slo['stable'], 'slo_met': not violations,
+            })
+            for violation in violations:
+                reporter.add_test_detail(test, 'slo_violations', violation, append=True)
+            self._update_summary(reporter, name)
+
+        assert not (self.enforce and violations), f"Transition SLO violated: {'; '.join(violations)}"
+
+    def _update_summary(self, reporter, name):
+        """Update the Transition Summary row of a transition from the reporter's Transitions rows."""
+        rows = [row for row in reporter.metrics.get(self.SHEET_NAME, []) if row['transition'] == name]
+        summary = next((row for row in reporter.metrics.get(self.SUMMARY_SHEET_NAME, [])
+                        if row['transition'] == name), None)
+        if summary is None:
+            summary = {'transition': name}
+            reporter.add_metric(self.SUMMARY_SHEET_NAME, summary)
+        # The reporter keeps a reference to the row, so updating it in place updates the sheet
+        for kind in ('visible_s', 'stable_s'):
+            stats = summarize([row[kind] for row in rows])
+            summary[f'{kind}_median'] = stats['median']
+            summary[f'{kind}_p95'] = stats['p95']
+        summary['count'] = len(rows)
+        summary['slo_violations'] = sum(not row['slo_met'] for row in rows)
+
+    def _wait_for_marker(self, marker, tapped):
+        """Return the seconds from the tap until the marker was seen, or None."""
+        while time.perf_counter() - tapped < self.TIMEOUT:
+            checked_at = time.perf_counter()
+            if self.device.xpath(marker).exists:
+                return round(checked_at - tapped, 3)
+            sleep(self.POLL_INTERVAL)
+        return None
+
+    def _wait_for_stable(self, tapped):
+        """Return the seconds from the tap until the hierarchy last changed, or None if it kept changing."""
+        previous = self.device.dump_hierarchy()
+        last_change = time.perf_counter()
+        deadline = min(tapped + self.TIMEOUT, last_change + self.STABLE_TIMEOUT)
+        while time.perf_counter() < deadline:
+            sleep(self.POLL_INTERVAL)
+            current = self.device.dump_hierarchy()
+            now = time.perf_counter()
+            if current != previous:
+                previous = current
+                last_change = now
+            elif now - last_change >= self.STABLE_FOR:
+                return round(last_change - tapped, 3)
+        return None
@@ -1,12 +1,21 @@
 """
 Utility functions for UI verification.
 """
+import time
 from time import sleep
 from locators import HomeScreen, Events, Businesses, MyFavorites, Trails, BottomNavBar, VisitHistory, \
-    ViewMap, DayTrips, LoginPage, AddInfo, GuestMode, Videos, CheckIn, AskAI, EventsFilters
+    ViewMap, DayTrips, LoginPage, AddInfo, GuestMode, Videos, CheckIn, AskAI, EventsFilters, EventsScreen
+from utils_frame_metrics import FrameMetrics
+from utils_frame_sampling import MapRenderDetector
+from utils_hierarchy import HierarchySnapshot
+from utils_image_locator import ImageMatcher
+from utils_memory import sample_memory_after_calls
 from utils_scrolling import ScreenSwipe, GeneralScrolling
+from utils_transitions import TransitionTimer
+from utils_video_playback import VideoPlaybackProbe
 
 
+@sample_memory_after_calls
 class NavEvents:
     """Class for handling events navigation and interactions."""
 
@@ -27,6 +36,7 @@ class NavEvents:
             device: UIAutomator2 device instance
         """
         self.device = device
+        self.transitions = TransitionTimer(device)
 
     def click_see_all_events_home_screen(self):
         """
@@ -41,8 +51,8 @@ class NavEvents:
         see_all_events = self.device.xpath(HomeScreen.EVENTS_SEE_ALL)
         assert see_all_events.exists, "Could not find 'See all' for events"
 
-        see_all_events.click()
-        sleep(self.LONG_WAIT)
+        self.transitions.tap(see_all_events, "home_see_all_events", marker=EventsScreen.EVENTS_SCREEN_LOADED,
+                             fallback_wait=self.LONG_WAIT)
         return True
 
     def click_see_all_events_within_30(self):
@@ -58,8 +68,8 @@ class NavEvents:
         see_all = self.device(text="See All")
         assert see_all.exists, "Could not find See All button for Events within 30 minutes"
 
-        see_all.click()
-        sleep(self.DEFAULT_WAIT)
+        self.transitions.tap(see_all, "events_within_30_see_all", marker=EventsScreen.EVENTS_SCREEN_LOADED,
+                             fallback_wait=self.DEFAULT_WAIT)
         return True
 
     def click_see_all_events_further_than_30(self):
@@ -75,8 +85,8 @@ class NavEvents:
         see_all = self.device(text="See All")
         assert see_all.exists, "Could not find See All button for Events further than 30 minutes"
 
-        see_all.click()
-        sleep(self.DEFAULT_WAIT)
+        self.transitions.tap(see_all, "events_further_than_30_see_all", marker=EventsScreen.EVENTS_SCREEN_LOADED,
+                             fallback_wait=self.DEFAULT_WAIT)
         return True
 
     def interact_with_events_carousel(self):
@@ -101,8 +111,8 @@ class NavEvents:
             if content_desc:
                 carousel_item = self.device.xpath(Events.CAROUSEL_ITEM.format(content_desc))
                 assert carousel_item.exists, "Could not find Events carousel item"
-                carousel_item.click()
-                sleep(self.MEDIUM_WAIT)
+                self.transitions.tap(carousel_item, "event_details", marker=Events.EVENT_CARD_DETAILS_TAB,
+                                     fallback_wait=self.MEDIUM_WAIT)
                 return True
 
         assert False, "Could not find any event elements"
@@ -135,29 +145,33 @@ class NavEvents:
 
         days_of_the_week = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
 
-        day_conditions = " or ".join([f"contains(@content-desc, '{day}')" for day in days_of_the_week])
-        dynamic_locator = f'//*[{day_conditions}]/android.view.ViewGroup[3]'
-        result = self.device.xpath(dynamic_locator)
-        assert result.exists, "Could not find any event search results"
-        for attempt in range(self.MAX_CLICK_RETRIES):
-            if result.click_exists(timeout=self.CLICK_TIMEOUT):
-                sleep(self.LONG_WAIT)
-                return True
-            if attempt < self.MAX_CLICK_RETRIES - 1:
-                sleep(self.RETRY_WAIT)
-        raise AssertionError("Failed to click the event search result after multiple attempts")
+        # All seven days are looked up in the content-desc index of one dump instead of a seven-way OR XPath
+        matches = HierarchySnapshot.capture(self.device).find_any('content-desc', days_of_the_week)
+        candidates = sorted({node.index: node for nodes in matches.values() for node in nodes}.items())
+        # Like .../android.view.ViewGroup[3], skip matches such as date headers that are not cards
+        card_view = None
+        for index, node in candidates:
+            view_groups = node.children(class_name='android.view.ViewGroup')
+            if len(view_groups) >= 3:
+                card_view = view_groups[2]
+                break
+        assert card_view is not None, "Could not find any event search results"
+        self.transitions.tap(card_view, "event_details", marker=Events.EVENT_CARD_DETAILS_TAB,
+                             fallback_wait=self.LONG_WAIT)
+        return True
 
     def click_out_of_events_details(self):
         """
-        Clicks in the first quarter of the screen to exit event details.
+        Clicks on the background in the upper half of the screen to exit event details.
 
         Returns:
             bool: True if click was successful
         """
-        screen_swipe = ScreenSwipe(self.device)
-        width, height = screen_swipe.get_dimensions()
-        click_x = width // 4
-        click_y = height // 4
+        spatial = HierarchySnapshot.capture(self.device).spatial()
+        left, top, right, bottom = spatial.screen
+        # Tap the backdrop in the upper half instead of whatever control happens to be at a fixed spot
+        point = spatial.free_point((left, top, right, (top + bottom) // 2))
+        click_x, click_y = point or (right // 4, bottom // 4)
         self.device.click(click_x, click_y)
         sleep(self.DEFAULT_WAIT)
         return True
@@ -225,6 +239,7 @@ class NavEvents:
         return True
 
 
+@sample_memory_after_calls
 class NavEventsFilters:
     """Class for handling navigation in Events Filters"""
 
@@ -392,6 +407,7 @@ class NavEventsFilters:
         return next_day
 
 
+@sample_memory_after_calls
 class NavBusinesses:
     """Class for handling business navigation and interactions."""
 
@@ -412,6 +428,8 @@ class NavBusinesses:
             device: UIAutomator2 device instance
         """
         self.device = device
+        self.transitions = TransitionTimer(device)
+        self.images = ImageMatcher(device)
 
     def click_business_with_event_search_result(self, business_name=None):
         """
@@ -430,8 +448,8 @@ class NavBusinesses:
         business_name = business_name or self.DEFAULT_EVENT_BUSINESS
         search_result = self.device.xpath(Businesses.BUSINESS_UNDER_BUSINESSES.format(business_name))
         assert search_result.exists, f"{business_name} not found under Businesses section"
-        search_result.click()
-        sleep(self.LONG_WAIT)
+        self.transitions.tap(search_result, "business_details", marker=Businesses.BUSINESS_ABOUT_TAB,
+                             fallback_wait=self.LONG_WAIT)
         return True
 
     def click_business_with_menu_search_result(self, menu_business_name=None):
@@ -451,8 +469,8 @@ class NavBusinesses:
         menu_business_name = menu_business_name or self.DEFAULT_MENU_BUSINESS
         search_result = self.device.xpath(Businesses.BUSINESS_UNDER_BUSINESSES.format(menu_business_name))
         assert search_result.exists, f"{menu_business_name} not found under Businesses section"
-        search_result.click()
-        sleep(self.DEFAULT_WAIT)
+        self.transitions.tap(search_result, "business_details", marker=Businesses.BUSINESS_ABOUT_TAB,
+                             fallback_wait=self.DEFAULT_WAIT)
         return True
 
     def verify_business_fyi_tab(self):
@@ -486,8 +504,8 @@ class NavBusinesses:
         menu_business_name = menu_business_name or self.DEFAULT_MENU_BUSINESS
         search_result = self.device.xpath(Businesses.BUSINESS_UNDER_BUSINESSES.format(menu_business_name))
         assert search_result.exists, f"{menu_business_name} not found under Businesses section"
-        search_result.click()
-        sleep(self.DEFAULT_WAIT)
+        self.transitions.tap(search_result, "business_details", marker=Businesses.BUSINESS_ABOUT_TAB,
+                             fallback_wait=self.DEFAULT_WAIT)
         return True
 
     def add_favorite_business(self):
@@ -523,8 +541,8 @@ class NavBusinesses:
         assert favorite_business.exists, f"Could not find favorited business. Looking for: {self.DEFAULT_MENU_BUSINESS}"
 
         # Click the business to open its details
-        favorite_business.click()
-        sleep(self.LONG_WAIT)
+        self.transitions.tap(favorite_business, "favorite_business_details",
+                             marker=MyFavorites.FAVORITE_BUSINESS_DETAILS_REMOVE, fallback_wait=self.LONG_WAIT)
 
         # Try to find the favorite button with retries
         max_retries = 3
@@ -558,13 +576,14 @@ class NavBusinesses:
         Raises:
             AssertionError: If back button is not found
         """
-        back_button = self.device.xpath(Businesses.BUSINESSES_BACK_BUTTON)
+        back_button = self.images.element(Businesses.BUSINESSES_BACK_ICON)
         assert back_button.exists, "Could not find back button in business details"
-        back_button.click()
-        sleep(self.DEFAULT_WAIT)
+        self.transitions.tap(back_button, "back_from_business_details", marker=Businesses.BUSINESSES_SECTION,
+                             fallback_wait=self.DEFAULT_WAIT)
         return True
 
 
+@sample_memory_after_calls
 class NavViewMap:
     """Class for handling map view navigation."""
 
@@ -578,6 +597,8 @@ class NavViewMap:
             device: UIAutomator2 device instance
         """
         self.device = device
+        self.transitions = TransitionTimer(device)
+        self.map_render = MapRenderDetector(device)
 
     def click_view_map(self):
         """
@@ -592,8 +613,10 @@ class NavViewMap:
         view_map = self.device.xpath(HomeScreen.VIEW_MAP)
         assert view_map.exists, "Could not find View Map button"
 
-        view_map.click()
-        sleep(self.NAVIGATION_WAIT)
+        tapped = time.perf_counter()
+        self.transitions.tap(view_map, "view_map", marker=ViewMap.FOOD_PANTRIES_FILTER,
+                             fallback_wait=self.NAVIGATION_WAIT)
+        self.map_render.wait_for_render("view_map", tapped)
 
         return True
 
@@ -645,8 +668,9 @@ class NavViewMap:
         """
         events_filter = self.device.xpath(ViewMap.EVENTS_FILTER)
         assert events_filter.exists, "Events filter is not visible on the map screen"
+        clicked = time.perf_counter()
         events_filter.click()
-        sleep(1)
+        self.map_render.wait_for_render("events_filter", clicked)
         return True
 
     def click_food_drinks_filter(self):
@@ -661,8 +685,9 @@ class NavViewMap:
         """
         food_drinks_filter = self.device.xpath(ViewMap.FOOD_AND_DRINKS_FILTER)
         assert food_drinks_filter.exists, "Food & Drinks filter is not visible on the map screen"
+        clicked = time.perf_counter()
         food_drinks_filter.click()
-        sleep(1)
+        self.map_render.wait_for_render("food_drinks_filter", clicked)
         return True
 
     def click_farms_filter(self):
@@ -677,8 +702,9 @@ class NavViewMap:
         """
         farms_filter = self.device.xpath(ViewMap.FARMS_FILTER)
         assert farms_filter.exists, "Farms filter is not visible on the map screen"
+        clicked = time.perf_counter()
         farms_filter.click()
-        sleep(1)
+        self.map_render.wait_for_render("farms_filter", clicked)
         return True
 
     def click_food_pantries_filter(self):
@@ -693,11 +719,13 @@ class NavViewMap:
         """
         food_pantries_filter = self.device.xpath(ViewMap.FOOD_PANTRIES_FILTER)
         assert food_pantries_filter.exists, "Food Pantries filter is not visible on the map screen"
+        clicked = time.perf_counter()
         food_pantries_filter.click()
-        sleep(1)
+        self.map_render.wait_for_render("food_pantries_filter", clicked)
         return True
 
 
+@sample_memory_after_calls
 class NavDayTripsTrails:
     """Class for handling Trails section navigation and interactions."""
 
@@ -721,6 +749,7 @@ class NavDayTripsTrails:
             device: UIAutomator2 device instance
         """
         self.device = device
+        self.transitions = TransitionTimer(device)
 
     def find_day_trips_text(self):
         """
@@ -735,22 +764,13 @@ class NavDayTripsTrails:
         screen_swipe = ScreenSwipe(self.device)
         start_x, start_y, end_y = screen_swipe.calculate_swipe_coordinates()
         general_scroll = GeneralScrolling(self.device)
-        target_y = general_scroll.get_target_position_in_first_quarter()
         scroll_end_y = (start_y + end_y) // 2
 
-        for attempt in range(self.MAX_SCROLL_ATTEMPTS):
-            if self.device(text=self.DAY_TRIPS_TEXT).exists:
-                day_trips_elem = self.device(text=self.DAY_TRIPS_TEXT)
-                bounds = day_trips_elem.info['bounds']
-                current_y = (bounds['top'] + bounds['bottom']) // 2
-                if current_y <= target_y:
-                    if current_y < target_y - 100:
-                        self.device.swipe(start_x, end_y, start_x, start_y, duration=self.LONG_SCROLL_DURATION)
-                        sleep(self.DEFAULT_WAIT)
-                    else:
-                        break
-            self.device.swipe(start_x, start_y, start_x, scroll_end_y, duration=self.SCROLL_DURATION)
-            sleep(self.DEFAULT_WAIT)
+        with FrameMetrics(self.device).measure("find_day_trips_text"):
+            for attempt in range(self.MAX_SCROLL_ATTEMPTS):
+                if general_scroll.position_text_in_first_quarter(self.DAY_TRIPS_TEXT) is not None:
+                    break
+                general_scroll.drag_content(start_y - scroll_end_y)
         assert self.device(text=self.DAY_TRIPS_TEXT).exists(timeout=self.LONG_WAIT), (
             "Day Trips text not found"
         )
@@ -797,8 +817,8 @@ class NavDayTripsTrails:
         )
         see_all_button = self.device(text="See All")
         assert see_all_button.exists(timeout=self.LONG_WAIT), "Could not find 'See all' text next to Day Trips"
-        see_all_button.click()
-        sleep(self.DEFAULT_WAIT)
+        self.transitions.tap(see_all_button, "day_trips_see_all", marker=DayTrips.MY_TRIPS,
+                             fallback_wait=self.DEFAULT_WAIT)
         return True
 
     def click_day_trips_read_more(self, read_more_button=None):
@@ -818,8 +838,8 @@ class NavDayTripsTrails:
         if read_more_button is None:
             read_more_button = self.find_day_trips_text()
 
-        read_more_button.click()
-        sleep(self.DEFAULT_WAIT)
+        self.transitions.tap(read_more_button, "day_trip_details", marker=DayTrips.DAY_TRIPS_DETAILS_PLACES,
+                             fallback_wait=self.DEFAULT_WAIT)
         return True
 
     def click_trails_see_all(self):
@@ -835,8 +855,8 @@ class NavDayTripsTrails:
         trails_see_all = self.device.xpath(HomeScreen.TRAILS_SEE_ALL.format(self.TRAIL_START_TEXT))
         assert trails_see_all.exists, "Could not find Trails 'See all' button"
 
-        trails_see_all.click()
-        sleep(self.DEFAULT_WAIT)
+        self.transitions.tap(trails_see_all, "trails_see_all", marker=Trails.TRAILS_STATUS,
+                             fallback_wait=self.DEFAULT_WAIT)
         return True
 
     def find_trails_text(self):
@@ -908,8 +928,8 @@ class NavDayTripsTrails:
             AssertionError: If Read More button is not found or click doesn't navigate to details screen
         """
         read_more_button = self.find_trails_text()
-        read_more_button.click()
-        sleep(self.DEFAULT_WAIT)
+        self.transitions.tap(read_more_button, "trail_details", marker=Trails.PERCENTAGE_PROGRESS,
+                             fallback_wait=self.DEFAULT_WAIT)
 
         if not self.device.xpath(Trails.PERCENTAGE_PROGRESS).exists:
             alt_button = self.device.xpath(Trails.READ_MORE_TRAILS_DYNAMIC)
@@ -960,6 +980,7 @@ class NavDayTripsTrails:
         return True
 
 
+@sample_memory_after_calls
 class NavCustomDayTrips:
     """Class for handling Custom Day Trips navigation."""
     SEARCH_WAIT = 5
@@ -973,6 +994,7 @@ class NavCustomDayTrips:
             device: UIAutomator2 device instance
         """
         self.device = device
+        self.images = ImageMatcher(device)
 
     def click_custom_day_trips_button(self):
         """
@@ -1047,7 +1069,7 @@ class NavCustomDayTrips:
 
     def click_date_picker_right_arrow(self):
         """Click the date picker right arrow button."""
-        self.device.xpath(DayTrips.DATE_PICKER_RIGHT_ARROW).click()
+        self.images.element(DayTrips.DATE_PICKER_RIGHT_ARROW_ICON).click()
 
     def select_date(self, date_number):
         """
@@ -1085,9 +1107,16 @@ class NavCustomDayTrips:
         sleep(self.DEFAULT_WAIT)
 
     def click_next(self):
-        """Click the Next button."""
+        """
+        Click the Next button.
+
+        Returns:
+            float: perf_counter() time of the click, i.e. when day trip generation starts
+        """
         self.device.xpath(DayTrips.NEXT_BUTTON).click()
+        clicked_at = time.perf_counter()
         sleep(self.DEFAULT_WAIT)
+        return clicked_at
 
     def click_continue(self):
         """Click the Continue button."""
@@ -1397,6 +1426,7 @@ class NavCustomDayTrips:
         sleep(self.DEFAULT_WAIT)
 
 
+@sample_memory_after_calls
 class NavAddInfo:
     """Class for handling Add Info section navigation."""
 
@@ -1509,6 +1539,7 @@ class NavAddInfo:
         return True
 
 
+@sample_memory_after_calls
 class NavVideos:
     """Class for handling videos section navigation."""
 
@@ -1542,7 +1573,26 @@ class NavVideos:
 
         return True
 
+    def play_first_video(self):
+        """
+        Tap the first video tile and measure its playback start and stalls.
+        The screen should already show the videos list.
 
+        Returns:
+            dict: Playback measurements of VideoPlaybackProbe.probe()
+
+        Raises:
+            AssertionError: If no video tile is found
+        """
+        video_tile = self.device.xpath(Videos.VIDEO_TILE)
+        assert video_tile.exists, "Could not find a video tile"
+
+        tapped = time.perf_counter()
+        video_tile.click()
+        return VideoPlaybackProbe(self.device).probe("first_video", tapped)
+
+
+@sample_memory_after_calls
 class NavFavoritesVisitHistory:
     """Class for handling favorites and visit history navigation."""
 
@@ -1557,6 +1607,8 @@ class NavFavoritesVisitHistory:
             device: UIAutomator2 device instance
         """
         self.device = device
+        self.transitions = TransitionTimer(device)
+        self.images = ImageMatcher(device)
 
     def click_favorites_button(self):
         """
@@ -1568,10 +1620,10 @@ class NavFavoritesVisitHistory:
         Raises:
             AssertionError: If Favorites button is not found or navigation verification fails
         """
-        favorites_button = self.device.xpath(BottomNavBar.FAVORITES)
+        favorites_button = self.images.element(BottomNavBar.FAVORITES_ICON)
         assert favorites_button.exists, "Could not find Favorites button"
-        favorites_button.click()
-        sleep(self.NAVIGATION_WAIT)
+        self.transitions.tap(favorites_button, "favorites", marker=VisitHistory.VISIT_HISTORY_TAB,
+                             fallback_wait=self.NAVIGATION_WAIT)
 
         # Verify navigation
         assert self.device(text=self.FAVORITES_TEXT).exists, (
@@ -1591,11 +1643,12 @@ class NavFavoritesVisitHistory:
         """
         visit_history_tab = self.device.xpath(VisitHistory.VISIT_HISTORY_TAB)
         assert visit_history_tab.exists, "Could not find Visit History tab"
-        visit_history_tab.click()
-        sleep(self.NAVIGATION_WAIT)
+        self.transitions.tap(visit_history_tab, "visit_history", marker=CheckIn.VISIT_HISTORY_THREE_DOTTED,
+                             fallback_wait=self.NAVIGATION_WAIT)
         return True
 
 
+@sample_memory_after_calls
 class NavBottomNavBar:
     """Class for handling bottom navigation bar interactions."""
 
@@ -1610,6 +1663,7 @@ class NavBottomNavBar:
             device: UIAutomator2 device instance
         """
         self.device = device
+        self.transitions = TransitionTimer(device)
 
     def click_home_button(self):
         """
@@ -1624,8 +1678,7 @@ class NavBottomNavBar:
         home_button = self.device.xpath(BottomNavBar.NAV_HOME_BUTTON)
         assert home_button.exists, "Could not find Home button"
 
-        home_button.click()
-        sleep(self.NAVIGATION_WAIT)
+        self.transitions.tap(home_button, "home", marker=HomeScreen.EVENTS_TEXT, fallback_wait=self.NAVIGATION_WAIT)
 
         # Verify navigation
         assert self.device(text=self.EVENTS_TEXT).exists, (
@@ -1646,8 +1699,8 @@ class NavBottomNavBar:
         events_button = self.device.xpath(BottomNavBar.EVENTS)
         assert events_button.exists, "Could not find Events button"
 
-        events_button.click()
-        sleep(self.NAVIGATION_WAIT)
+        self.transitions.tap(events_button, "events", marker=EventsScreen.EVENTS_SCREEN_LOADED,
+                             fallback_wait=self.NAVIGATION_WAIT)
 
         # Verify navigation
         assert self.device(text=self.EVENTS_TEXT).exists, (
@@ -1656,6 +1709,7 @@ class NavBottomNavBar:
         return True
 
 
+@sample_memory_after_calls
 class NavCheckIn:
     """Class for handling navigation in the check-in process"""
 
@@ -1823,6 +1877,7 @@ class NavCheckIn:
         assert not default_rating_text, "Check In not deleted"
 
 
+@sample_memory_after_calls
 class NavGuestMode:
     """Class for handling guest mode navigation interactions."""
 
@@ -1839,6 +1894,7 @@ class NavGuestMode:
             device: UIAutomator2 device instance
         """
         self.device = device
+        self.images = ImageMatcher(device)
         self.DEFAULT_WAIT = 1.5
 
     def click_events_button(self):
@@ -1895,7 +1951,8 @@ class NavGuestMode:
     def click_guest_mode_locked_videos(self):
         """
         Click on a video in guest mode to trigger the plans popup.
-        Uses the specific locator for locked videos details.
+        Uses the specific locator for locked videos details, and measures playback
+        of the tapped video (locked videos are reported as not played).
 
         Returns:
             bool: True if successful
@@ -1903,22 +1960,25 @@ class NavGuestMode:
         Raises:
             AssertionError: If no videos are found to click
         """
-        videos_section = self.device(text="Videos")
-        assert videos_section.exists, "Videos section not found"
+        videos_section_exists = self.device(text="Food Vids").exists or self.device(text="Videos").exists
+        assert videos_section_exists, "Videos section not found"
         locked_videos_details = self.device.xpath(GuestMode.GUEST_MODE_LOCKED_VIDEOS_DETAILS)
         if locked_videos_details.exists:
+            tapped = time.perf_counter()
             locked_videos_details.click()
-            sleep(self.DEFAULT_WAIT)
+            VideoPlaybackProbe(self.device).probe("guest_locked_video", tapped)
             return True
         locked_videos = self.device.xpath(GuestMode.GUEST_MODE_HOME_SCREEN_LOCKED_VIDEOS)
         if locked_videos.exists:
+            tapped = time.perf_counter()
             locked_videos.click()
-            sleep(self.DEFAULT_WAIT)
+            VideoPlaybackProbe(self.device).probe("guest_locked_video", tapped)
             return True
         video_element = self.device.xpath(Videos.VIDEO_TILE)
         if video_element.exists:
+            tapped = time.perf_counter()
             video_element.click()
-            sleep(self.DEFAULT_WAIT)
+            VideoPlaybackProbe(self.device).probe("guest_video", tapped)
             return True
         see_all_button = self.device.xpath(GuestMode.GUEST_MODE_VIDEOS_SEE_ALL)
         if see_all_button.exists:
@@ -1937,7 +1997,7 @@ class NavGuestMode:
         Raises:
             AssertionError: If Favorites button is not found
         """
-        favorites_button = self.device.xpath(BottomNavBar.FAVORITES)
+        favorites_button = self.images.element(BottomNavBar.FAVORITES_ICON)
         assert favorites_button.exists, "Favorites button not found in bottom navigation"
 
         favorites_button.click()
@@ -1945,6 +2005,7 @@ class NavGuestMode:
         return True
 
 
+@sample_memory_after_calls
 class NavForgotPassword:
     """Class for handling forgot password navigation interactions."""
 
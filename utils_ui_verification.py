@@ -3,8 +3,13 @@ Utilities functions for UI verification
 """
 import time
 from time import sleep
-from locators import (Businesses, EventsScreen, HomeScreenTiles, SettingsScreen, Trails, GuestMode,
+from locators import (Businesses, EventsScreen, SettingsScreen, Trails, GuestMode,
                       PlansPopup, ViewMap, LoginPage, DayTrips, Videos, HomeScreen, EventsFilters)
+from config import DAY_TRIP_GENERATION
+from test_reporter import get_active_reporter
+from utils_gestures import GestureBatch
+from utils_hierarchy import HierarchySnapshot
+from utils_perf import PerfHistory, detect_drift, summarize
 from utils_screenshots import ScreenshotsManagement
 from utils_scrolling import ScreenSwipe, GeneralScrolling
 
@@ -50,10 +55,16 @@ class VerifyEvents:
         Raises:
             AssertionError: If no day of week element is found
         """
+        # One dump for all seven days instead of one EventsScreen.DAY_OF_WEEK query per day
+        snapshot = HierarchySnapshot.capture(self.device)
+        day_texts = snapshot.find_any('text', self.days_short, match='exact', class_name='android.widget.TextView')
         current_day = None
         for day in self.days_short:
-            day_element = self.device.xpath(EventsScreen.DAY_OF_WEEK.format(day, day))
-            if day_element.exists:
+            day_element = next((node for node in day_texts[day]
+                                if any(ancestor.class_name == 'android.view.ViewGroup'
+                                       and snapshot.attribute(ancestor.index, 'clickable') == 'true'
+                                       for ancestor in node.ancestors())), None)
+            if day_element is not None:
                 current_day = day
                 day_element.click()
                 sleep(2)
@@ -91,12 +102,10 @@ class VerifyEvents:
         Raises:
             AssertionError: If no events are found
         """
-        event_found = False
-        for day in self.days_of_week:
-            events_tile = self.device.xpath(HomeScreenTiles.EVENTS_WITHIN_30_TILE.format(day))
-            if events_tile.exists:
-                event_found = True
-                break
+        # Same match as HomeScreenTiles.EVENTS_WITHIN_30_TILE for every day, from one dump
+        snapshot = HierarchySnapshot.capture(self.device)
+        event_found = snapshot.first('text', [f"{day}, " for day in self.days_of_week],
+                                     class_name='android.widget.TextView') is not None
 
         assert event_found, "Could not find any events with dates in Events within 30 minutes section"
         sleep(1)
@@ -117,12 +126,13 @@ class VerifyEvents:
 
         for attempt in range(max_scroll_attempts):
 
-            for day in self.days_of_week:
-                events_tile = self.device.xpath(HomeScreenTiles.EVENTS_MORE_THAN_30_TILE.format(day))
-                if events_tile.exists:
-                    event_found = True
-                    event_text = events_tile.get_text()
-                    break
+            # Same match as HomeScreenTiles.EVENTS_MORE_THAN_30_TILE for every day, from one dump
+            snapshot = HierarchySnapshot.capture(self.device)
+            events_tile = snapshot.first('text', [f"{day}, " for day in self.days_of_week],
+                                         class_name='android.widget.TextView')
+            if events_tile is not None:
+                event_found = True
+                event_text = events_tile.text
 
             if event_found:
                 break
@@ -131,7 +141,7 @@ class VerifyEvents:
             sleep(2)
 
         if not event_found:
-            self.device.screenshot("debug_no_events_further_than_30.png")
+            ScreenshotsManagement(self.device).take_screenshot("debug_no_events_further_than_30")
 
         assert event_found, "Could not find any events further than 30 minutes after multiple scroll attempts"
         sleep(1)
@@ -457,6 +467,10 @@ class VerifyDayTrips:
 class VerifyCustomDayTrips:
     """Class for verifying Custom Day Trips-related UI elements and interactions."""
 
+    CRAFTING_POLL_INTERVAL = 0.25
+    GENERATION_HISTORY = "day_trip_generation"
+    GENERATION_SHEET = "Day Trip Generation"
+
     def __init__(self, device):
         """
         Initialize VerifyCustomDayTrips with a device instance.
@@ -668,12 +682,14 @@ class VerifyCustomDayTrips:
         assert text.exists, "Crafting Your Trip text not found"
         return True
 
-    def wait_for_crafting_popup_to_disappear(self, timeout=30):
+    def wait_for_crafting_popup_to_disappear(self, timeout=30, started_at=None, category=None):
         """
         Wait for the 'Crafting Your Trip' popup to disappear.
 
         Args:
             timeout: Maximum time to wait in seconds (default: 30)
+            started_at: perf_counter() time generation started (e.g. returned by NavCustomDayTrips.click_next)
+            category: Day trip category; when given, the generation duration is recorded
 
         Returns:
             bool: True if popup disappeared
@@ -681,15 +697,57 @@ class VerifyCustomDayTrips:
         Raises:
             AssertionError: If popup is still present after timeout
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        start_time = time.perf_counter()
+        started_at = started_at or start_time
+        while time.perf_counter() - start_time < timeout:
+            checked_at = time.perf_counter()
             crafting_popup = self.device.xpath(DayTrips.CRAFTING_DAY_TRIP)
             if not crafting_popup.exists:
+                if category:
+                    self.record_crafting_duration(category, checked_at - started_at)
                 return True
-            sleep(1)
+            sleep(self.CRAFTING_POLL_INTERVAL)
 
         assert False, "Crafting Your Trip popup did not disappear after {} seconds".format(timeout)
 
+    def record_crafting_duration(self, category, duration):
+        """
+        Record how long generating a day trip took, and alert when it drifts from earlier runs.
+
+        Args:
+            category: Day trip category (e.g. 'events', 'food_drinks')
+            duration: Generation time in seconds
+
+        Returns:
+            dict: Drift check of the category, see utils_perf.detect_drift()
+        """
+        duration = round(duration, 2)
+        history = PerfHistory(self.GENERATION_HISTORY)
+        history.append({'device': self.device.serial, 'category': category, 'duration': duration})
+        durations = [record['duration'] for record in history.records()
+                     if record.get('device') == self.device.serial and record.get('category') == category]
+
+        stats = summarize(durations)
+        drift = detect_drift(durations, window=DAY_TRIP_GENERATION['drift_window'],
+                             baseline=DAY_TRIP_GENERATION['baseline_runs'],
+                             tolerance=DAY_TRIP_GENERATION['drift_tolerance'])
+        print(f"Day trip generation ({category}): {duration} s, history {stats}, drift {drift}")
+
+        reporter = get_active_reporter()
+        if reporter is not None:
+            test = reporter.artifacts.current_test
+            reporter.add_metric(self.GENERATION_SHEET, {
+                'test': test, 'category': category, 'duration_s': duration,
+                'history_median_s': stats['median'], 'history_p95_s': stats['p95'], **drift,
+            })
+            if drift['drifted']:
+                reporter.add_test_detail(test, 'perf_alert',
+                                         f"Day trip generation ({category}) drifted by {drift['change_pct']}%: "
+                                         f"median {drift['recent_median']} s, before {drift['baseline_median']} s")
+        if drift['drifted']:
+            print(f"ALERT: day trip generation time ({category}) drifted by {drift['change_pct']}%")
+        return drift
+
     def verify_location_details(self, location_name):
         """
         Verify location details are present for a specific location.
@@ -1034,28 +1092,17 @@ class VerifyGuestMode:
         assert videos_section.exists, "Videos section not found"
         eat_vermont_text = self.device(textContains="Eat Vermont")
         video_tiles = self.device.xpath(Videos.VIDEO_TILE)
+        batch = GestureBatch(self.device)
         if not (eat_vermont_text.exists or video_tiles.exists):
-            start_x = int(self.device.info['displayWidth'] * 0.8)
-            start_y = int(self.device.info['displayHeight'] * 0.7)
-            end_x = int(self.device.info['displayWidth'] * 0.2)
+            # Check after each swipe, so the probe stops at the first one that shows the tiles
             for i in range(3):
-                self.device.swipe(
-                    start_x,
-                    start_y,
-                    end_x,
-                    start_y,
-                    duration=0.5
-                )
-                sleep(1)
+                batch.swipe(0.8, 0.7, 0.2, 0.7, duration=0.5).wait(1).run()
                 if self.device(textContains="Eat Vermont").exists or self.device.xpath(Videos.VIDEO_TILE).exists:
                     return True
         if not (eat_vermont_text.exists or video_tiles.exists):
-            start_x = self.device.info['displayWidth'] // 2
-            start_y = int(self.device.info['displayHeight'] * 0.7)
-            end_y = int(self.device.info['displayHeight'] * 0.3)
+            # A further vertical swipe could move the tiles out again, so check after each one
             for i in range(3):
-                self.device.swipe(start_x, start_y, start_x, end_y, duration=0.5)
-                sleep(1)
+                batch.swipe(0.5, 0.7, 0.5, 0.3, duration=0.5).wait(1).run()
                 if self.device(textContains="Eat Vermont").exists or self.device.xpath(Videos.VIDEO_TILE).exists:
                     return True
         eat_vermont_found = self.device(textContains="Eat Vermont").exists or self.device.xpath(
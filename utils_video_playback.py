@@ -0,0 +1,125 @@
+"""
+Utility functions for measuring video playback start and stalls
+"""
+import time
+
+from config import VIDEO_PLAYBACK
+from locators import Videos
+from test_reporter import get_active_reporter
+from utils_device_profile import get_device_profile
+from utils_frame_sampling import FrameSampler
+
+
+class VideoPlaybackProbe:
+    """
+    Measures whether and how quickly a video starts playing after a tap, and how often it freezes.
+
+    Frames of the player region are sampled back to back. Playback starts with the
+    first pair of consecutive frames that differ (time-to-first-frame); afterwards,
+    a run of equal frames lasting at least VIDEO_PLAYBACK['stall_min_s'] that is
+    followed by motion again counts as a stall.
+    """
+
+    SHEET_NAME = "Video Playback"
+
+    def __init__(self, device):
+        """
+        Initialize VideoPlaybackProbe with a device instance.
+
+        Args:
+            device: UIAutomator2 device instance
+        """
+        self.device = device
+        self.sampler = FrameSampler(device, step=VIDEO_PLAYBACK['frame_step'])
+        self.pixel_threshold = VIDEO_PLAYBACK['pixel_threshold']
+        self.change_threshold = VIDEO_PLAYBACK['change_threshold_pct']
+
+    def player_region(self, timeout=1):
+        """
+        Get the region of the video player on screen.
+
+        Args:
+            timeout: Time to wait for the player to show up in seconds
+
+        Returns:
+            tuple: (left, top, right, bottom) as fractions of the screen size, or None if no player is found
+        """
+        player = self.device.xpath(Videos.VIDEO_PLAYER)
+        if not player.wait(timeout=timeout):
+            return None
+        bounds = player.info['bounds']
+        width, height = get_device_profile(self.device).size
+        return (bounds['left'] / width, bounds['top'] / height, bounds['right'] / width, bounds['bottom'] / height)
+
+    def probe(self, label, started_at=None):
+        """
+        Sample the player after a tap and measure playback start and stalls.
+
+        Args:
+            label: Name of the video, shown in the report
+            started_at: time.perf_counter() of the tap (default: now)
+
+        Returns:
+            dict: played, time_to_first_frame_s (None if playback did not start), stalls,
+            stall_s (total stalled time), frozen_at_end and frames compared; nothing is
+            sampled and played is False when no player shows up (e.g. a locked video)
+        """
+        started_at = time.perf_counter() if started_at is None else started_at
+        stall_min = VIDEO_PLAYBACK['stall_min_s']
+        # Sampling only the player keeps the screen transition (or a popup) from counting as playback
+        region = self.player_region(timeout=VIDEO_PLAYBACK['player_timeout'])
+
+        first_motion_at = None
+        frozen_since = None
+        stalls = 0
+        stall_time = 0.0
+        frames = 0
+        previous = self.sampler.grab(region) if region else None
+        deadline = time.perf_counter() + VIDEO_PLAYBACK['first_frame_timeout']
+        while region and time.perf_counter() < deadline:
+            current = self.sampler.grab(region)
+            captured_at = time.perf_counter()
+            frames += 1
+            moving = self.sampler.difference(previous, current, self.pixel_threshold) > self.change_threshold
+            previous = current
+
+            if first_motion_at is None:
+                if moving:
+                    first_motion_at = captured_at
+                    # Playback started, observe it for a fixed time from here
+                    deadline = captured_at + VIDEO_PLAYBACK['observe_s']
+                continue
+
+            if not moving:
+                frozen_since = frozen_since or captured_at
+            elif frozen_since is not None:
+                if captured_at - frozen_since >= stall_min:
+                    stalls += 1
+                    stall_time += captured_at - frozen_since
+                frozen_since = None
+
+        frozen_at_end = frozen_since is not None and time.perf_counter() - frozen_since >= stall_min
+        result = {
+            'played': first_motion_at is not None,
+            'time_to_first_frame_s': round(first_motion_at - started_at, 3) if first_motion_at else None,
+            'stalls': stalls,
+            'stall_s': round(stall_time, 3),
+            'frozen_at_end': frozen_at_end,
+            'frames': frames,
+        }
+        self.report(label, result)
+        return result
+
+    def report(self, label, result):
+        """
+        Add the playback measurements of a video to the Video Playback sheet of the report.
+
+        Args:
+            label: Name of the video
+            result: Result returned by probe()
+        """
+        print(f"Video playback for {label}: {result}")
+        reporter = get_active_reporter()
+        if reporter is None:
+            return
+        reporter.add_metric(self.SHEET_NAME, {'test': reporter.artifacts.current_test, 'video': label, **result})
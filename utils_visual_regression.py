@@ -0,0 +1,272 @@
+"""
+Utility functions for comparing test screenshots with visual baselines
+"""
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from config import VISUAL_REGRESSION
+from locators import VisualMasks
+from test_reporter import get_active_reporter
+from utils_artifacts import get_active_store
+from utils_device_profile import get_device_profile
+
+# Visual regression of the running pytest session, set by conftest
+_active_visual = None
+
+# Stabilizing constants of SSIM for 8-bit gray values
+SSIM_C1 = (0.01 * 255) ** 2
+SSIM_C2 = (0.03 * 255) ** 2
+
+
+def set_active_visual(visual):
+    """Register the visual regression of the running pytest session."""
+    global _active_visual
+    _active_visual = visual
+
+
+def get_active_visual():
+    """
+    Get the visual regression of the running pytest session.
+
+    Returns:
+        VisualRegression: The active visual regression, or None if it is disabled
+    """
+    return _active_visual
+
+
+def block_scores(baseline, current, block_size, mask=None):
+    """
+    Compute an SSIM-like score for every block of two gray images.
+
+    Args:
+        baseline: 2D array of the baseline
+        current: 2D array of the screenshot, same shape as the baseline
+        block_size: Side of the square blocks; pixels beyond the last full block are ignored
+        mask: Optional 2D bool array, True for pixels to ignore
+
+    Returns:
+        numpy.ndarray: 2D array of scores per block (1 = identical), NaN for masked blocks
+    """
+    import numpy as np
+
+    rows, cols = baseline.shape[0] // block_size, baseline.shape[1] // block_size
+    shape = (rows, block_size, cols, block_size)
+    x = baseline[:rows * block_size, :cols * block_size].astype(np.float32).reshape(shape)
+    y = current[:rows * block_size, :cols * block_size].astype(np.float32).reshape(shape)
+
+    mean_x = x.mean(axis=(1, 3))
+    mean_y = y.mean(axis=(1, 3))
+    dev_x = x - mean_x[:, None, :, None]
+    dev_y = y - mean_y[:, None, :, None]
+    var_x = (dev_x ** 2).mean(axis=(1, 3))
+    var_y = (dev_y ** 2).mean(axis=(1, 3))
+    covariance = (dev_x * dev_y).mean(axis=(1, 3))
+
+    scores = (((2 * mean_x * mean_y + SSIM_C1) * (2 * covariance + SSIM_C2))
+              / ((mean_x ** 2 + mean_y ** 2 + SSIM_C1) * (var_x + var_y + SSIM_C2)))
+    if mask is not None:
+        masked = mask[:rows * block_size, :cols * block_size].reshape(shape).any(axis=(1, 3))
+        scores[masked] = np.nan
+    return scores
+
+
+def compare_screenshots(baseline_path, current_path, masks, heatmap_path, settings):
+    """
+    Compare a screenshot with its baseline. Runs in a worker process.
+
+    Args:
+        baseline_path: Path of the baseline image
+        current_path: Path of the screenshot
+        masks: (left, top, right, bottom) boxes in pixels to ignore
+        heatmap_path: Where to write the diff heatmap when the screenshot changed
+        settings: VISUAL_REGRESSION settings
+
+    Returns:
+        dict: status ('passed', 'changed' or 'size_mismatch'), min_score, changed_blocks_pct and heatmap
+    """
+    import numpy as np
+    from PIL import Image
+
+    baseline = np.asarray(Image.open(baseline_path).convert('L'))
+    current = np.asarray(Image.open(current_path).convert('L'))
+    if baseline.shape != current.shape:
+        return {'status': 'size_mismatch', 'min_score': None, 'changed_blocks_pct': None, 'heatmap': None}
+
+    mask = np.zeros(baseline.shape, dtype=bool)
+    mask[:int(baseline.shape[0] * settings['mask_top'])] = True
+    for left, top, right, bottom in masks:
+        mask[top:bottom, left:right] = True
+
+    block_size = settings['block_size']
+    scores = block_scores(baseline, current, block_size, mask)
+    compared = ~np.isnan(scores)
+    changed = compared & (np.nan_to_num(scores, nan=1.0) < settings['min_block_score'])
+    changed_pct = float(changed.sum()) / max(int(compared.sum()), 1) * 100
+    result = {
+        'status': 'changed' if changed_pct > settings['max_changed_blocks_pct'] else 'passed',
+        'min_score': round(float(np.nanmin(scores)), 3) if compared.any() else None,
+        'changed_blocks_pct': round(changed_pct, 2),
+        'heatmap': None,
+    }
+
+    if result['status'] == 'changed':
+        # Dimmed screenshot with the pixel differences in red, changed blocks in yellow and masks in blue
+        diff = np.abs(current.astype(np.int16) - baseline.astype(np.int16)).astype(np.uint8)
+        heatmap = np.repeat((current // 3)[:, :, None], 3, axis=2)
+        heatmap[..., 0] = np.maximum(heatmap[..., 0], np.clip(diff.astype(np.uint16) * 4, 0, 255))
+        changed_pixels = np.kron(changed, np.ones((block_size, block_size), dtype=bool))
+        region = heatmap[:changed_pixels.shape[0], :changed_pixels.shape[1]]
+        region[changed_pixels, 1] = np.maximum(region[changed_pixels, 1], 96)
+        heatmap[mask, 2] = 160
+        Image.fromarray(heatmap, 'RGB').save(heatmap_path, 'PNG', compress_level=1)
+        result['heatmap'] = heatmap_path
+    return result
+
+
+class VisualRegression:
+    """
+    Compares screenshots taken with ScreenshotsManagement.take_screenshot with
+    baselines stored per screenshot name and screen size in visual_baselines/.
+
+    Comparisons run in a process pool while the test goes on; a screenshot
+    without a baseline becomes the baseline. Dynamic regions are masked per
+    screenshot name with the locators in VisualMasks.SCREENSHOTS.
+    """
+
+    MODES = ("off", "report", "fail")
+    BASELINE_DIR = "visual_baselines"
+    SHEET_NAME = "Visual Regression"
+
+    def __init__(self, device, mode="report", update=False, root_dir=None):
+        """
+        Initialize VisualRegression with a device instance.
+
+        Args:
+            device: UIAutomator2 device instance
+            mode: 'report' adds results to the report, 'fail' also fails tests with changed screenshots
+            update: Replace the baselines with this run's screenshots instead of comparing
+            root_dir: Directory containing visual_baselines (default: this repository)
+        """
+        self.device = device
+        self.mode = mode
+        self.update = update
+        width, height = get_device_profile(device).size
+        root_dir = root_dir or os.path.dirname(os.path.abspath(__file__))
+        self.folder = os.path.join(root_dir, self.BASELINE_DIR, f"{width}x{height}")
+        self._pool = None
+        self._pending = []
+
+    def baseline_path(self, name):
+        """
+        Get the stored baseline of a screenshot.
+
+        Args:
+            name: Screenshot name without timestamp
+
+        Returns:
+            str: Path of the baseline, or None if there is none
+        """
+        for extension in ('.png', '.webp'):
+            path = os.path.join(self.folder, name + extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def check(self, name, screenshot_path, test=None):
+        """
+        Queue a screenshot for comparison with its baseline, or store it as baseline.
+
+        Args:
+            name: Screenshot name as passed to take_screenshot (an extension is ignored)
+            screenshot_path: Path of the saved screenshot
+            test: Test node id (default: the running test)
+        """
+        name = os.path.splitext(name)[0]
+        reporter = get_active_reporter()
+        test = test or (reporter.artifacts.current_test if reporter is not None else None)
+        baseline = self.baseline_path(name)
+
+        if self.update or baseline is None:
+            os.makedirs(self.folder, exist_ok=True)
+            if baseline is not None:
+                os.remove(baseline)
+            shutil.copyfile(screenshot_path, os.path.join(self.folder, name + os.path.splitext(screenshot_path)[1]))
+            self._report(test, name, {'status': 'updated' if baseline else 'new baseline'})
+            return
+
+        diff_name = os.path.splitext(os.path.basename(screenshot_path))[0] + "_diff.png"
+        store = get_active_store()
+        heatmap_path = (store.path_for(diff_name, "visual_diffs") if store is not None
+                        else os.path.join(os.path.dirname(screenshot_path), diff_name))
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=VISUAL_REGRESSION['workers'])
+        future = self._pool.submit(compare_screenshots, baseline, screenshot_path, self.resolve_masks(name),
+                                   heatmap_path, VISUAL_REGRESSION)
+        self._pending.append((test, name, future))
+
+    def resolve_masks(self, name):
+        """
+        Get the on-screen boxes of the dynamic regions of a screenshot.
+
+        Args:
+            name: Screenshot name without timestamp
+
+        Returns:
+            list: (left, top, right, bottom) boxes in pixels
+        """
+        boxes = []
+        for locator in VisualMasks.SCREENSHOTS.get(name, []):
+            for element in self.device.xpath(locator).all():
+                left, top, right, bottom = element.bounds
+                boxes.append((left, top, right, bottom))
+        return boxes
+
+    def collect(self, test=None, wait_for_results=True):
+        """
+        Add finished comparisons to the report.
+
+        Args:
+            test: Only collect the comparisons of this test (default: all)
+            wait_for_results: Wait for running comparisons (up to VISUAL_REGRESSION['collect_timeout'])
+
+        Returns:
+            list: (name, result) of the screenshots that changed
+        """
+        selected = [entry for entry in self._pending if test is None or entry[0] == test]
+        if wait_for_results and selected:
+            wait([future for _, _, future in selected], timeout=VISUAL_REGRESSION['collect_timeout'])
+
+        changed = []
+        for entry in selected:
+            entry_test, name, future = entry
+            if not future.done():
+                continue
+            self._pending.remove(entry)
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'status': f'error: {e}'}
+            self._report(entry_test, name, result)
+            if result['status'] != 'passed':
+                changed.append((name, result))
+        return changed
+
+    def _report(self, test, name, result):
+        """Add the result of a screenshot to the Visual Regression sheet."""
+        print(f"Visual regression for {name}: {result}")
+        reporter = get_active_reporter()
+        if reporter is None:
+            return
+        row = dict(result)
+        if row.get('heatmap'):
+            reporter.artifacts.record(row['heatmap'], "visual_diffs", test=test)
+            row['heatmap'] = os.path.relpath(row['heatmap'], reporter.artifacts.run_folder)
+        reporter.add_metric(self.SHEET_NAME, {'test': test, 'screenshot': name, **row})
+
+    def shutdown(self):
+        """Collect the remaining comparisons and stop the worker processes."""
+        self.collect()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
@@ -37,3 +37,51 @@ class WaitUtils:
         if message:
             print(f"Timeout waiting for condition: {message}")
         return False
+
+    def wait_for_hierarchy_change(self, baseline, timeout=None, interval=0.25):
+        """
+        Wait until the UI hierarchy differs from a previous dump.
+
+        Args:
+            baseline: Hierarchy dump to compare against (from device.dump_hierarchy())
+            timeout: Maximum time to wait in seconds
+            interval: Time between dumps in seconds
+
+        Returns:
+            str: The changed hierarchy dump, or None if nothing changed within the timeout
+        """
+        timeout = timeout or self.default_timeout
+        start_time = time.perf_counter()
+        while time.perf_counter() - start_time < timeout:
+            current = self.device.dump_hierarchy()
+            if current != baseline:
+                return current
+            time.sleep(interval)
+        return None
+
+    def wait_for_hierarchy_stable(self, stable_for=2, timeout=None, interval=0.25):
+        """
+        Wait until the UI hierarchy stops changing.
+
+        Args:
+            stable_for: Time in seconds the hierarchy must stay unchanged
+            timeout: Maximum time to wait in seconds
+            interval: Time between dumps in seconds
+
+        Returns:
+            float: perf_counter() time of the last change, or None if the UI kept changing until the timeout
+        """
+        timeout = timeout or self.default_timeout
+        start_time = time.perf_counter()
+        previous = self.device.dump_hierarchy()
+        last_change = start_time
+        while time.perf_counter() - start_time < timeout:
+            time.sleep(interval)
+            current = self.device.dump_hierarchy()
+            now = time.perf_counter()
+            if current != previous:
+                previous = current
+                last_change = now
+            elif now - last_change >= stable_for:
+                return last_change
+        return None